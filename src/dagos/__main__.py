@@ -1,4 +1,4 @@
-from .cli import dagos
+from .daemon.client import main
 
 if __name__ == "__main__":
-    dagos()
+    main()
@@ -1,39 +1,58 @@
+import importlib
+import os
 import sys
 import time
+import typing as t
+from pathlib import Path
 
 import click
-import rich_click.rich_click as rich_click
 from loguru import logger
 
 from . import __version__
-from dagos.commands.env.cli import env
-from dagos.commands.list_command import list
-from dagos.commands.wsl.cli import wsl
 from dagos.core.commands import CommandRegistry
 from dagos.core.commands import CommandType
+from dagos.core.commands import LazyGroup
 from dagos.core.component_scanner import SoftwareComponentScanner
 from dagos.core.configuration import ConfigurationScanner
+from dagos.core.configuration import DagosConfiguration
+from dagos.core.entry_point_scanner import EntryPointScanner
 from dagos.core.environments import SoftwareEnvironmentScanner
+from dagos.core.name_index import NameIndex
+from dagos.core.scan_cache import ScanCache
 from dagos.exceptions import DagosException
 from dagos.logging import configure_logging
+from dagos.tracing import span
+from dagos.tracing import Tracer
 
-click.Command.format_help = rich_click.rich_format_help
-click.Group.format_help = rich_click.rich_format_help
-rich_click.STYLE_HELPTEXT = ""
-rich_click.USE_RICH_MARKUP = True
-rich_click.COMMAND_GROUPS = {
-    "dagos": [
-        {
-            "name": "General Commands",
-            "commands": ["list"],
-        },
-        {
-            "name": "Software Component Commands",
-            "commands": [type.value for type in CommandType],
-        },
-        {"name": "Software Environment Commands", "commands": ["env", "wsl"]},
-    ]
-}
+
+def rich_format_help(
+    command: click.Command, ctx: click.Context, formatter: click.HelpFormatter
+) -> None:
+    """Format help texts with rich-click, which is only imported once help is
+    actually requested.
+    """
+    import rich_click.rich_click as rich_click
+
+    rich_click.STYLE_HELPTEXT = ""
+    rich_click.USE_RICH_MARKUP = True
+    rich_click.COMMAND_GROUPS = {
+        "dagos": [
+            {
+                "name": "General Commands",
+                "commands": ["list", "cache", "daemon"],
+            },
+            {
+                "name": "Software Component Commands",
+                "commands": [type.value for type in CommandType],
+            },
+            {"name": "Software Environment Commands", "commands": ["env", "wsl"]},
+        ]
+    }
+    rich_click.rich_format_help(command, ctx, formatter)
+
+
+click.Command.format_help = rich_format_help
+click.Group.format_help = rich_format_help
 
 
 def timer_callback(ctx: click.Context, param: click.Option, value: bool) -> None:
@@ -48,7 +67,25 @@ def timer_callback(ctx: click.Context, param: click.Option, value: bool) -> None
     ctx.call_on_close(print_elapsed_time)
 
 
-@click.group()
+def trace_callback(
+    ctx: click.Context, param: click.Option, value: t.Optional[Path]
+) -> None:
+    if value is None or ctx.resilient_parsing:
+        return
+    tracer = Tracer()
+    # When run via `dagos()` tracing already started before scanning
+    if not tracer.enabled:
+        tracer.enable()
+
+        def write_trace() -> None:
+            tracer.write(value)
+            tracer.disable()
+            tracer.clear()
+
+        ctx.call_on_close(write_trace)
+
+
+@click.group(cls=LazyGroup)
 @click.option(
     "--verbose",
     "-v",
@@ -66,42 +103,180 @@ def timer_callback(ctx: click.Context, param: click.Option, value: bool) -> None
     help="Print execution time upon completion.",
     callback=timer_callback,
 )
+@click.option(
+    "--trace",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="Record where time is spent and write it as Chrome trace to provided file.",
+    callback=trace_callback,
+)
 @click.pass_context
-def dagos_cli(ctx: click.Context, verbose: int, timer: bool):
+def dagos_cli(ctx: click.Context, verbose: int, timer: bool, trace: t.Optional[Path]):
     pass
 
 
+def _import_command(module: str, name: str) -> t.Callable[[], click.Command]:
+    def loader() -> click.Command:
+        with span("Import module", "import", module=module):
+            return getattr(importlib.import_module(module), name)
+
+    return loader
+
+
+# Built-in commands are only imported once they are invoked
+dagos_cli.add_lazy_command(
+    "list",
+    _import_command("dagos.commands.list_command", "list"),
+    help="List available components and/or environments.",
+)
+dagos_cli.add_lazy_command(
+    "cache",
+    _import_command("dagos.commands.cache_command", "cache"),
+    help="Manage the index of scanned components and environments.",
+)
+dagos_cli.add_lazy_command(
+    "daemon",
+    _import_command("dagos.commands.daemon_command", "daemon"),
+    help="Serve invocations of dagos from a long-lived process.",
+)
+dagos_cli.add_lazy_command(
+    "env",
+    _import_command("dagos.commands.env.cli", "env"),
+    help="Manage software environments.",
+)
+dagos_cli.add_lazy_command(
+    "wsl",
+    _import_command("dagos.commands.wsl.cli", "wsl"),
+    help="Prepare or import WSL distros.",
+)
+
+
+def _is_version_requested(arguments: t.List[str]) -> bool:
+    for argument in arguments:
+        if argument == "--version":
+            return True
+        if not argument.startswith("-"):
+            return False
+    return False
+
+
+def _get_trace_file(arguments: t.List[str]) -> t.Optional[Path]:
+    for index, argument in enumerate(arguments):
+        if argument == "--trace" and index + 1 < len(arguments):
+            return Path(arguments[index + 1])
+        if argument.startswith("--trace="):
+            return Path(argument.partition("=")[2])
+        if not argument.startswith("-"):
+            return None
+    return None
+
+
+def _is_completion_requested() -> bool:
+    return "_DAGOS_COMPLETE" in os.environ
+
+
+def _get_verbosity(arguments: t.List[str]) -> t.Optional[int]:
+    if len(arguments) > 0 and "-v" == arguments[0]:
+        return 1
+    if len(arguments) > 0 and "-vv" == arguments[0]:
+        return 2
+    return None
+
+
+def load_cli(verbosity: t.Optional[int] = None) -> DagosConfiguration:
+    """Scan the configuration, software components, and software environments and
+    add the resulting commands to the CLI.
+
+    Args:
+        verbosity (t.Optional[int], optional): The verbosity requested via command
+            line. If None, the verbosity of the configuration is used to configure
+            logging. Defaults to None.
+
+    Returns:
+        DagosConfiguration: The scanned configuration.
+    """
+    configuration = ConfigurationScanner().scan()
+    if verbosity is None:
+        configure_logging(configuration.verbosity)
+    else:
+        configuration.verbosity = verbosity
+
+    SoftwareComponentScanner().scan(
+        configuration.component_search_paths, configuration.scan_workers
+    )
+    # Components of search paths take precedence over installed ones
+    EntryPointScanner().scan()
+    SoftwareEnvironmentScanner().scan(
+        configuration.environment_search_paths, configuration.scan_workers
+    )
+    with span("Build command tree", "cli"):
+        for command in CommandRegistry.commands.values():
+            dagos_cli.add_command(command)
+    NameIndex().update(configuration)
+    return configuration
+
+
+def load_completion_cli() -> bool:
+    """Add placeholders for the commands of all software components to the CLI,
+    as described by the name index. Neither the configuration nor the search
+    paths are scanned and no component is loaded, which keeps shell completion
+    responsive.
+
+    Returns:
+        bool: False, if the name index is missing or outdated.
+    """
+    index = NameIndex()
+    if not index.load():
+        return False
+    for type_name, commands in index.commands.items():
+        for name, short_help in commands.items():
+            CommandRegistry.add_lazy_command(
+                CommandType[type_name],
+                name,
+                _placeholder_command(name, short_help),
+                short_help=short_help,
+            )
+    for command in CommandRegistry.commands.values():
+        dagos_cli.add_command(command)
+    return True
+
+
+def _placeholder_command(
+    name: str, short_help: t.Optional[str]
+) -> t.Callable[[], click.Command]:
+    def loader() -> click.Command:
+        return click.Command(name=name, short_help=short_help)
+
+    return loader
+
+
 def dagos():
+    # Tracing starts right away to cover scanning, which precedes parsing options
+    trace_file = _get_trace_file(sys.argv[1:])
+    if trace_file is not None:
+        Tracer().enable()
+
     try:
-        use_verbosity_from_configuration = False
         arguments = sys.argv[1:]
+        verbosity = _get_verbosity(arguments)
+        configure_logging(0 if verbosity is None else verbosity)
 
-        verbosity = 0
-        if len(arguments) > 0 and "-v" == arguments[0]:
-            verbosity = 1
-        elif len(arguments) > 0 and "-vv" == arguments[0]:
-            verbosity = 2
-        else:
-            use_verbosity_from_configuration = True
-        configure_logging(verbosity)
-
-        configuration = ConfigurationScanner().scan()
-        if use_verbosity_from_configuration:
-            configure_logging(configuration.verbosity)
-        else:
-            configuration.verbosity = verbosity
-
-        SoftwareComponentScanner().scan(configuration.component_search_paths)
-        SoftwareEnvironmentScanner().scan(configuration.environment_search_paths)
-        for command in CommandRegistry.commands.values():
-            dagos_cli.add_command(command)
-        dagos_cli.add_command(wsl)
-        dagos_cli.add_command(env)
-        dagos_cli.add_command(list)
-        dagos_cli()
+        # Printing the version requires neither configuration nor components
+        if _is_version_requested(arguments):
+            dagos_cli()
+
+        # Shell completion answers from the name index, if it is up to date
+        if not _is_completion_requested() or not load_completion_cli():
+            load_cli(verbosity)
+        with span("Run command", "cli", arguments=" ".join(arguments)):
+            dagos_cli()
     except DagosException as e:
         logger.error(e)
         exit(1)
     except Exception as e:
         logger.exception(e)
         exit(1)
+    finally:
+        ScanCache().save()
+        NameIndex().save()
+        if trace_file is not None:
+            Tracer().write(trace_file)
@@ -0,0 +1,50 @@
+import shutil
+import stat
+
+import click
+from loguru import logger
+
+from dagos.core.component_scanner import SoftwareComponentScanner
+from dagos.core.configuration import DagosConfiguration
+from dagos.core.environments import SoftwareEnvironmentScanner
+from dagos.core.name_index import NameIndex
+from dagos.core.scan_cache import ScanCache
+
+
+@click.group(no_args_is_help=True)
+def cache():
+    """
+    Manage the index of scanned components and environments.
+    """
+    pass
+
+
+@cache.command()
+def clear():
+    """Remove the index and all other cached files, e.g., wheels."""
+    ScanCache().clear()
+    NameIndex().clear()
+    cache_dir = ScanCache().cache_dir
+    if cache_dir.is_dir():
+        for path in cache_dir.iterdir():
+            # The socket of a running daemon may reside in the cache folder
+            mode = path.lstat().st_mode
+            if stat.S_ISSOCK(mode):
+                continue
+            if stat.S_ISDIR(mode):
+                shutil.rmtree(path)
+            else:
+                path.unlink()
+    logger.info("Cleared the cache at '{}'", cache_dir)
+
+
+@cache.command()
+def rebuild():
+    """Rebuild the index from all search paths."""
+    configuration = DagosConfiguration()
+    ScanCache().clear()
+    SoftwareComponentScanner().index(configuration.component_search_paths)
+    SoftwareComponentScanner().load_all()
+    SoftwareEnvironmentScanner().index(configuration.environment_search_paths)
+    ScanCache().save()
+    logger.info("Indexed {} files at '{}'", len(ScanCache().files), ScanCache().path)
@@ -0,0 +1,25 @@
+import typing as t
+from pathlib import Path
+
+import click
+
+from dagos.daemon.protocol import default_socket_path
+from dagos.daemon.server import DagosDaemon
+
+
+@click.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="The Unix domain socket to listen on.",
+)
+def daemon(socket_path: t.Optional[Path]):
+    """
+    Serve invocations of dagos from a long-lived process.
+
+    Scanned components and environments stay loaded between invocations, which
+    then only cost a round trip over the socket. Set the DAGOS_DAEMON_SOCKET
+    environment variable to the socket path to forward invocations to the daemon.
+    """
+    DagosDaemon(socket_path if socket_path else default_socket_path()).serve_forever()
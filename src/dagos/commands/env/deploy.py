@@ -1,3 +1,7 @@
+import functools
+import json
+import re
+import threading
 import typing as t
 from pathlib import Path
 
@@ -5,19 +9,72 @@ import click
 from loguru import logger
 
 import dagos.containers.buildah as buildah
+import dagos.containers.wheelhouse as wheelhouse
+from dagos.containers.layer_cache import LayeredScheduler
 from dagos.core.commands import CommandType
 from dagos.core.components import SoftwareComponent
 from dagos.core.configuration import DagosConfiguration
+from dagos.core.entry_point_scanner import EntryPointScanner
 from dagos.core.environments import Image
 from dagos.core.environments import Packages
 from dagos.core.environments import SoftwareEnvironment
 from dagos.core.environments import SoftwareEnvironmentBuilder
+from dagos.core.environments import SoftwareEnvironmentRegistry
+from dagos.core.ledger import DeploymentLedger
+from dagos.core.ledger import fingerprint
+from dagos.core.name_index import NameIndex
 from dagos.core.package_managers import PackageManager
 from dagos.core.package_managers import PackageManagerRegistry
+from dagos.core.scan_cache import default_cache_dir
+from dagos.core.scheduler import Scheduler
 from dagos.exceptions import DagosException
 from dagos.platform import CommandRunner
-from dagos.platform import ContainerCommandRunner
+from dagos.platform import ContainerSessionRunner
+from dagos.platform import platform_utils
 from dagos.platform.command_runner import LocalCommandRunner
+from dagos.tracing import span
+from dagos.utils.concurrency_utils import map_concurrently
+from dagos.utils.file_utils import DOWNLOAD_CACHE_VARIABLE
+
+if t.TYPE_CHECKING:
+    from click.shell_completion import CompletionItem
+
+# Where the download cache of the host is mounted into containers
+CONTAINER_DOWNLOAD_CACHE = "/var/cache/dagos"
+
+
+class EnvironmentType(click.ParamType):
+    """An environment file or the name of a known software environment, which is
+    converted to the file the environment is defined in."""
+
+    name = "environment"
+
+    def convert(
+        self, value: t.Any, param: t.Optional[click.Parameter], ctx: click.Context
+    ) -> Path:
+        if isinstance(value, Path):
+            return value
+        file = Path(value)
+        if file.is_file():
+            return file
+        handle = SoftwareEnvironmentRegistry.handles.get(value)
+        if handle is not None:
+            return handle.path
+        self.fail(
+            f"'{value}' is neither a file nor a known software environment", param, ctx
+        )
+
+    def shell_complete(
+        self, ctx: click.Context, param: click.Parameter, incomplete: str
+    ) -> t.List["CompletionItem"]:
+        from click.shell_completion import CompletionItem
+
+        # Names are taken from the name index, which is up to date during
+        # completion, so environments are neither scanned nor parsed
+        names = [x for x in NameIndex().environments if x.startswith(incomplete)]
+        return [CompletionItem(x) for x in names] + [
+            CompletionItem(incomplete, type="file")
+        ]
 
 
 @click.command()
@@ -31,58 +88,191 @@ from dagos.platform.command_runner import LocalCommandRunner
 @click.option(
     "--image",
     "-i",
-    required=False,
+    "images",
+    multiple=True,
     help="""The base image to use when --container option is provided. Overrides
-            the setting in the provided environment configuration.""",
+            the setting in the provided environment configuration. Provide
+            several times to deploy to each of the images concurrently.""",
 )
-@click.argument(
-    "file",
-    type=click.Path(file_okay=True, dir_okay=False, readable=True, path_type=Path),
+@click.option(
+    "--all-images",
+    is_flag=True,
+    help="""Deploy to all images of the platform/images option concurrently, instead
+            of only the first, when --container option is provided.""",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="""The maximum number of components to install concurrently. Components
+            are installed once the packages and components they depend on are.""",
+)
+@click.option(
+    "--keep-going/--fail-fast",
+    default=False,
+    help="""Whether to keep installing components that do not depend on a failed
+            one, or to stop once any installation failed. Defaults to the latter.""",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="""Install all packages and components, even those a previous local
+            deployment recorded as installed.""",
+)
+@click.option(
+    "--verify",
+    is_flag=True,
+    help="""Verify packages and components recorded as installed by a previous
+            local deployment, and install them again if they fail to verify.""",
 )
-def deploy(container: bool, image: str, file: Path):
-    """Deploy a provided environment."""
+@click.option(
+    "--layers",
+    is_flag=True,
+    help="""Cache an image after each step of a container deployment and reuse the
+            longest sequence of unchanged steps on later deployments.""",
+)
+@click.argument("file", metavar="ENVIRONMENT", type=EnvironmentType())
+def deploy(
+    container: bool,
+    images: t.Tuple[str, ...],
+    all_images: bool,
+    jobs: int,
+    keep_going: bool,
+    force: bool,
+    verify: bool,
+    layers: bool,
+    file: Path,
+):
+    """Deploy a provided environment, given by its file or name.
+
+    Local deployments are recorded, so deploying an environment again only
+    installs what changed since.
+    """
     environment = SoftwareEnvironmentBuilder.from_file(file)
     components = environment.collect_components()
 
     if container:
-        chosen_image = _get_image(image, environment)
-        logger.info(
-            "Deploying environment '{}' into '{}' container image",
-            environment.name,
-            chosen_image.id,
-        )
-        _deploy_to_container(environment, components, chosen_image)
+        chosen_images = _get_images(images, all_images, environment)
+        if len(chosen_images) == 1:
+            logger.info(
+                "Deploying environment '{}' into '{}' container image",
+                environment.name,
+                chosen_images[0].id,
+            )
+            _deploy_to_container(
+                environment,
+                components,
+                chosen_images[0],
+                Scheduler(jobs, keep_going),
+                layers,
+            )
+        else:
+            _deploy_to_containers(
+                environment, components, chosen_images, jobs, keep_going, layers
+            )
     else:
         logger.info("Deploying environment '{}'", environment.name)
-        _deploy_locally(environment, components)
+        ledger = DeploymentLedger(environment.name, force, verify)
+        _deploy_locally(environment, components, Scheduler(jobs, keep_going), ledger)
 
 
-def _get_image(image_option: str, environment: SoftwareEnvironment) -> Image:
-    if image_option:
-        return Image(id=image_option)
+def _get_images(
+    image_options: t.Sequence[str],
+    all_images: bool,
+    environment: SoftwareEnvironment,
+) -> t.List[Image]:
+    known_images = {x.id: x for x in environment.platform.images}
+    if image_options:
+        # Images of the environment keep their packages
+        images = [known_images.get(x, Image(x, [])) for x in image_options]
+        return list({x.id: x for x in images}.values())
     if len(environment.platform.images) > 0:
-        # TODO: Allow choosing which image to deploy to?
-        return environment.platform.images[0]
+        if all_images:
+            return list(environment.platform.images)
+        return environment.platform.images[:1]
     raise DagosException(
         f"For deploying an environment to a container a valid base image is required!"
     )
 
 
+def _deploy_to_containers(
+    environment: SoftwareEnvironment,
+    components: t.List[SoftwareComponent],
+    images: t.List[Image],
+    jobs: int,
+    keep_going: bool,
+    layers: bool = False,
+) -> None:
+    logger.info(
+        "Deploying environment '{}' into {} container images: {}",
+        environment.name,
+        len(images),
+        ", ".join(x.id for x in images),
+    )
+
+    def deploy_image(image: Image) -> t.Optional[Exception]:
+        # Each deployment has its own container and committed image, messages
+        # logged by it are prefixed with its image
+        with logger.contextualize(image=image.id):
+            try:
+                _deploy_to_container(
+                    environment,
+                    components,
+                    image,
+                    Scheduler(jobs, keep_going),
+                    layers,
+                    _image_name(environment.name, image),
+                )
+            except Exception as e:
+                logger.error("Deployment failed\n{}", e)
+                return e
+        return None
+
+    errors = map_concurrently(deploy_image, images, len(images))
+    failed = [x.id for x, y in zip(images, errors) if y is not None]
+    if failed:
+        raise DagosException(
+            f"{len(failed)} of {len(images)} image deployments failed: {', '.join(failed)}"
+        )
+
+
+def _image_name(environment_name: str, image: Image) -> str:
+    # Image names must be lower case and may not contain a registry or tag of
+    # the base image
+    base_name = image.id.rsplit("/", 1)[-1].lower()
+    return f"{environment_name}-{re.sub(r'[^a-z0-9]+', '-', base_name).strip('-')}"
+
+
 def _deploy_locally(
-    environment: SoftwareEnvironment, components: t.List[SoftwareComponent]
+    environment: SoftwareEnvironment,
+    components: t.List[SoftwareComponent],
+    scheduler: Scheduler,
+    ledger: DeploymentLedger,
 ) -> None:
     # TODO: Ensure environment variables are persisted
+    versions = {x.name: x.version for x in environment.components}
 
     def install_component(component: SoftwareComponent):
+        version = versions.get(component.name)
+        if ledger.is_deployed(component, version):
+            logger.info("Component '{}' is deployed already", component.name)
+            return
         logger.info("Deploying component '{}'", component.name)
         install_command = component.commands[CommandType.INSTALL.name]
-        install_command.execute()
+        with span("Install component", "deploy", component=component.name):
+            install_command.execute()
+        platform_utils.invalidate_platform_facts()
+        ledger.record_component(component, version)
 
     _install_packages_and_components(
         LocalCommandRunner(),
         environment.platform.packages,
         components,
         install_component,
+        scheduler,
+        ledger,
     )
 
 
@@ -90,27 +280,42 @@ def _deploy_to_container(
     environment: SoftwareEnvironment,
     components: t.List[SoftwareComponent],
     image: Image,
+    scheduler: Scheduler,
+    layers: bool = False,
+    image_name: t.Optional[str] = None,
 ) -> None:
-    container = buildah.create_container(image.id)
-    command_runner = ContainerCommandRunner(container)
+    # Files downloaded by components are cached on the host and shared by all
+    # containers, so concurrent deployments download each of them once
+    download_cache = default_cache_dir() / "downloads"
+    download_cache.mkdir(parents=True, exist_ok=True)
+    volumes = [f"{download_cache}:{CONTAINER_DOWNLOAD_CACHE}"]
+    if layers:
+        if scheduler.workers > 1:
+            logger.warning("Build cache layers are built one after another")
+        command_runner = ContainerSessionRunner(None)
+        scheduler = LayeredScheduler(
+            image.id, command_runner, scheduler.keep_going, volumes
+        )
+    else:
+        command_runner = ContainerSessionRunner(
+            buildah.create_container(image.id, volumes=volumes)
+        )
 
     try:
-        buildah.config(
-            container,
-            # TODO: Persist environment variables exactly as in local deployment
-            # as the resulting image may be used to import into WSL
-            env_vars={x.name: x.value for x in environment.platform.env},
-            entrypoint="/bin/bash",
-        )
+        env_vars = {x.name: x.value for x in environment.platform.env}
 
-        # Copy software components to container
-        component_dir = Path("/opt/dagos/components")
-        for component in components:
-            buildah.copy(
-                container,
-                component.folders[0],
-                component_dir / component.folders[0].name,
+        def configure():
+            buildah.config(
+                command_runner.container,
+                # TODO: Persist environment variables exactly as in local deployment
+                # as the resulting image may be used to import into WSL
+                env_vars=env_vars,
+                entrypoint="/bin/bash",
             )
+            # The shell session only picks up the new configuration when restarted
+            command_runner.close()
+
+        scheduler.add("config", configure, inputs=json.dumps([env_vars, "/bin/bash"]))
 
         verbosity = DagosConfiguration().verbosity
         if verbosity == 0:
@@ -120,21 +325,53 @@ def _deploy_to_container(
         else:
             verbosity_switch = " -vv "
 
+        # Concurrently installed components must not bootstrap dagos twice
+        bootstrap_lock = threading.Lock()
+        component_dir = Path("/opt/dagos/components")
+
         def install_component(component: SoftwareComponent):
-            if not command_runner.check_command("dagos"):
-                _bootstrap_container(container)
-            command_runner.run(f"dagos{verbosity_switch}install {component.name}")
+            # Copy the software component to the container right before installing
+            # it, so changing a component only affects its own deployment step.
+            # Components provided by installed distributions lack folders.
+            if component.folders:
+                buildah.copy(
+                    command_runner.container,
+                    component.folders[0],
+                    component_dir / component.folders[0].name,
+                )
+            # Only bootstrapping invalidates the probed commands, so all components
+            # share the result of a single probe
+            with bootstrap_lock:
+                if not command_runner.check_command("dagos"):
+                    _bootstrap_container(command_runner.container)
+                    command_runner.invalidate_commands()
+                if not component.folders:
+                    _install_distribution(command_runner.container, component)
+                    command_runner.invalidate_commands()
+            with span("Install component", "deploy", component=component.name):
+                command_runner.run(
+                    f"env {DOWNLOAD_CACHE_VARIABLE}={CONTAINER_DOWNLOAD_CACHE} "
+                    f"dagos{verbosity_switch}install {component.name}"
+                )
 
         _install_packages_and_components(
             command_runner,
             environment.platform.packages + image.packages,
             components,
             install_component,
+            scheduler,
+            requires=["config"],
         )
 
-        buildah.commit(container, environment.name)
+        if layers:
+            # The image of the last step already is the deployed environment
+            buildah.tag(scheduler.image, image_name or environment.name)
+        else:
+            buildah.commit(command_runner.container, image_name or environment.name)
     finally:
-        buildah.rm(container)
+        command_runner.close()
+        if command_runner.container is not None:
+            buildah.rm(command_runner.container)
 
 
 def _install_packages_and_components(
@@ -142,6 +379,9 @@ def _install_packages_and_components(
     packages_to_install: t.List[Packages],
     components: t.List[SoftwareComponent],
     install_component: t.Callable[[SoftwareComponent], None],
+    scheduler: Scheduler,
+    ledger: t.Optional[DeploymentLedger] = None,
+    requires: t.Sequence[str] = (),
 ) -> None:
     # It's important to group packages by manager since there may be several
     # packages defined for a single manager in various places, e.g., general and
@@ -151,68 +391,156 @@ def _install_packages_and_components(
         if package.manager not in package_bundles:
             package_bundles[package.manager] = None
         if package_bundles[package.manager] is None:
-            package_bundles[package.manager] = package
+            # Copied, as the packages of the environment are shared by the
+            # deployments to several images
+            package_bundles[package.manager] = Packages(
+                list(package.package_list), package.manager, package.dependency
+            )
         else:
             package_bundles[package.manager].package_list.extend(package.package_list)
 
-    # TODO: Sort by package manager? For now sorting manually through YAML
-    # First system, and named system managers, then anything else
-    # What about managers that are installed via components? E.g. SDKMAN?
-
-    for manager, packages in package_bundles.items():
-        if manager == "system":
-            package_manager = _select_package_manager(command_runner)
-        else:
-            package_manager = PackageManagerRegistry.find(manager)
-            # TODO: Create adhoc manager from name (and options) for unknown managers
+    # Package managers are used one after another, in the order of the YAML. A
+    # component a package manager depends on is installed right before it, along
+    # with the components it requires. All other components are installed once
+    # all packages are. Components not requiring each other are installed
+    # concurrently, if the scheduler allows it.
+    package_jobs = {x: f"packages ({x})" for x in package_bundles.keys()}
+    components_by_name = {x.name: x for x in components}
 
+    # The index of the first package manager depending on a component
+    needed_by: t.Dict[str, int] = {}
+    providers: t.List[t.List[str]] = []
+    for index, (manager, packages) in enumerate(package_bundles.items()):
+        names = []
         if packages.dependency:
-            component = [x for x in components if x.name == packages.dependency]
-            if len(component) == 1:
-                component = component[0]
-                install_component(component)
-                components.remove(component)
-            elif len(component) == 0:
+            count = len([x for x in components if x.name == packages.dependency])
+            if count == 0:
                 raise DagosException(
                     f"""Unable to satisfy dependency '{packages.dependency}'
                     as there is no such component mentioned in this environment."""
                 )
-            else:
+            elif count > 1:
                 raise DagosException(
                     f"""Unable to satisfy dependency '{packages.dependency}'
                     as there are too many components with the same name mentioned."""
                 )
+            names.append(packages.dependency)
+        package_manager = PackageManagerRegistry.find(manager)
+        if package_manager is not None:
+            provider = package_manager.provided_by()
+            if provider in components_by_name and provider not in names:
+                names.append(provider)
+        providers.append(names)
+
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name not in needed_by:
+                needed_by[name] = index
+                pending.extend(
+                    x
+                    for x in components_by_name[name].requires
+                    if x in components_by_name
+                )
 
+    jobs = list(package_jobs.values())
+    for index, (manager, packages) in enumerate(package_bundles.items()):
+        scheduler.add(
+            jobs[index],
+            functools.partial(
+                _install_packages, command_runner, manager, packages, ledger
+            ),
+            [*(jobs[index - 1 : index] or requires), *providers[index]],
+            json.dumps([manager, packages.package_list, packages.dependency]),
+        )
+
+    for component in components_by_name.values():
+        index = needed_by.get(component.name, len(jobs))
+        component_requires = jobs[index - 1 : index] or list(requires)
+        for requirement in component.requires:
+            if requirement in components_by_name:
+                component_requires.append(requirement)
+            elif requirement in package_jobs:
+                component_requires.append(package_jobs[requirement])
+            else:
+                raise DagosException(
+                    f"The component '{component.name}' requires '{requirement}', which is neither a component nor a package manager of this environment"
+                )
+        scheduler.add(
+            component.name,
+            functools.partial(install_component, component),
+            component_requires,
+            fingerprint(component),
+        )
+
+    scheduler.run()
+
+
+def _install_packages(
+    command_runner: CommandRunner,
+    manager: str,
+    packages: Packages,
+    ledger: t.Optional[DeploymentLedger] = None,
+) -> None:
+    if manager == "system":
+        package_manager = _select_package_manager(command_runner)
+    else:
+        package_manager = PackageManagerRegistry.find(manager)
+        # TODO: Create adhoc manager from name (and options) for unknown managers
+
+    package_list = packages.package_list
+    if ledger is not None:
+        if package_manager is not None:
+            manager = package_manager.name()
+        package_list = ledger.find_missing_packages(
+            manager, package_list, package_manager, command_runner
+        )
+        if not package_list:
+            logger.info("All {} packages are deployed already", manager)
+            return
+
+    with span("Install packages", "deploy", manager=manager):
         if package_manager is None:
-            command_runner.run(f"{manager} install {' '.join(packages.package_list)}")
+            command_runner.run(f"{manager} install {' '.join(package_list)}")
         else:
-            package_manager.install(packages.package_list, command_runner)
+            package_manager.install(package_list, command_runner)
             package_manager.clean(command_runner)
-
-    # Install remaining components
-    for component in components:
-        install_component(component)
+    # Installed packages may provide commands probed by later components
+    command_runner.invalidate_commands()
+    if ledger is not None:
+        ledger.record_packages(manager, package_list)
 
 
 def _bootstrap_container(container: str) -> None:
-    """Install dagos on the container."""
-    # TODO: How important is it to have the exact same version of dagos installed?
-    # TODO: Include dagos wheel within dagos to skip git installation and
-    #       have the same version calling dagos installed.
-
-    # TODO: Ensure the installed python version is supported
-    buildah.run(container, "python3 --version")
-    buildah.run(
+    """Install the running version of dagos on the container, from wheels built
+    on the host."""
+    wheelhouse.install_dagos(container, wheelhouse.build_wheelhouse())
+
+
+def _install_distribution(container: str, component: SoftwareComponent) -> None:
+    """Install the distribution providing a software component via an entry point
+    on the container, from wheels built on the host."""
+    distribution = EntryPointScanner().find_distribution(component.name)
+    if distribution is None:
+        raise DagosException(
+            f"The software component '{component.name}' has neither a folder nor a distribution to install it from"
+        )
+    wheelhouse.install_distribution(
         container,
-        "python3 -m pip install git+https://github.com/DAG-OS/dagos.git#egg=dagos",
+        wheelhouse.build_distribution_wheelhouse(distribution),
+        distribution.metadata["Name"],
+        distribution.version,
     )
 
 
 def _select_package_manager(command_runner: CommandRunner) -> PackageManager:
-    for package_manager in PackageManagerRegistry.managers:
-        if command_runner.check_command(package_manager.name()):
+    available = command_runner.check_commands(
+        [x.name() for x in PackageManagerRegistry.managers.values()]
+    )
+    for package_manager in PackageManagerRegistry.managers.values():
+        if available[package_manager.name()]:
             return package_manager
-    supported_managers = [x.name() for x in PackageManagerRegistry.managers]
+    supported_managers = [*PackageManagerRegistry.managers.keys()]
     raise DagosException(
         f"None of the supported package managers are available: {', '.join(supported_managers)}"
     )
@@ -3,7 +3,6 @@ import fnmatch
 import typing as t
 from pathlib import Path
 
-import requests
 from loguru import logger
 
 from dagos.core.commands import InstallCommand
@@ -80,6 +79,8 @@ class GitHubInstallCommand(InstallCommand):
 
     def execute(self) -> None:
         # TODO: Check if root privileges are required
+        import requests
+
         logger.debug("Querying GitHub for latest release")
         url = self._parse_repository_url()
         response = requests.get(url)
@@ -94,16 +95,22 @@ class GitHubInstallCommand(InstallCommand):
         )
         archive = file_utils.download_file(asset["browser_download_url"])
         atexit.register(lambda: archive.unlink())
+        self.resolved_version = release_json.get("tag_name", release_json["name"])
+        self.artifact_hash = file_utils.hash_file(archive)
 
         # TODO: Is there a need to check if its an archive?
         install_path = Path(self.install_dir).expanduser()
         file_utils.extract_archive(archive, install_path, self.strip_root_folder)
+        self.installed_paths = [install_path]
 
         self.post_extraction(install_path)
 
         if hasattr(self, "binary"):
             # TODO: Allow system installation
-            platform_utils.add_binary_to_path(install_path / self.binary, force=True)
+            link = platform_utils.add_binary_to_path(
+                install_path / self.binary, force=True
+            )
+            self.installed_paths.append(link.expanduser())
 
     def post_extraction(self, install_path: Path) -> None:
         """Called after the downloaded archive is extracted. May be used by
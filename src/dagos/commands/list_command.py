@@ -1,9 +1,15 @@
+from __future__ import annotations
+
+import typing as t
+
 import click
-from rich.text import Text
 
 from dagos.core.components import SoftwareComponentRegistry
 from dagos.core.environments import SoftwareEnvironmentRegistry
-from dagos.logging import console
+from dagos.logging import get_console
+
+if t.TYPE_CHECKING:
+    from rich.text import Text
 
 
 @click.command()
@@ -26,17 +32,22 @@ def list(components: bool, environments: bool):
     """
     if not components and not environments:
         components, environments = True, True
+    console = get_console()
     if components:
+        SoftwareComponentRegistry.load_all()
         component_amount = len(SoftwareComponentRegistry.components)
         console.print(render_title(f"Software Components ({component_amount})"))
-        for component in SoftwareComponentRegistry.components:
+        for component in SoftwareComponentRegistry.components.values():
             console.print(component)
     if environments:
+        SoftwareEnvironmentRegistry.load_all()
         env_amount = len(SoftwareEnvironmentRegistry.environments)
         console.print(render_title(f"Software Environments ({env_amount})"))
-        for environment in SoftwareEnvironmentRegistry.environments:
+        for environment in SoftwareEnvironmentRegistry.environments.values():
             console.print(environment)
 
 
 def render_title(title: str) -> Text:
+    from rich.text import Text
+
     return Text(text=title, style="table.title")
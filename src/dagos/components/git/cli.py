@@ -1,7 +1,6 @@
 import typing as t
 from pathlib import Path
 
-import yaml
 from loguru import logger
 
 from dagos.core.commands import ConfigureCommand
@@ -9,6 +8,7 @@ from dagos.core.commands import InstallCommand
 from dagos.core.components import SoftwareComponent
 from dagos.platform import PlatformIssue
 from dagos.platform import PlatformSupportChecker
+from dagos.utils import yaml_utils
 
 try:
     import ansible_runner
@@ -66,8 +66,7 @@ class ConfigureGitCommand(ConfigureCommand):
 
         git_config_file = self.parent.get_file("config.yml")
         if git_config_file:
-            with open(git_config_file) as f:
-                config_values = yaml.safe_load(f)
+            config_values = yaml_utils.load_file(git_config_file)
             if config_values["git_settings"]:
                 extravars["git_settings"] = config_values["git_settings"]
 
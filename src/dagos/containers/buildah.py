@@ -6,6 +6,7 @@ from loguru import logger
 
 from dagos.logging import LogLevel
 from dagos.platform import platform_utils
+from dagos.tracing import traced
 
 
 def _unwind_dict(arg: str, dict: t.Dict[str, str]) -> t.List[str]:
@@ -22,6 +23,7 @@ def _unwind_list(arg: str, items: t.List[str]) -> t.List[str]:
     return result
 
 
+@traced("buildah from", "buildah")
 def create_container(
     container_image: str,
     name: str = None,
@@ -50,6 +52,7 @@ def create_container(
     return container
 
 
+@traced("buildah commit", "buildah")
 def commit(
     container: str,
     image_name: t.Optional[str] = None,
@@ -84,6 +87,7 @@ def commit(
     return image_name if image_name else image
 
 
+@traced("buildah config", "buildah")
 def config(
     container: str,
     annotations: t.Optional[t.Dict[str, str]] = None,
@@ -147,6 +151,7 @@ def config(
         platform_utils.run_command(command)
 
 
+@traced("buildah copy", "buildah")
 def copy(
     container: str,
     src: t.Union[str, Path],
@@ -173,6 +178,61 @@ def copy(
     platform_utils.run_command(command)
 
 
+@traced("buildah inspect", "buildah")
+def image_id(image: str) -> t.Optional[str]:
+    """Get the ID of provided local image.
+
+    Args:
+        image (str): The name or ID of the image.
+
+    Returns:
+        t.Optional[str]: The image ID or None, if there is no such local image.
+    """
+    result = platform_utils.run_command(
+        [
+            "buildah",
+            "inspect",
+            "--type",
+            "image",
+            "--format",
+            "{{.FromImageID}}",
+            image,
+        ],
+        capture_stdout=True,
+        capture_stderr=True,
+        ignore_failure=True,
+        log_level=LogLevel.DEBUG,
+    )
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
+def image_exists(image: str) -> bool:
+    """Check if provided image exists locally.
+
+    Args:
+        image (str): The name or ID of the image.
+
+    Returns:
+        bool: True, if the image exists.
+    """
+    return image_id(image) is not None
+
+
+@traced("buildah tag", "buildah")
+def tag(image: str, name: str) -> None:
+    """Add an additional name to provided local image.
+
+    Args:
+        image (str): The name or ID of the image.
+        name (str): The name to add.
+    """
+    platform_utils.run_command(["buildah", "tag", image, name])
+    logger.info(f"Tagged image '{name}'")
+
+
+@traced("buildah rm", "buildah")
 def rm(container: str) -> None:
     """Remove provided container.
 
@@ -182,6 +242,7 @@ def rm(container: str) -> None:
     platform_utils.run_command(["buildah", "rm", container], capture_stdout=True)
 
 
+@traced("buildah run", "buildah")
 def run(
     container: str,
     command: t.Union[str, t.List[str]],
@@ -228,6 +289,7 @@ def run(
     )
 
 
+@traced("buildah check command", "buildah")
 def check_command(container: str, command: str, user: t.Optional[str] = None) -> bool:
     """Check if provided command is available in provided container.
 
@@ -0,0 +1,104 @@
+import hashlib
+import typing as t
+
+from loguru import logger
+
+import dagos.containers.buildah as buildah
+import dagos.containers.wheelhouse as wheelhouse
+from dagos.core.scheduler import Scheduler
+from dagos.exceptions import DagosException
+from dagos.platform import ContainerCommandRunner
+
+CACHE_REPOSITORY = "localhost/dagos-layer"
+
+
+class LayeredScheduler(Scheduler):
+    """Runs the jobs of a container deployment one after another and commits an
+    intermediate image after each of them, similar to the layer cache of
+    container image builds.
+
+    Each image is tagged with a key derived from the running dagos, the base
+    image, the inputs of the job, and the key of the preceding job. On later deployments the longest
+    sequence of jobs whose images exist is skipped, and the working container
+    is created from the last of these images instead.
+
+    The working container is created once the scheduler runs and is assigned to
+    the provided command runner, which all jobs have to use.
+    """
+
+    def __init__(
+        self,
+        base_image: str,
+        command_runner: ContainerCommandRunner,
+        keep_going: bool = False,
+        volumes: t.Optional[t.List[str]] = None,
+    ) -> None:
+        """
+        Args:
+            base_image (str): The image to start from.
+            command_runner (ContainerCommandRunner): The command runner of the
+                jobs, which is assigned the working container.
+            keep_going (bool, optional): Ignored, as the jobs build upon each other
+                any failure stops the deployment. Defaults to False.
+            volumes (t.Optional[t.List[str]], optional): The volumes to mount
+                into the working container. Defaults to None.
+        """
+        super().__init__(1, False)
+        if keep_going:
+            logger.warning("Build cache layers are incompatible with --keep-going")
+        self.base_image = base_image
+        self.command_runner = command_runner
+        self.volumes = volumes
+        # The image of the last job that ran or was reused
+        self.image = base_image
+
+    def run(self) -> None:
+        order = [x for level in self.plan() for x in level]
+        keys = self._derive_keys(order)
+
+        reused = 0
+        while reused < len(keys) and buildah.image_exists(self._tag(keys[reused])):
+            reused += 1
+        if reused > 0:
+            self.image = self._tag(keys[reused - 1])
+            for name in order[:reused]:
+                logger.debug("[bold]{}[/bold]: Using cache", name)
+        logger.info("Reusing {} of {} cached deployment steps", reused, len(keys))
+
+        self.command_runner.container = buildah.create_container(
+            self.image, volumes=self.volumes
+        )
+        for name, key in zip(order[reused:], keys[reused:]):
+            error = self._execute(self.jobs[name])
+            if error is not None:
+                raise DagosException(f"The deployment step '{name}' failed: {error}")
+            self.image = buildah.commit(self.command_runner.container, self._tag(key))
+
+    def _derive_keys(self, order: t.List[str]) -> t.List[str]:
+        base_image_id = buildah.image_id(self.base_image)
+        # Layers depend on the dagos installed into them, which may change
+        # without its version changing when run from source
+        parent = _hash(
+            wheelhouse.wheelhouse_key(), self.base_image, base_image_id or ""
+        )
+        keys = []
+        for name in order:
+            inputs = self.jobs[name].inputs
+            if inputs is None:
+                raise DagosException(
+                    f"The deployment step '{name}' does not describe its inputs"
+                )
+            parent = _hash(parent, name, inputs)
+            keys.append(parent)
+        return keys
+
+    def _tag(self, key: str) -> str:
+        return f"{CACHE_REPOSITORY}:{key}"
+
+
+def _hash(*values: str) -> str:
+    digest = hashlib.sha256()
+    for value in values:
+        digest.update(value.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
@@ -0,0 +1,228 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import typing as t
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+from loguru import logger
+
+import dagos
+import dagos.containers.buildah as buildah
+from dagos.core.scan_cache import default_cache_dir
+from dagos.exceptions import DagosException
+from dagos.platform import platform_utils
+
+# Where wheelhouses are copied to within containers
+CONTAINER_WHEELHOUSE = "/tmp/dagos-wheels"
+
+# Concurrent deployments share the wheelhouse, which is built once
+_build_lock = threading.Lock()
+
+
+def find_source_dir() -> t.Optional[Path]:
+    """Find the project folder dagos runs from, if it is run from source rather
+    than an installed distribution.
+
+    Returns:
+        t.Optional[Path]: The folder containing the `pyproject.toml` of dagos, if
+        any.
+    """
+    source_dir = Path(dagos.__file__).resolve().parent.parent.parent
+    pyproject = source_dir / "pyproject.toml"
+    if pyproject.is_file() and 'name = "dagos"' in pyproject.read_text():
+        return source_dir
+    return None
+
+
+def build_wheelhouse(cache_dir: t.Optional[Path] = None) -> Path:
+    """Build wheels of the running dagos and all its dependencies, unless they
+    are cached already.
+
+    When run from source the wheel is built from it, and rebuilt whenever any
+    of its files change. Otherwise the wheels of the installed version are
+    fetched once.
+
+    Args:
+        cache_dir (t.Optional[Path], optional): The folder to cache wheelhouses
+            in. Defaults to the DAG-OS cache folder.
+
+    Raises:
+        DagosException: If building the wheels failed.
+
+    Returns:
+        Path: The folder containing the wheels.
+    """
+    source_dir = find_source_dir()
+    requirement = (
+        str(source_dir) if source_dir is not None else f"dagos=={dagos.__version__}"
+    )
+    return _build(
+        f"dagos {dagos.__version__}",
+        requirement,
+        _wheelhouse_key(source_dir),
+        cache_dir,
+    )
+
+
+def build_distribution_wheelhouse(
+    distribution: t.Any, cache_dir: t.Optional[Path] = None
+) -> Path:
+    """Build wheels of an installed distribution, e.g., one providing software
+    components, and all its dependencies, unless they are cached already.
+
+    Distributions installed from a folder, archive, or version control are
+    built from there, others are fetched from the package index.
+
+    Args:
+        distribution (t.Any): The installed distribution, as provided by
+            `importlib.metadata`.
+        cache_dir (t.Optional[Path], optional): The folder to cache wheelhouses
+            in. Defaults to the DAG-OS cache folder.
+
+    Raises:
+        DagosException: If building the wheels failed.
+
+    Returns:
+        Path: The folder containing the wheels.
+    """
+    name = distribution.metadata["Name"]
+    version = distribution.version
+    requirement = _find_requirement(distribution)
+    key = hashlib.sha256(requirement.encode()).hexdigest()[:16]
+    return _build(
+        f"{name} {version}", requirement, f"{name}-{version}-{key}", cache_dir
+    )
+
+
+def _build(
+    description: str, requirement: str, key: str, cache_dir: t.Optional[Path]
+) -> Path:
+    if cache_dir is None:
+        cache_dir = default_cache_dir() / "wheels"
+    wheelhouse = cache_dir / key
+
+    with _build_lock:
+        if wheelhouse.is_dir():
+            logger.debug("Using cached wheels of {}", description)
+            return wheelhouse
+
+        logger.info("Building wheels of {}", description)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Build into a temporary folder first, so a failed build is never reused
+        build_dir = Path(tempfile.mkdtemp(prefix=".build-", dir=cache_dir))
+        try:
+            platform_utils.run_command(
+                [
+                    sys.executable,
+                    "-m",
+                    "pip",
+                    "wheel",
+                    "--quiet",
+                    "--wheel-dir",
+                    str(build_dir),
+                    requirement,
+                ]
+            )
+            os.replace(build_dir, wheelhouse)
+        except Exception as e:
+            raise DagosException(f"Failed to build wheels of {description}: {e}")
+        finally:
+            shutil.rmtree(build_dir, ignore_errors=True)
+    return wheelhouse
+
+
+def install_dagos(container: str, wheelhouse: Path) -> None:
+    """Install dagos on provided container from a wheelhouse.
+
+    Dependencies are installed from the wheelhouse as well if possible, i.e.,
+    unless the wheels of the host do not fit the Python of the container. In
+    that case they are installed from the package index.
+
+    Args:
+        container (str): The container to install dagos on.
+        wheelhouse (Path): The folder containing the wheels.
+    """
+    # TODO: Ensure the installed python version is supported
+    buildah.run(container, "python3 --version")
+    install_distribution(container, wheelhouse, "dagos", dagos.__version__)
+
+
+def install_distribution(
+    container: str, wheelhouse: Path, name: str, version: str
+) -> None:
+    """Install a distribution on provided container from a wheelhouse, see
+    `install_dagos`.
+
+    Args:
+        container (str): The container to install the distribution on.
+        wheelhouse (Path): The folder containing the wheels.
+        name (str): The name of the distribution.
+        version (str): The version of the distribution.
+    """
+    container_wheelhouse = f"{CONTAINER_WHEELHOUSE}/{wheelhouse.name}"
+    buildah.copy(container, wheelhouse, container_wheelhouse)
+    install = (
+        f"python3 -m pip install --find-links {container_wheelhouse} {name}=={version}"
+    )
+    try:
+        result = buildah.run(container, f"{install} --no-index", ignore_failure=True)
+        if result.returncode != 0:
+            logger.warning(
+                "Unable to install {} offline, installing its dependencies from the package index",
+                name,
+            )
+            buildah.run(container, install)
+    finally:
+        buildah.run(container, f"rm -rf {container_wheelhouse}")
+
+
+def wheelhouse_key() -> str:
+    """Identify the running dagos, i.e., its version and, when run from source,
+    the contents of its sources.
+
+    Returns:
+        str: The key of the wheelhouse of the running dagos.
+    """
+    return _wheelhouse_key(find_source_dir())
+
+
+def _find_requirement(distribution: t.Any) -> str:
+    # Distributions installed from elsewhere than an index describe their origin,
+    # see https://packaging.python.org/en/latest/specifications/direct-url/
+    name = distribution.metadata["Name"]
+    try:
+        direct_url = json.loads(distribution.read_text("direct_url.json") or "null")
+    except ValueError:
+        direct_url = None
+    if not direct_url or "url" not in direct_url:
+        return f"{name}=={distribution.version}"
+    url = direct_url["url"]
+    if "vcs_info" in direct_url:
+        vcs_info = direct_url["vcs_info"]
+        return f"{name} @ {vcs_info['vcs']}+{url}@{vcs_info['commit_id']}"
+    if url.startswith("file://") and "dir_info" in direct_url:
+        return str(Path(urllib.request.url2pathname(urllib.parse.urlparse(url).path)))
+    return f"{name} @ {url}"
+
+
+def _wheelhouse_key(source_dir: t.Optional[Path]) -> str:
+    if source_dir is None:
+        return dagos.__version__
+    # Sources may change without their version changing
+    digest = hashlib.sha256()
+    for file in sorted([source_dir / "pyproject.toml", *_source_files(source_dir)]):
+        digest.update(file.relative_to(source_dir).as_posix().encode())
+        digest.update(file.read_bytes())
+    return f"{dagos.__version__}-{digest.hexdigest()[:16]}"
+
+
+def _source_files(source_dir: Path) -> t.Iterator[Path]:
+    for file in (source_dir / "src" / "dagos").rglob("*"):
+        if file.is_file() and "__pycache__" not in file.parts:
+            yield file
@@ -3,11 +3,16 @@ from __future__ import annotations
 import typing as t
 from abc import abstractmethod
 from enum import Enum
+from pathlib import Path
 
 import click
 
 from dagos.platform import PlatformIssue
 from dagos.platform import UnsupportedPlatformException
+from dagos.tracing import span
+
+if t.TYPE_CHECKING:
+    from click.shell_completion import CompletionItem
 
 
 class CommandType(Enum):
@@ -21,12 +26,125 @@ class CommandType(Enum):
     VERIFY = "verify"
 
 
+class LazyGroup(click.Group):
+    """A Click group that defers constructing its commands until they are used.
+
+    Lazy commands are listed with the help texts provided upon adding them. Only
+    when a lazy command is resolved its loader is called, which either returns
+    the command or adds it to the group itself.
+    """
+
+    lazy_commands: t.Dict[
+        str, t.Tuple[t.Callable[[], t.Optional[click.Command]], t.Dict]
+    ]
+
+    def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = {}
+
+    def add_lazy_command(
+        self,
+        name: str,
+        loader: t.Callable[[], t.Optional[click.Command]],
+        help: t.Optional[str] = None,
+        short_help: t.Optional[str] = None,
+    ) -> None:
+        """Add a command that is only constructed once it is resolved.
+
+        Args:
+            name (str): The name of the command.
+            loader (t.Callable[[], t.Optional[click.Command]]): Constructs the command.
+            help (str, optional): The help text shown before the command is loaded.
+            short_help (str, optional): The short help text shown before the command is loaded.
+        """
+        if name not in self.commands:
+            self.lazy_commands[name] = (
+                loader,
+                {"help": help, "short_help": short_help},
+            )
+
+    def add_command(self, cmd: click.Command, name: t.Optional[str] = None) -> None:
+        super().add_command(cmd, name)
+        self.lazy_commands.pop(name or cmd.name, None)
+
+    def remove_command(self, name: str) -> None:
+        """Remove the command with provided name, whether it is loaded or not.
+
+        Args:
+            name (str): The name of the command.
+        """
+        self.commands.pop(name, None)
+        self.lazy_commands.pop(name, None)
+
+    def load_command(self, name: str) -> t.Optional[click.Command]:
+        """Load the lazy command with provided name, if it was not loaded yet.
+
+        Args:
+            name (str): The name of the command.
+
+        Returns:
+            t.Optional[click.Command]: The loaded command or None, if there is none.
+        """
+        if name in self.lazy_commands:
+            loader, _ = self.lazy_commands.pop(name)
+            with span("Load command", "cli", command=name):
+                command = loader()
+            if command is not None and name not in self.commands:
+                self.add_command(command, name)
+        return self.commands.get(name)
+
+    def list_commands(self, ctx: click.Context) -> t.List[str]:
+        return sorted({*self.commands.keys(), *self.lazy_commands.keys()})
+
+    def get_command(
+        self, ctx: click.Context, cmd_name: str
+    ) -> t.Optional[click.Command]:
+        if cmd_name in self.commands:
+            return self.commands[cmd_name]
+        if cmd_name in self.lazy_commands:
+            # A placeholder is sufficient for listing the command, e.g., in help
+            # texts. Resolving the command loads the real one.
+            return click.Command(name=cmd_name, **self.lazy_commands[cmd_name][1])
+        return None
+
+    def shell_complete(
+        self, ctx: click.Context, incomplete: str
+    ) -> t.List[CompletionItem]:
+        from click.shell_completion import CompletionItem
+        from click.utils import make_default_short_help
+
+        # Lazy commands are completed by their help texts, so neither they nor
+        # placeholders for them are constructed
+        results = []
+        for name in self.list_commands(ctx):
+            if not name.startswith(incomplete):
+                continue
+            if name in self.lazy_commands:
+                help_texts = self.lazy_commands[name][1]
+                short_help = help_texts["short_help"]
+                if short_help is None and help_texts["help"]:
+                    short_help = make_default_short_help(help_texts["help"])
+                results.append(CompletionItem(name, help=short_help))
+            elif not self.commands[name].hidden:
+                command = self.commands[name]
+                results.append(CompletionItem(name, help=command.get_short_help_str()))
+        results.extend(click.Command.shell_complete(self, ctx, incomplete))
+        return results
+
+    def resolve_command(
+        self, ctx: click.Context, args: t.List[str]
+    ) -> t.Tuple[t.Optional[str], t.Optional[click.Command], t.List[str]]:
+        if args and args[0] in self.lazy_commands:
+            self.load_command(args[0])
+        return super().resolve_command(ctx, args)
+
+
 class CommandRegistry(type):
     """A metaclass responsible for registering constructed commands grouped by
     their type.
     """
 
-    commands: t.Dict[CommandType, t.List[t.Union[click.Command, click.Group]]] = {}
+    commands: t.Dict[str, LazyGroup] = {}
 
     def __call__(cls, *args: t.Any, **kwds: t.Any) -> t.Any:
         """The registry hooks into the object construction lifecycle to register
@@ -51,12 +169,48 @@ class CommandRegistry(type):
             type (CommandType): The command type.
             command (click.Command | click.Group): The command to register.
         """
+        cls._get_group(type).add_command(command)
+
+    @classmethod
+    def add_lazy_command(
+        cls,
+        type: CommandType,
+        name: str,
+        loader: t.Callable[[], t.Optional[click.Command]],
+        help: t.Optional[str] = None,
+        short_help: t.Optional[str] = None,
+    ) -> None:
+        """Add a command of provided type that is only constructed when it is
+        invoked.
+
+        Args:
+            type (CommandType): The command type.
+            name (str): The name of the command.
+            loader (t.Callable[[], t.Optional[click.Command]]): Constructs the command.
+            help (str, optional): The help text shown before the command is loaded.
+            short_help (str, optional): The short help text shown before the command is loaded.
+        """
+        cls._get_group(type).add_lazy_command(name, loader, help, short_help)
+
+    @classmethod
+    def remove_command(cls, type: CommandType, name: str) -> None:
+        """Remove the command with provided name from the group of provided type.
+
+        Args:
+            type (CommandType): The command type.
+            name (str): The name of the command.
+        """
+        if type.name in cls.commands:
+            cls.commands[type.name].remove_command(name)
+
+    @classmethod
+    def _get_group(cls, type: CommandType) -> LazyGroup:
         if type.name not in cls.commands:
-            cls.commands[type.name] = click.Group(
+            cls.commands[type.name] = LazyGroup(
                 name=type.value,
                 help=f"{type.value.capitalize()} software components.",
             )
-        cls.commands[type.name].add_command(command)
+        return cls.commands[type.name]
 
 
 def _build_unsupported_platform_command(
@@ -137,7 +291,18 @@ class Command(metaclass=CommandRegistry):
 
 
 class InstallCommand(Command):
-    """Base class for install commands."""
+    """Base class for install commands.
+
+    Once executed, implementing commands may report what they installed, which
+    is recorded by deployments.
+    """
+
+    # The version that was installed, e.g., the name of a release
+    resolved_version: t.Optional[str] = None
+    # The SHA-256 hash of the installed artifact, e.g., a downloaded archive
+    artifact_hash: t.Optional[str] = None
+    # The files and folders that were installed
+    installed_paths: t.List[Path] = []
 
     def __init__(self, parent: SoftwareComponent) -> None:  # type: ignore reportUndefinedVariable
         super().__init__(CommandType.INSTALL, parent)
@@ -1,6 +1,7 @@
 import importlib.util
 import inspect
-import re
+import os
+import types
 import typing as t
 from dataclasses import dataclass
 from dataclasses import field
@@ -11,93 +12,305 @@ from loguru import logger
 from dagos.commands.github import GitHubInstallCommand
 from dagos.core.commands import CommandRegistry
 from dagos.core.commands import CommandType
+from dagos.core.components import ComponentFiles
 from dagos.core.components import SoftwareComponent
+from dagos.core.components import SoftwareComponentRegistry
+from dagos.core.scan_cache import ScanCache
 from dagos.core.validator import Validator
 from dagos.exceptions import SchemaValidationException
 from dagos.exceptions import ValidationException
+from dagos.platform import platform_utils
 from dagos.platform import UnsupportedPlatformException
+from dagos.tracing import span
+from dagos.tracing import traced
+from dagos.utils.concurrency_utils import map_concurrently
+from dagos.utils.dataclass_utils import slotted
 
 
+@slotted
 @dataclass
 class CommandResult:
     file: Path
     provider: str
     type: CommandType
     config: t.Dict
+    requires: t.List[str] = field(default_factory=list)
 
 
+@slotted
 @dataclass
 class ComponentResult:
     component: t.Optional[SoftwareComponent] = None
     commands: t.List[CommandResult] = field(default_factory=list)
-    folders: t.List[Path] = field(default_factory=list)
-    files: t.List[Path] = field(default_factory=list)
+    paths: ComponentFiles = field(default_factory=ComponentFiles)
+    fingerprint: t.List[t.List] = field(default_factory=list)
+    loaded: bool = False
+    # The name the software component is registered with
+    name: t.Optional[str] = None
+    # The kind, key, and value of the platform facts its support depends on
+    platform_facts: t.List[t.List] = field(default_factory=list)
+    # Whether a module failed to import, e.g., due to a missing dependency
+    import_failed: bool = False
+
+    @property
+    def folders(self) -> t.List[Path]:
+        return self.paths.folders
+
+    @property
+    def files(self) -> t.List[Path]:
+        return self.paths.files
 
 
 class SoftwareComponentScanner:
 
     scan_result: t.Dict[str, ComponentResult] = {}
 
-    def scan(self, search_paths: t.List[Path]) -> None:
+    @traced("Scan software components", "scan")
+    def scan(self, search_paths: t.List[Path], workers: int = 1) -> None:
+        """Scan provided search paths for software components.
+
+        Args:
+            search_paths (t.List[Path]): The paths to scan, in order of precedence.
+            workers (int, optional): The number of threads used to list search paths
+                and component folders. Defaults to 1.
+        """
         logger.trace("Looking for software components in {} places", len(search_paths))
-        for search_path in search_paths:
-            if self._is_valid_search_path(search_path):
-                self._scan_search_path(search_path)
+        search_paths = [x for x in search_paths if self._is_valid_search_path(x)]
+        # Folders are listed concurrently but added in order of their search path
+        # and name, so the outcome does not depend on the number of workers.
+        folders = [
+            folder
+            for folders in map_concurrently(
+                self._list_component_folders, search_paths, workers
+            )
+            for folder in folders
+        ]
+        listings = map_concurrently(self._list_component_files, folders, workers)
+        for folder, files in zip(folders, listings):
+            self._add_folder(folder, files)
+
+        for name, component_result in self.scan_result.items():
+            if not component_result.loaded:
+                self._load_or_register_lazily(name)
+
+    def refresh(self, search_paths: t.List[Path], names: t.Iterable[str]) -> t.Set[str]:
+        """Scan the component folders with provided names anew and replace, add, or
+        remove the software components and commands registered for them.
+
+        Args:
+            search_paths (t.List[Path]): The paths to look for the folders in, in
+                order of precedence.
+            names (t.Iterable[str]): The names of the changed component folders.
+
+        Returns:
+            t.Set[str]: The names of all removed and (re-)registered software
+            components.
+        """
+        search_paths = [x for x in search_paths if self._is_valid_search_path(x)]
+        affected = set()
+        for name in names:
+            affected.update(self.remove(name))
+            if name.startswith("__"):
+                continue
+            for search_path in search_paths:
+                folder = search_path / name
+                if folder.is_dir():
+                    self._add_folder(folder, self._list_component_files(folder))
+            if name in self.scan_result:
+                logger.debug("[bold]{}[/bold]: Refreshing software component", name)
+                self._load_or_register_lazily(name)
+                affected.add(self.scan_result[name].name)
+        affected.discard(None)
+        return affected
+
+    def remove(self, name: str) -> t.Set[str]:
+        """Remove the software component found in the folder(s) with provided name
+        and all of its commands.
+
+        Args:
+            name (str): The folder name of the software component.
+
+        Returns:
+            t.Set[str]: The names the software component was registered with.
+        """
+        scan = self.scan_result.pop(name, None)
+        if scan is None:
+            return set()
+        component_names = {scan.name}
+        if scan.component is not None:
+            component_names.add(scan.component.name)
+        component_names.discard(None)
+        for component_name in component_names:
+            logger.trace("[bold]{}[/bold]: Removing software component", component_name)
+            SoftwareComponentRegistry.remove_component(component_name)
+            for type in CommandType:
+                CommandRegistry.remove_command(type, component_name)
+        return component_names
+
+    def _load_or_register_lazily(self, name: str) -> None:
+        # Components described in the scan cache are only loaded once they are
+        # used, all others are loaded right away to describe them.
+        description = ScanCache().get_component(
+            name, self._fingerprint(self.scan_result[name])
+        )
+        if description is None or self._is_platform_changed(description):
+            self.load_component(name)
+        else:
+            self._register_lazily(name, description)
+
+    def _is_platform_changed(self, description: t.Dict) -> bool:
+        # Whether the manage command group is registered depends on the platform,
+        # e.g., on commands that may have been installed or removed since
+        if "platform_facts" not in description:
+            return True
+        return not platform_utils.platform_facts_hold(description["platform_facts"])
+
+    def load_component(self, name: str) -> t.Optional[SoftwareComponent]:
+        """Load the software component found in the folder(s) with provided name.
+        That is, its module is executed and its commands are constructed and
+        registered.
+
+        Args:
+            name (str): The folder name of the software component.
+
+        Returns:
+            t.Optional[SoftwareComponent]: The loaded software component or None,
+            if the folders contain none.
+        """
+        scan = self.scan_result[name]
+        if scan.loaded:
+            return scan.component
+        scan.loaded = True
+        logger.trace("[bold]{}[/bold]: Loading software component", name)
+        with span("Load software component", "scan", component=name):
+            self._load_component(name, scan)
+        return scan.component
+
+    def _load_component(self, name: str, scan: ComponentResult) -> None:
+        for file in scan.files:
+            if file.suffix in [".yml", ".yaml"]:
+                self._parse_yaml_file(name, file, scan)
+            elif file.suffix == ".py" and scan.component is None:
+                # TODO: What if there are multiple SoftwareComponents in the py files?
+                module_name = f"dagos.components.external.{name}"
+                module = self._load_module(name, module_name, file)
+                if module is None:
+                    scan.import_failed = True
+                    continue
+                classes = inspect.getmembers(module, inspect.isclass)
+                self._find_software_component(name, classes, scan)
 
         # Add found commands to existing components or create new ones when no
         # explicit component is defined
-        for name, component_result in self.scan_result.items():
-            if len(component_result.commands) > 0:
-                if component_result.component is None:
-                    component_result.component = SoftwareComponent(
-                        name, component_result.folders, component_result.files
-                    )
-                for command_result in component_result.commands:
-                    self._construct_command(component_result.component, command_result)
+        if len(scan.commands) > 0:
+            if scan.component is None:
+                scan.component = SoftwareComponent(name)
+                scan.component.paths = scan.paths
+            for command_result in scan.commands:
+                self._construct_command(scan.component, command_result)
+                for requirement in command_result.requires:
+                    if requirement not in scan.component.requires:
+                        scan.component.requires.append(requirement)
 
         # Aggregate component commands into a manage command group
-        for component in [
-            x.component for x in self.scan_result.values() if x.component != None
-        ]:
-            unfixable_platform_issues = [
-                x for x in component.supports_platform() if not x.fixable
-            ]
+        if scan.component is not None:
+            scan.name = scan.component.name
+            with platform_utils.record_platform_facts() as facts:
+                platform_issues = scan.component.supports_platform()
+            scan.platform_facts = [[*x, y] for x, y in facts.items()]
+            unfixable_platform_issues = [x for x in platform_issues if not x.fixable]
             if len(unfixable_platform_issues) == 0:
                 CommandRegistry.add_command(
-                    CommandType.MANAGE, component.build_manage_command_group()
+                    CommandType.MANAGE, scan.component.build_manage_command_group()
                 )
 
-    def _scan_search_path(self, search_path: Path) -> None:
+        self._cache_description(name, scan)
+
+    def load_all(self) -> None:
+        """Load all scanned software components and describe them anew."""
+        for name, scan in self.scan_result.items():
+            if scan.loaded:
+                self._cache_description(name, scan)
+            else:
+                self.load_component(name)
+
+    def _cache_description(self, name: str, scan: ComponentResult) -> None:
+        # Modules failing to import may do so no longer, once their dependencies
+        # are installed, which leaves their files unchanged
+        if scan.import_failed:
+            logger.trace("[bold]{}[/bold]: Not caching the description", name)
+            return
+        ScanCache().put_component(name, self._fingerprint(scan), self._describe(scan))
+
+    def _register_lazily(self, name: str, description: t.Dict) -> None:
+        component_name = description["name"]
+        if component_name is None:
+            return
+        self.scan_result[name].name = component_name
+        logger.trace(
+            "[bold]{}[/bold]: Deferring loading of software component", component_name
+        )
+
+        def loader() -> None:
+            self.load_component(name)
+
+        SoftwareComponentRegistry.add_loader(component_name, loader)
+        for type_name, help_texts in description["commands"].items():
+            CommandRegistry.add_lazy_command(
+                CommandType[type_name], component_name, loader, **help_texts
+            )
+
+    def _describe(self, scan: ComponentResult) -> t.Dict:
+        if scan.component is None:
+            return {"name": None, "commands": {}, "platform_facts": []}
+        commands = {}
+        for type_name, group in CommandRegistry.commands.items():
+            command = group.commands.get(scan.component.name)
+            if command is not None:
+                commands[type_name] = {
+                    "help": command.help,
+                    "short_help": command.short_help,
+                }
+        return {
+            "name": scan.component.name,
+            "commands": commands,
+            "platform_facts": scan.platform_facts,
+        }
+
+    def _fingerprint(self, scan: ComponentResult) -> t.List[t.List]:
+        return scan.fingerprint
+
+    def _list_component_folders(self, search_path: Path) -> t.List[Path]:
         logger.trace("Looking for software components in '{}'", search_path)
-        for folder in search_path.iterdir():
-            if self._contains_software_component(folder):
-                if folder.name not in self.scan_result:
-                    self.scan_result[folder.name] = ComponentResult()
-                    logger.trace(
-                        "[bold]{}[/bold]: Looking for a software component", folder.name
-                    )
-                else:
-                    logger.trace(
-                        "[bold]{}[/bold]: Found additional folder", folder.name
-                    )
-                scan = self.scan_result[folder.name]
-                scan.folders.append(folder)
-                self._scan_folder(folder, scan)
+        with os.scandir(search_path) as entries:
+            folders = [
+                Path(x.path) for x in entries if self._contains_software_component(x)
+            ]
+        return sorted(folders, key=lambda x: x.name)
 
-    def _scan_folder(self, folder: Path, scan: ComponentResult) -> None:
-        for file in [
-            x for x in folder.iterdir() if x.is_file() and not x.name.startswith("_")
-        ]:
-            scan.files.append(file)
+    def _list_component_files(self, folder: Path) -> t.List[t.Tuple[Path, int, int]]:
+        files = []
+        with span("Scan component folder", "scan", folder=folder), os.scandir(
+            folder
+        ) as entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.startswith("_"):
+                    stat = entry.stat()
+                    files.append((Path(entry.path), stat.st_mtime_ns, stat.st_size))
+        return sorted(files, key=lambda x: x[0].name)
 
-            if file.suffix in [".yml", ".yaml"]:
-                self._parse_yaml_file(folder.name, file, scan)
-            elif file.suffix == ".py" and scan.component is None:
-                # TODO: What if there are multiple SoftwareComponents in the py files?
-                module_name = f"dagos.components.external.{folder.name}"
-                module = self._load_module(folder.name, module_name, file)
-                classes = inspect.getmembers(module, inspect.isclass)
-                self._find_software_component(folder.name, classes, scan)
+    def _add_folder(self, folder: Path, files: t.List[t.Tuple[Path, int, int]]) -> None:
+        if folder.name not in self.scan_result:
+            self.scan_result[folder.name] = ComponentResult()
+            logger.trace(
+                "[bold]{}[/bold]: Looking for a software component", folder.name
+            )
+        else:
+            logger.trace("[bold]{}[/bold]: Found additional folder", folder.name)
+        scan = self.scan_result[folder.name]
+        scan.paths.add(folder, [x[0] for x in files])
+        for file, mtime, size in files:
+            scan.fingerprint.append([str(file), mtime, size])
 
     def _find_software_component(
         self,
@@ -111,8 +324,7 @@ class SoftwareComponentScanner:
             ):
                 try:
                     component = clazz[1]()
-                    component.folders = scan.folders
-                    component.files = scan.files
+                    component.paths = scan.paths
                     scan.component = component
                     logger.trace(
                         "[bold]{}[/bold]: Found software component", component_name
@@ -124,12 +336,15 @@ class SoftwareComponentScanner:
                     )
                 return
 
-    def _load_module(self, component: str, name: str, file: Path):
+    def _load_module(
+        self, component: str, name: str, file: Path
+    ) -> t.Optional[types.ModuleType]:
         spec = importlib.util.spec_from_file_location(name, file)
         module = importlib.util.module_from_spec(spec)
         try:
             try:
-                spec.loader.exec_module(module)
+                with span("Import module", "import", module=name):
+                    spec.loader.exec_module(module)
             except ModuleNotFoundError as e:
                 if "ansible" in e.msg:
                     raise UnsupportedPlatformException(
@@ -145,16 +360,41 @@ class SoftwareComponentScanner:
                 file,
                 e,
             )
+            return None
         return module
 
+    def index(self, search_paths: t.List[Path]) -> None:
+        """Load the data of all YAML files found in provided search paths into the
+        scan cache without registering anything.
+
+        Args:
+            search_paths (t.List[Path]): The paths to index.
+        """
+        for search_path in [x for x in search_paths if self._is_valid_search_path(x)]:
+            for folder in self._list_component_folders(search_path):
+                for file, _, _ in self._list_component_files(folder):
+                    if file.suffix in [".yml", ".yaml"]:
+                        try:
+                            self._load_yaml_file(file)
+                        except ValidationException as e:
+                            logger.debug(e)
+
     def _parse_yaml_file(
         self, component_name: str, file: Path, scan: ComponentResult
     ) -> None:
-        content = file.read_text()
+        try:
+            data = self._load_yaml_file(file)
+        except SchemaValidationException as e:
+            logger.warning(
+                "Invalid command configuration detected at '{}': {}", file, e
+            )
+            return
+        except ValidationException as e:
+            logger.warning(e)
+            return
 
-        # Regexes constructed via melody, see `src/dagos/core/regexes`.
-        if re.match(r"(?:(?:^#.*(?:\n)*)*|(?:^\-\-\-\n))command:\n", content):
-            self._parse_command_file(component_name, file, scan)
+        if data["kind"] == "command":
+            self._parse_command(component_name, file, data["command"], scan)
         else:
             logger.debug(
                 "[bold]{}[/bold]: Skipping file '{}' with unknown contents",
@@ -162,30 +402,44 @@ class SoftwareComponentScanner:
                 file,
             )
 
-    def _parse_command_file(
-        self, component_name: str, file: Path, scan: ComponentResult
+    def _load_yaml_file(self, file: Path) -> t.Dict:
+        def load(content: t.Optional[bytes]) -> t.Dict:
+            # The file is read and parsed once, its kind is determined by the
+            # top-level key of the parsed document.
+            validator = Validator()
+            documents = validator.parse(file, content)
+            if (
+                documents
+                and isinstance(documents[0], dict)
+                and "command" in documents[0]
+            ):
+                data = validator.validate_documents("command", file, documents)
+                return {"kind": "command", "command": data["command"]}
+            return {"kind": "unknown"}
+
+        return ScanCache().get_or_load(file, load)
+
+    def _parse_command(
+        self, component_name: str, file: Path, command: t.Dict, scan: ComponentResult
     ) -> None:
-        try:
-            data = Validator().validate_command(file)
-            command = data["command"]
-            command_type = command["type"]
-            command_provider = command["provider"]
-            configuration = command["configuration"]
-            logger.debug(
-                "[bold]{}[/bold]: Found {} command based on {}",
-                component_name,
-                command_type,
+        command_type = command["type"]
+        command_provider = command["provider"]
+        configuration = command["configuration"]
+        logger.debug(
+            "[bold]{}[/bold]: Found {} command based on {}",
+            component_name,
+            command_type,
+            command_provider,
+        )
+        scan.commands.append(
+            CommandResult(
+                file,
                 command_provider,
+                command_type,
+                configuration,
+                command.get("requires", []),
             )
-            scan.commands.append(
-                CommandResult(file, command_provider, command_type, configuration)
-            )
-        except SchemaValidationException as e:
-            logger.warning(
-                "Invalid command configuration detected at '{}': {}", file, e
-            )
-        except ValidationException as e:
-            logger.warning(e)
+        )
 
     def _construct_command(
         self, component: SoftwareComponent, command_result: CommandResult
@@ -224,9 +478,9 @@ class SoftwareComponentScanner:
             return False
         return True
 
-    def _contains_software_component(self, path: Path) -> bool:
-        if not path.is_dir():
+    def _contains_software_component(self, entry: os.DirEntry) -> bool:
+        if not entry.is_dir():
             return False
-        if path.name.startswith("__"):
+        if entry.name.startswith("__"):
             return False
         return True
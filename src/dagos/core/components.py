@@ -1,64 +1,183 @@
 from __future__ import annotations
 
+import sys
 import textwrap
 import typing as t
 from pathlib import Path
 
 import click
 from loguru import logger
-from rich.console import Group
-from rich.console import group
-from rich.markdown import Markdown
-from rich.panel import Panel
-from rich.table import Table
-from rich.tree import Tree
 
 from .commands import Command
 from .commands import CommandType
 from dagos.platform import PlatformIssue
 
+if t.TYPE_CHECKING:
+    from rich.panel import Panel
+
 
 class SoftwareComponentRegistry(type):
     """A metaclass responsible for registering constructed software components."""
 
-    components: t.List[SoftwareComponent] = []
+    # Keyed by component name, in order of registration
+    components: t.Dict[str, SoftwareComponent] = {}
+    loaders: t.Dict[str, t.Callable[[], t.Any]] = {}
 
     def __call__(cls, *args: t.Any, **kwds: t.Any) -> t.Any:
         """The registry hooks into the object construction lifecycle to register
-        constructed software components.
+        constructed software components. If multiple components share a name the
+        first one registered is kept.
         """
         component = super().__call__(*args, **kwds)
 
-        if cls not in cls.components:
-            cls.components.append(component)
+        existing = cls.components.get(component.name)
+        if existing is None:
+            cls.components[component.name] = component
+        elif existing is not component:
+            logger.debug(
+                "[bold]{}[/bold]: Ignoring software component with duplicate name",
+                component.name,
+            )
 
         return component
 
+    @classmethod
+    def add_loader(cls, name: str, loader: t.Callable[[], t.Any]) -> None:
+        """Register a loader that constructs the software component with provided
+        name once it is looked up.
+
+        Args:
+            name (str): The name of the software component.
+            loader (t.Callable[[], t.Any]): Constructs the software component.
+        """
+        cls.loaders[name] = loader
+
+    @classmethod
+    def remove_component(cls, name: str) -> None:
+        """Remove the software component with provided name, whether it is
+        constructed or not.
+
+        Args:
+            name (str): The name of the software component.
+        """
+        cls.components.pop(name, None)
+        cls.loaders.pop(name, None)
+
+    @classmethod
+    def load_all(cls) -> None:
+        """Construct all software components whose construction was deferred."""
+        for name in [*cls.loaders.keys()]:
+            loader = cls.loaders.pop(name, None)
+            if loader is not None:
+                loader()
+
     @classmethod
     def find_component(cls, name: str) -> t.Optional[SoftwareComponent]:
-        for component in cls.components:
-            if component.name == name:
-                return component
+        component = cls.components.get(name)
+        if component is not None:
+            return component
+        loader = cls.loaders.pop(name, None)
+        if loader is not None:
+            loader()
+            return cls.find_component(name)
         return None
 
 
+class ComponentFiles:
+    """The folders and files of a software component.
+
+    Rather than a path per entry, the entries are kept as names relative to the
+    first folder, the root. Entries outside of the root, e.g., additional folders
+    found in other search paths, are kept as absolute names. Names are interned,
+    since most components share the names of their files.
+    """
+
+    __slots__ = ("root", "_folders", "_files")
+
+    def __init__(
+        self, folders: t.Iterable[Path] = (), files: t.Iterable[Path] = ()
+    ) -> None:
+        self.root: t.Optional[Path] = None
+        self._folders: t.Tuple[str, ...] = ()
+        self._files: t.Tuple[str, ...] = ()
+        for folder in folders:
+            self.add(folder)
+        for file in files:
+            if self.root is None:
+                self.root = file.parent
+            self._files += (self._relative(file),)
+
+    @property
+    def folders(self) -> t.List[Path]:
+        return [self.root / x for x in self._folders]
+
+    @property
+    def files(self) -> t.List[Path]:
+        return [self.root / x for x in self._files]
+
+    def add(self, folder: Path, files: t.Iterable[Path] = ()) -> None:
+        """Add a folder and the files it contains.
+
+        Args:
+            folder (Path): The folder to add.
+            files (t.Iterable[Path], optional): The files of the folder. Defaults
+                to none.
+        """
+        if self.root is None:
+            self.root = folder
+        self._folders += (self._relative(folder),)
+        self._files += tuple(self._relative(x) for x in files)
+
+    def _relative(self, path: Path) -> str:
+        try:
+            name = str(path.relative_to(self.root))
+        except ValueError:
+            name = str(path)
+        return sys.intern(name)
+
+
 class SoftwareComponent(metaclass=SoftwareComponentRegistry):
     """Base class for software components."""
 
+    # Subclasses still have a __dict__, unless they declare slots as well
+    __slots__ = ("name", "paths", "commands", "requires")
+
     name: str
-    folders: t.List[Path]
-    files: t.List[Path]
+    paths: ComponentFiles
     commands: t.Dict[str, Command]
+    # The names of the software components or package managers that have to be
+    # installed before this component is deployed
+    requires: t.List[str]
 
     def __init__(
-        self, name: str, folders: t.List[Path] = None, files: t.List[Path] = None
+        self,
+        name: str,
+        folders: t.List[Path] = None,
+        files: t.List[Path] = None,
+        requires: t.List[str] = None,
     ) -> None:
         self.name = name
         self.commands = {}
         for type in CommandType:
             self.commands[type.name] = None
-        self.folders = folders if folders else []
-        self.files = files if files else []
+        self.paths = ComponentFiles(folders or [], files or [])
+        self.requires = list(requires) if requires else []
+
+    @property
+    def folders(self) -> t.List[Path]:
+        return self.paths.folders
+
+    @folders.setter
+    def folders(self, folders: t.List[Path]) -> None:
+        self.paths = ComponentFiles(folders, self.paths.files)
+
+    @property
+    def files(self) -> t.List[Path]:
+        return self.paths.files
+
+    @files.setter
+    def files(self, files: t.List[Path]) -> None:
+        self.paths = ComponentFiles(self.paths.folders, files)
 
     def add_command(self, command: Command, force: t.Optional[bool] = False) -> None:
         """Add provided command to this software component.
@@ -136,6 +255,13 @@ class SoftwareComponent(metaclass=SoftwareComponentRegistry):
         return is_valid
 
     def __rich__(self) -> Panel:
+        from rich.console import Group
+        from rich.console import group
+        from rich.markdown import Markdown
+        from rich.panel import Panel
+        from rich.table import Table
+        from rich.tree import Tree
+
         @group()
         def get_renderables():
             yield Markdown(f"{textwrap.dedent(self.__doc__)}")
@@ -58,6 +58,7 @@ class DagosConfiguration:
             )
             cls.__instance._component_search_paths = default([])
             cls.__instance._environment_search_paths = default([])
+            cls.__instance._scan_workers = default(1)
         return cls.__instance.__instance
 
     @property
@@ -102,13 +103,25 @@ class DagosConfiguration:
         if _is_default_value(self._environment_search_paths):
             self._environment_search_paths = value
 
+    @property
+    def scan_workers(self) -> int:
+        return _get_value(self._scan_workers)
+
+    @scan_workers.setter
+    def scan_workers(self, value: int) -> None:
+        if _is_default_value(self._scan_workers):
+            self._scan_workers = value
+
     @classmethod
     def get_config_keys(cls) -> t.List[str]:
-        return [
-            x
-            for x in cls.__dict__.keys()
-            if not x.startswith("__") and x != "get_config_keys"
-        ]
+        return [x for x, y in cls.__dict__.items() if isinstance(y, property)]
+
+    @classmethod
+    def reset(cls) -> None:
+        """Discard the singleton instance, which resets all options to their
+        defaults. Long-running processes use this to reload the configuration.
+        """
+        cls.__instance = None
 
     def __repr__(self) -> str:
         result = StringIO()
@@ -124,6 +137,7 @@ class DagosConfiguration:
         environment_search_paths = ",".join(
             [str(x) for x in self.environment_search_paths]
         )
-        result.write(f"environment_search_paths={environment_search_paths}")
+        result.write(f"environment_search_paths={environment_search_paths}, ")
+        result.write(f"scan_workers={self.scan_workers}")
         result.write("}")
         return result.getvalue()
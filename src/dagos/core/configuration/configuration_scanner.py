@@ -4,30 +4,40 @@ from pathlib import Path
 from loguru import logger
 
 from dagos.core.configuration import DagosConfiguration
+from dagos.core.scan_cache import ScanCache
 from dagos.core.validator import Validator
+from dagos.tracing import traced
 
 
 class ConfigurationScanner:
 
     configuration: DagosConfiguration
     file_name = ".dagos-config.yml"
-    search_paths: t.List[Path] = [
-        # current dir
-        Path.cwd(),
-        # user home
-        Path.home() / ".dagos",
-        # system (linux)
-        Path("/opt/dagos"),
-    ]
 
     def __init__(self):
         self.configuration = DagosConfiguration()
 
+    @classmethod
+    def get_search_paths(cls) -> t.List[Path]:
+        """The folders to look for configuration files in, in order of precedence.
+
+        The current dir is resolved on each call, as it may change during the
+        lifetime of the process, e.g., of the daemon.
+        """
+        return [
+            # current dir
+            Path.cwd(),
+            # user home
+            Path.home() / ".dagos",
+            # system (linux)
+            Path("/opt/dagos"),
+        ]
+
+    @traced("Scan configuration", "scan")
     def scan(self) -> DagosConfiguration:
-        logger.trace(
-            f"Looking for configuration files in {len(self.search_paths)} places"
-        )
-        for search_path in self.search_paths:
+        search_paths = self.get_search_paths()
+        logger.trace(f"Looking for configuration files in {len(search_paths)} places")
+        for search_path in search_paths:
             logger.trace(f"Looking for configuration file in '{search_path}'")
             file = search_path / self.file_name
             if file.exists() and file.is_file():
@@ -38,7 +48,10 @@ class ConfigurationScanner:
 
     def load_configuration(self, config_file: Path) -> DagosConfiguration:
         logger.debug(f"Loading configuration from '{config_file}'")
-        data = Validator().validate_configuration(config_file)
+        data = ScanCache().get_or_load(
+            config_file,
+            lambda content: Validator().validate_configuration(config_file, content),
+        )
         known_options = DagosConfiguration.get_config_keys()
         for key, value in data.items():
             if key in known_options:
@@ -55,6 +68,8 @@ class ConfigurationScanner:
                     self.configuration.environment_search_paths = (
                         self._parse_search_paths(value)
                     )
+                elif key == "scan_workers":
+                    self.configuration.scan_workers = value
             else:
                 logger.warning("Unknown configuration option '{}' detected", key)
 
@@ -0,0 +1,267 @@
+import importlib.util
+import inspect
+import typing as t
+from dataclasses import dataclass
+from pathlib import Path
+
+from loguru import logger
+
+from dagos.core.commands import CommandRegistry
+from dagos.core.commands import CommandType
+from dagos.core.components import SoftwareComponent
+from dagos.core.components import SoftwareComponentRegistry
+from dagos.core.scan_cache import ScanCache
+from dagos.core.validator import Validator
+from dagos.exceptions import ValidationException
+from dagos.platform import OperatingSystem
+from dagos.platform import PlatformIssue
+from dagos.platform import PlatformSupportChecker
+from dagos.tracing import span
+from dagos.tracing import traced
+from dagos.utils.dataclass_utils import slotted
+
+ENTRY_POINT_GROUP = "dagos.components"
+MANIFEST_FILE = "dagos-components.yml"
+
+
+@slotted
+@dataclass
+class EntryPointResult:
+    entry_point: t.Any
+    # The entry of the manifest describing the component, if any
+    manifest: t.Optional[t.Dict] = None
+    component: t.Optional[SoftwareComponent] = None
+    loaded: bool = False
+
+
+class EntryPointScanner:
+    """Discovers software components provided by installed distributions.
+
+    Distributions register `SoftwareComponent` classes as entry points of the
+    `dagos.components` group, named after the component. If the top-level package
+    of an entry point ships a manifest, see `schemas/manifest.schema.yml`, the
+    commands of the component are registered lazily and the component is only
+    imported once one of them is used. Otherwise it is imported right away.
+    """
+
+    # Keyed by entry point name, in order of discovery
+    scan_result: t.Dict[str, EntryPointResult] = {}
+
+    @traced("Scan entry points", "scan")
+    def scan(self) -> None:
+        """Discover the software components of all installed distributions."""
+        manifests: t.Dict[str, t.Dict[str, t.Dict]] = {}
+        for entry_point in _get_entry_points(ENTRY_POINT_GROUP):
+            name = entry_point.name
+            if name in self.scan_result:
+                continue
+            if self._is_registered(name):
+                logger.debug(
+                    "[bold]{}[/bold]: Ignoring entry point '{}', a software component with this name exists",
+                    name,
+                    entry_point.value,
+                )
+                continue
+
+            package = entry_point.value.split(":")[0].split(".")[0]
+            if package not in manifests:
+                manifests[package] = self._load_manifest(package)
+            manifest = manifests[package].get(name)
+
+            self.scan_result[name] = EntryPointResult(entry_point, manifest)
+            if manifest is None:
+                logger.debug(
+                    "[bold]{}[/bold]: No manifest describes the entry point, loading it",
+                    name,
+                )
+                self.load_component(name)
+            else:
+                self._register_lazily(name, manifest)
+
+    def load_component(self, name: str) -> t.Optional[SoftwareComponent]:
+        """Import and construct the software component of the entry point with
+        provided name.
+
+        Args:
+            name (str): The name of the entry point.
+
+        Returns:
+            t.Optional[SoftwareComponent]: The constructed software component or
+            None, if the entry point does not provide one.
+        """
+        result = self.scan_result[name]
+        if result.loaded:
+            return result.component
+        result.loaded = True
+
+        entry_point = result.entry_point
+        try:
+            with span("Load entry point", "import", entry_point=entry_point.value):
+                clazz = entry_point.load()
+        except Exception as e:
+            logger.warning(
+                "[bold]{}[/bold]: Failed to load entry point '{}'\n{}",
+                name,
+                entry_point.value,
+                e,
+            )
+            return None
+        if not inspect.isclass(clazz) or not issubclass(clazz, SoftwareComponent):
+            logger.warning(
+                "[bold]{}[/bold]: The entry point '{}' is no software component",
+                name,
+                entry_point.value,
+            )
+            return None
+
+        try:
+            result.component = clazz()
+        except Exception as e:
+            logger.warning("[bold]{}[/bold]: Failed to instantiate\n{}", name, e)
+            return None
+        logger.trace("[bold]{}[/bold]: Found software component", name)
+
+        unfixable_platform_issues = [
+            x for x in result.component.supports_platform() if not x.fixable
+        ]
+        if len(unfixable_platform_issues) == 0:
+            CommandRegistry.add_command(
+                CommandType.MANAGE, result.component.build_manage_command_group()
+            )
+        return result.component
+
+    def find_distribution(self, name: str) -> t.Optional[t.Any]:
+        """Find the installed distribution providing the entry point with provided
+        name.
+
+        Args:
+            name (str): The name of the entry point.
+
+        Returns:
+            t.Optional[t.Any]: The distribution, as provided by
+            `importlib.metadata`, or None, if no entry point of this name was
+            discovered.
+        """
+        result = self.scan_result.get(name)
+        if result is None:
+            return None
+        entry_point = result.entry_point
+        # Entry points know their distribution as of Python 3.10
+        distribution = getattr(entry_point, "dist", None)
+        if distribution is not None:
+            return distribution
+        for distribution in _import_metadata().distributions():
+            if any(
+                x.group == ENTRY_POINT_GROUP
+                and x.name == name
+                and x.value == entry_point.value
+                for x in distribution.entry_points
+            ):
+                return distribution
+        return None
+
+    def _is_registered(self, name: str) -> bool:
+        return (
+            name in SoftwareComponentRegistry.components
+            or name in SoftwareComponentRegistry.loaders
+        )
+
+    def _register_lazily(self, name: str, manifest: t.Dict) -> None:
+        logger.trace("[bold]{}[/bold]: Deferring loading of software component", name)
+
+        def loader() -> None:
+            self.load_component(name)
+
+        SoftwareComponentRegistry.add_loader(name, loader)
+        for type_name, help in manifest.get("commands", {}).items():
+            CommandRegistry.add_lazy_command(
+                CommandType(type_name), name, loader, help=help
+            )
+
+        # Like any other component, the manage command group is only available
+        # on platforms without unfixable issues
+        platform_issues = self._check_platform(manifest.get("platform", {}))
+        if len([x for x in platform_issues if not x.fixable]) == 0:
+            CommandRegistry.add_lazy_command(
+                CommandType.MANAGE,
+                name,
+                loader,
+                help=manifest.get(
+                    "description", f"Manage the {name} software component."
+                ),
+            )
+
+    def _check_platform(self, requirements: t.Dict) -> t.List[PlatformIssue]:
+        checker = PlatformSupportChecker()
+        if "operating_systems" in requirements:
+            checker.check_operating_system(
+                [OperatingSystem(x) for x in requirements["operating_systems"]]
+            )
+        # The manifest lists what the component requires, rather than what it is
+        # able to install on its own
+        for command in requirements.get("commands", []):
+            checker.check_command_is_available(command, fixable=False)
+        for module in requirements.get("modules", []):
+            checker.check_module_is_available(module, fixable=False)
+        return checker.issues
+
+    def _load_manifest(self, package: str) -> t.Dict[str, t.Dict]:
+        file = self._find_manifest(package)
+        if file is None:
+            return {}
+        try:
+            data = ScanCache().get_or_load(
+                file, lambda content: Validator().validate_manifest(file, content)
+            )
+        except ValidationException as e:
+            logger.warning(e)
+            return {}
+        return {x["name"]: x for x in data["components"]}
+
+    def _find_manifest(self, package: str) -> t.Optional[Path]:
+        # Finding the spec of a top-level package does not import it
+        try:
+            spec = importlib.util.find_spec(package)
+        except (ImportError, ValueError):
+            return None
+        if spec is None or not spec.submodule_search_locations:
+            return None
+        for location in spec.submodule_search_locations:
+            file = Path(location) / MANIFEST_FILE
+            if file.is_file():
+                return file
+        return None
+
+
+def describe_entry_points() -> t.List[str]:
+    """Describe the software components provided by installed distributions,
+    without importing any of them.
+
+    Returns:
+        t.List[str]: The sorted entry points of the `dagos.components` group,
+        along with the versions of their distributions, where known.
+    """
+    descriptions = []
+    for entry_point in _get_entry_points(ENTRY_POINT_GROUP):
+        distribution = getattr(entry_point, "dist", None)
+        version = distribution.version if distribution is not None else None
+        descriptions.append(f"{entry_point.name} = {entry_point.value} ({version})")
+    return sorted(descriptions)
+
+
+def _import_metadata() -> t.Any:
+    try:
+        import importlib.metadata as metadata
+    except ImportError:  # pragma: no cover
+        # Python 3.7 lacks importlib.metadata, which is backported there
+        import importlib_metadata as metadata
+    return metadata
+
+
+def _get_entry_points(group: str) -> t.List[t.Any]:
+    with span("Read entry points", "import", group=group):
+        all_entry_points = _import_metadata().entry_points()
+    # Python 3.10 introduced selecting entry points by group
+    if hasattr(all_entry_points, "select"):
+        return list(all_entry_points.select(group=group))
+    return list(all_entry_points.get(group, []))
@@ -5,5 +5,6 @@ from .environment_domain import Image
 from .environment_domain import Packages
 from .environment_domain import Platform
 from .environment_domain import SoftwareEnvironment
+from .environment_domain import SoftwareEnvironmentHandle
 from .environment_domain import SoftwareEnvironmentRegistry
 from .environment_scanner import SoftwareEnvironmentScanner
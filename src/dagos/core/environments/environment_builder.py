@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sys
 import typing as t
 from pathlib import Path
 
@@ -10,6 +11,7 @@ from .environment_domain import Packages
 from .environment_domain import Platform
 from .environment_domain import SoftwareEnvironment
 from dagos.core.components import SoftwareComponentRegistry
+from dagos.core.scan_cache import ScanCache
 from dagos.core.validator import Validator
 
 
@@ -46,7 +48,10 @@ class SoftwareEnvironmentBuilder:
     @classmethod
     def from_file(cls, file: Path) -> SoftwareEnvironment:
         # TODO: Upon schema errors display env as greyed out with errors
-        data = Validator().validate_environment(file.expanduser())
+        return cls.from_data(file, cls.load_data(file))
+
+    @classmethod
+    def from_data(cls, file: Path, data: t.Dict) -> SoftwareEnvironment:
         environment: t.Dict = data["environment"]
 
         builder = (
@@ -64,7 +69,7 @@ class SoftwareEnvironmentBuilder:
         for component in environment["components"]:
             builder.add_component(
                 Component(
-                    component["name"],
+                    sys.intern(component["name"]),
                     component.get("purpose"),
                     component.get("version", "latest"),
                     SoftwareComponentRegistry.find_component(component["name"]),
@@ -72,6 +77,15 @@ class SoftwareEnvironmentBuilder:
             )
         return builder.build()
 
+    @classmethod
+    def load_data(cls, file: Path) -> t.Dict:
+        """Load the validated contents of provided environment file, preferably
+        from the scan cache."""
+        file = file.expanduser()
+        return ScanCache().get_or_load(
+            file, lambda content: Validator().validate_environment(file, content)
+        )
+
     @classmethod
     def _parse_env(cls, platform: t.Dict) -> t.List[EnvironmentVariable]:
         envs = []
@@ -82,27 +96,38 @@ class SoftwareEnvironmentBuilder:
 
     @classmethod
     def _parse_packages(cls, packages: t.Optional[t.Dict]) -> t.List[Packages]:
+        # Environments of a catalog mostly share their packages, interning their
+        # names keeps a single copy of each
         result = []
         if packages is not None and len(packages) > 0:
             if isinstance(packages[0], str):
-                result.append(Packages(packages))
+                result.append(Packages(cls._intern_all(packages)))
             else:
                 for entry in packages:
                     result.append(
                         Packages(
-                            entry.get("packages"),
-                            entry.get("manager", "system"),
+                            cls._intern_all(entry.get("packages")),
+                            sys.intern(entry.get("manager", "system")),
                             entry.get("dependency"),
                         )
                     )
         return result
 
+    @classmethod
+    def _intern_all(cls, names: t.Optional[t.List[str]]) -> t.Optional[t.List[str]]:
+        if names is None:
+            return None
+        return [sys.intern(x) for x in names]
+
     @classmethod
     def _parse_images(cls, platform: t.Dict) -> t.List[Image]:
         images = []
         if "images" in platform:
             for image in platform["images"]:
                 images.append(
-                    Image(image["id"], cls._parse_packages(image.get("packages")))
+                    Image(
+                        sys.intern(image["id"]),
+                        cls._parse_packages(image.get("packages")),
+                    )
                 )
         return images
@@ -5,43 +5,124 @@ from dataclasses import dataclass
 from pathlib import Path
 
 from loguru import logger
-from rich.console import Console
-from rich.console import ConsoleOptions
-from rich.console import Group
-from rich.console import group
-from rich.console import RenderResult
-from rich.markdown import Markdown
-from rich.panel import Panel
-from rich.table import Table
-from rich.tree import Tree
 
 from dagos.core.components import SoftwareComponent
+from dagos.exceptions import ValidationException
+from dagos.utils.dataclass_utils import slotted
+
+if t.TYPE_CHECKING:
+    from rich.console import Console
+    from rich.console import ConsoleOptions
+    from rich.console import RenderResult
+    from rich.panel import Panel
+    from rich.tree import Tree
 
 
 class SoftwareEnvironmentRegistry(type):
-    """A metaclass responsible for registering software environments."""
+    """A metaclass responsible for registering software environments.
+
+    Scanning search paths only registers handles of the environments found, each
+    with a loader that builds the environment once it is looked up.
+    """
 
-    environments: t.List[SoftwareEnvironment] = []
+    # Keyed by environment name, in order of registration
+    environments: t.Dict[str, SoftwareEnvironment] = {}
+    handles: t.Dict[str, SoftwareEnvironmentHandle] = {}
+    loaders: t.Dict[str, t.Callable[[], t.Any]] = {}
 
     def __call__(cls, *args: t.Any, **kwds: t.Any) -> t.Any:
         """The registry hooks into the object construction lifecycle to register
-        software environments.
+        software environments. An environment loaded from the same file as a
+        registered one replaces it, otherwise the first one registered with a
+        name is kept.
         """
         environment = super().__call__(*args, **kwds)
 
-        if cls not in cls.environments:
-            cls.environments.append(environment)
+        existing = cls.environments.get(environment.name)
+        if existing is None or existing.path == environment.path:
+            cls.environments[environment.name] = environment
+        else:
+            logger.warning(
+                "Ignoring software environment '{}' at '{}', it is already defined at '{}'",
+                environment.name,
+                environment.path,
+                existing.path,
+            )
 
         return environment
 
+    @classmethod
+    def add_handle(
+        cls, handle: SoftwareEnvironmentHandle, loader: t.Callable[[], t.Any]
+    ) -> None:
+        """Register a software environment that is only built once it is looked up.
+        A handle of the same file as a registered one replaces it, otherwise the
+        first one registered with a name is kept.
+
+        Args:
+            handle (SoftwareEnvironmentHandle): Describes the environment.
+            loader (t.Callable[[], t.Any]): Builds the environment.
+        """
+        existing = cls.handles.get(handle.name)
+        if existing is not None and existing.path != handle.path:
+            logger.warning(
+                "Ignoring software environment '{}' at '{}', it is already defined at '{}'",
+                handle.name,
+                handle.path,
+                existing.path,
+            )
+            return
+        cls.handles[handle.name] = handle
+        cls.loaders[handle.name] = loader
+        cls.environments.pop(handle.name, None)
+
+    @classmethod
+    def load_all(cls) -> None:
+        """Build all software environments whose building was deferred."""
+        for name in [*cls.loaders.keys()]:
+            loader = cls.loaders.pop(name, None)
+            if loader is not None:
+                loader()
+
     @classmethod
     def find_environment(cls, name: str) -> t.Optional[SoftwareEnvironment]:
-        for environment in cls.environments:
-            if environment.name == name:
-                return environment
+        environment = cls.environments.get(name)
+        if environment is not None:
+            return environment
+        loader = cls.loaders.pop(name, None)
+        if loader is not None:
+            loader()
+            return cls.environments.get(name)
         return None
 
+    @classmethod
+    def remove_environments_at(cls, path: Path) -> None:
+        """Remove all software environments loaded from provided file.
 
+        Args:
+            path (Path): The environment file.
+        """
+        for name in [x for x, y in cls.environments.items() if y.path == path]:
+            del cls.environments[name]
+        for name in [x for x, y in cls.handles.items() if y.path == path]:
+            del cls.handles[name]
+            cls.loaders.pop(name, None)
+
+
+@slotted
+@dataclass
+class SoftwareEnvironmentHandle:
+    """A software environment found while scanning, which is not built yet."""
+
+    path: Path
+    name: str
+    # The modification time of the file when it was scanned
+    mtime: int
+    # Why the environment could not be built, if it failed to
+    error: t.Optional[ValidationException] = None
+
+
+@slotted
 @dataclass
 class Platform:
     env: t.List[EnvironmentVariable]
@@ -51,6 +132,9 @@ class Platform:
     def __rich_console__(
         self, console: Console, options: ConsoleOptions
     ) -> t.Generator[RenderResult]:
+        from rich.table import Table
+        from rich.tree import Tree
+
         parent_table = Table(box=None)
         parent_table.add_column()
         parent_table.add_column()
@@ -77,12 +161,14 @@ class Platform:
         yield parent_table
 
 
+@slotted
 @dataclass
 class EnvironmentVariable:
     name: str
     value: str
 
 
+@slotted
 @dataclass
 class Packages:
     package_list: t.List[str]
@@ -90,6 +176,8 @@ class Packages:
     dependency: t.Optional[str] = None
 
     def __rich__(self) -> Tree:
+        from rich.tree import Tree
+
         title = (
             self.manager
             if self.dependency is None
@@ -101,12 +189,14 @@ class Packages:
         return tree
 
 
+@slotted
 @dataclass
 class Image:
     id: str
     packages: t.List[Packages]
 
 
+@slotted
 @dataclass
 class Component:
     name: str
@@ -118,6 +208,8 @@ class Component:
 class SoftwareEnvironment(metaclass=SoftwareEnvironmentRegistry):
     """Base class for software environments."""
 
+    __slots__ = ("path", "name", "description", "platform", "components")
+
     path: Path
     name: str
     description: t.Optional[str]
@@ -161,6 +253,12 @@ class SoftwareEnvironment(metaclass=SoftwareEnvironmentRegistry):
         return collected_components
 
     def __rich__(self) -> Panel:
+        from rich.console import Group
+        from rich.console import group
+        from rich.markdown import Markdown
+        from rich.panel import Panel
+        from rich.table import Table
+
         @group()
         def get_renderables():
             yield Markdown(f"{self.description}\n")
@@ -1,33 +1,141 @@
+import os
 import typing as t
 from pathlib import Path
 
 from loguru import logger
 
+from dagos.core.environments import SoftwareEnvironment
 from dagos.core.environments import SoftwareEnvironmentBuilder
+from dagos.core.environments import SoftwareEnvironmentHandle
+from dagos.core.environments import SoftwareEnvironmentRegistry
+from dagos.core.scan_cache import ScanCache
 from dagos.exceptions import ValidationException
+from dagos.tracing import span
+from dagos.tracing import traced
+from dagos.utils.concurrency_utils import map_concurrently
 
 
 class SoftwareEnvironmentScanner:
-    def scan(self, search_paths: t.List[Path]) -> None:
+    @traced("Scan software environments", "scan")
+    def scan(self, search_paths: t.List[Path], workers: int = 1) -> None:
+        """Scan provided search paths for software environments. Only their names
+        are read, the environments are built once they are looked up.
+
+        Args:
+            search_paths (t.List[Path]): The paths to scan, in order of precedence.
+            workers (int, optional): The number of threads used to list search paths
+                and read environment files. Defaults to 1.
+        """
         logger.trace(
             "Looking for software environments in {} places", len(search_paths)
         )
-        for search_path in search_paths:
-            if self._is_valid_search_path(search_path):
-                self._scan_search_path(search_path)
+        search_paths = [x for x in search_paths if self._is_valid_search_path(x)]
+        # Files are read concurrently, but environments are registered in order
+        # of their search path and name.
+        files = [
+            file
+            for files in map_concurrently(
+                self._list_environment_files, search_paths, workers
+            )
+            for file in files
+        ]
+        handles = [x for x in map_concurrently(self._read_handle, files, workers) if x]
+        for handle in handles:
+            self._register(handle)
+        logger.debug("Found {} software environment(s)", len(handles))
+
+    def refresh(self, files: t.Iterable[Path]) -> None:
+        """Read provided environment files anew and replace, add, or remove the
+        software environments registered for them.
+
+        Args:
+            files (t.Iterable[Path]): The changed environment files.
+        """
+        for file in files:
+            SoftwareEnvironmentRegistry.remove_environments_at(file)
+            if not file.is_file():
+                continue
+            handle = self._read_handle(file)
+            if handle is not None:
+                self._register(handle)
+                logger.debug("Refreshed the '{}' software environment", handle.name)
 
-    def _scan_search_path(self, search_path: Path) -> None:
+    def index(self, search_paths: t.List[Path]) -> None:
+        """Load the data of all environment files found in provided search paths
+        into the scan cache without registering anything.
+
+        Args:
+            search_paths (t.List[Path]): The paths to index.
+        """
+        for search_path in [x for x in search_paths if self._is_valid_search_path(x)]:
+            for file in self._list_environment_files(search_path):
+                data = self._load_data(file)
+                if isinstance(data, ValidationException):
+                    logger.debug(data)
+
+    def _list_environment_files(self, search_path: Path) -> t.List[Path]:
         logger.trace("Looking for software environments in '{}'", search_path)
-        for path in search_path.iterdir():
-            if path.is_file() and path.suffix in [".yml", ".yaml"]:
-                try:
-                    environment = SoftwareEnvironmentBuilder.from_file(path)
-                    logger.trace(
-                        "Found the '{}' software environment", environment.name
-                    )
-                except ValidationException as e:
-                    logger.debug(e)
-                    continue
+        with os.scandir(search_path) as entries:
+            files = [
+                Path(x.path)
+                for x in entries
+                if x.is_file() and os.path.splitext(x.name)[1] in [".yml", ".yaml"]
+            ]
+        return sorted(files, key=lambda x: x.name)
+
+    def _read_handle(self, file: Path) -> t.Optional[SoftwareEnvironmentHandle]:
+        try:
+            mtime = file.stat().st_mtime_ns
+        except OSError:
+            return None
+        # Validated data is preferred, but to learn the name of an environment
+        # parsing its file is sufficient
+        data = ScanCache().get(file)
+        if data is None:
+            # Parsing YAML is only required for new or changed files
+            import yaml
+
+            from dagos.utils import yaml_utils
+
+            try:
+                with span("Read environment name", "scan", path=file):
+                    data = yaml_utils.load_file(file)
+            except (OSError, yaml.YAMLError) as e:
+                logger.debug("Unable to read environment file '{}': {}", file, e)
+                return None
+        environment = data.get("environment") if isinstance(data, dict) else None
+        name = environment.get("name") if isinstance(environment, dict) else None
+        if not isinstance(name, str):
+            logger.debug("The file '{}' defines no software environment", file)
+            return None
+        return SoftwareEnvironmentHandle(file, name, mtime)
+
+    def _register(self, handle: SoftwareEnvironmentHandle) -> None:
+        def loader() -> None:
+            self._build(handle)
+
+        SoftwareEnvironmentRegistry.add_handle(handle, loader)
+        logger.trace("Found the '{}' software environment", handle.name)
+
+    def _build(
+        self, handle: SoftwareEnvironmentHandle
+    ) -> t.Optional[SoftwareEnvironment]:
+        data = self._load_data(handle.path)
+        if isinstance(data, ValidationException):
+            # The environment was registered, so it is expected to be valid
+            handle.error = data
+            logger.error(data)
+            return None
+        handle.error = None
+        with span("Parse environment", "scan", path=handle.path):
+            return SoftwareEnvironmentBuilder.from_data(handle.path, data)
+
+    def _load_data(self, file: Path) -> t.Union[t.Dict, ValidationException]:
+        try:
+            with span("Load environment", "scan", path=file):
+                return SoftwareEnvironmentBuilder.load_data(file)
+        except ValidationException as e:
+            return e
 
     def _is_valid_search_path(self, search_path: Path) -> bool:
         if not search_path.exists():
@@ -0,0 +1,275 @@
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+import typing as t
+from pathlib import Path
+
+from loguru import logger
+
+from dagos.core.commands import CommandType
+from dagos.core.components import SoftwareComponent
+from dagos.core.package_managers import PackageManager
+from dagos.platform import CommandRunner
+
+
+def default_state_dir() -> Path:
+    """The folder DAG-OS keeps its state in, honoring `XDG_STATE_HOME`."""
+    state_home = os.environ.get("XDG_STATE_HOME")
+    return (Path(state_home) if state_home else Path.home() / ".local" / "state") / (
+        "dagos"
+    )
+
+
+class DeploymentLedger:
+    """A persistent record of the steps of local deployments that succeeded.
+
+    Each installed software component is recorded with the environment it was
+    deployed by, a fingerprint of its definition and requested version, as well
+    as the version and artifact hash reported by its install command. Installed
+    packages are recorded per package manager.
+
+    Deploying an environment anew only installs components whose fingerprint
+    changed and packages that are not recorded. When asked to verify, recorded
+    components are only skipped if their verify command succeeds and the paths
+    they installed still exist, and packages only if their manager confirms
+    they are installed.
+    """
+
+    file_name = "ledger.json"
+    version = 1
+
+    def __init__(
+        self,
+        environment: str,
+        force: bool = False,
+        verify: bool = False,
+        state_dir: t.Optional[Path] = None,
+    ) -> None:
+        """
+        Args:
+            environment (str): The name of the environment being deployed.
+            force (bool, optional): If True, every step is executed regardless of
+                the record. Defaults to False.
+            verify (bool, optional): If True, recorded steps are verified before
+                they are skipped. Defaults to False.
+            state_dir (t.Optional[Path], optional): The folder to keep the ledger
+                in. Defaults to the DAG-OS state folder.
+        """
+        self.environment = environment
+        self.force = force
+        self.verify = verify
+        self.state_dir = state_dir if state_dir is not None else default_state_dir()
+        # Installs may be recorded by concurrently running jobs
+        self._lock = threading.Lock()
+        self._content = self._read()
+
+    @property
+    def path(self) -> Path:
+        return self.state_dir / self.file_name
+
+    @property
+    def components(self) -> t.Dict[str, t.Dict]:
+        return self._content["components"]
+
+    @property
+    def packages(self) -> t.Dict[str, t.Dict[str, str]]:
+        return self._content["packages"]
+
+    def is_deployed(
+        self,
+        component: SoftwareComponent,
+        version: t.Optional[str] = None,
+    ) -> bool:
+        """Check whether provided software component is deployed as recorded, so
+        installing it can be skipped.
+
+        Args:
+            component (SoftwareComponent): The software component to install.
+            version (t.Optional[str], optional): The requested version. Defaults
+                to None.
+
+        Returns:
+            bool: True, if the component is recorded with the same fingerprint and,
+            if asked to verify, the verification succeeded.
+        """
+        if self.force:
+            return False
+        entry = self.components.get(component.name)
+        if entry is None or entry["fingerprint"] != fingerprint(component, version):
+            return False
+        if self.verify and not self._verify_component(component, entry):
+            logger.info(
+                "[bold]{}[/bold]: Recorded deployment failed to verify", component.name
+            )
+            return False
+        return True
+
+    def record_component(
+        self, component: SoftwareComponent, version: t.Optional[str] = None
+    ) -> None:
+        """Record that provided software component was installed.
+
+        Args:
+            component (SoftwareComponent): The installed software component.
+            version (t.Optional[str], optional): The requested version. Defaults
+                to None.
+        """
+        install_command = component.commands[CommandType.INSTALL.name]
+        entry = {
+            "environment": self.environment,
+            "fingerprint": fingerprint(component, version),
+            "requested_version": version,
+            "resolved_version": getattr(install_command, "resolved_version", None),
+            "artifact_hash": getattr(install_command, "artifact_hash", None),
+            "paths": [str(x) for x in getattr(install_command, "installed_paths", [])],
+            "deployed_at": int(time.time()),
+        }
+        with self._lock:
+            self.components[component.name] = entry
+            self._save()
+
+    def find_missing_packages(
+        self,
+        manager: str,
+        packages: t.List[str],
+        package_manager: t.Optional[PackageManager] = None,
+        command_runner: t.Optional[CommandRunner] = None,
+    ) -> t.List[str]:
+        """Determine which of provided packages have to be installed.
+
+        Args:
+            manager (str): The name of the package manager.
+            packages (t.List[str]): The packages to install.
+            package_manager (t.Optional[PackageManager], optional): The package
+                manager to verify recorded packages with. Defaults to None.
+            command_runner (t.Optional[CommandRunner], optional): The command
+                runner to verify with. Defaults to None.
+
+        Returns:
+            t.List[str]: The packages that are not recorded, or failed to verify.
+        """
+        if self.force:
+            return list(packages)
+        recorded = self.packages.get(manager, {})
+        missing = [x for x in packages if x not in recorded]
+        if self.verify and package_manager is not None:
+            unverified = package_manager.find_missing(
+                [x for x in packages if x in recorded], command_runner
+            )
+            if unverified:
+                logger.info(
+                    "Recorded {} packages failed to verify: {}",
+                    manager,
+                    ", ".join(unverified),
+                )
+            missing = [x for x in packages if x in missing or x in unverified]
+        return missing
+
+    def record_packages(self, manager: str, packages: t.List[str]) -> None:
+        """Record that provided packages were installed.
+
+        Args:
+            manager (str): The name of the package manager.
+            packages (t.List[str]): The installed packages.
+        """
+        with self._lock:
+            recorded = self.packages.setdefault(manager, {})
+            for package in packages:
+                recorded[package] = self.environment
+            self._save()
+
+    def _verify_component(self, component: SoftwareComponent, entry: t.Dict) -> bool:
+        missing = [x for x in entry.get("paths", []) if not Path(x).exists()]
+        if missing:
+            logger.debug(
+                "[bold]{}[/bold]: Installed paths are missing: {}",
+                component.name,
+                ", ".join(missing),
+            )
+            return False
+        verify_command = component.commands[CommandType.VERIFY.name]
+        if verify_command is not None:
+            try:
+                verify_command.execute()
+            except Exception as e:
+                logger.debug(
+                    "[bold]{}[/bold]: Verification failed: {}", component.name, e
+                )
+                return False
+        return True
+
+    def _read(self) -> t.Dict[str, t.Dict]:
+        content = {"components": {}, "packages": {}}
+        try:
+            stored = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return content
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable ledger at '{}': {}", self.path, e)
+            return content
+        if stored.get("version") != self.version:
+            logger.debug("Ignoring ledger of another version at '{}'", self.path)
+            return content
+        content["components"] = stored.get("components", {})
+        content["packages"] = stored.get("packages", {})
+        return content
+
+    def _save(self) -> None:
+        try:
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first, so an interrupted deployment never
+            # leaves a partially written ledger
+            tmp_file = self.path.with_name(f"{self.file_name}.{os.getpid()}.tmp")
+            tmp_file.write_text(
+                json.dumps({"version": self.version, **self._content}, indent=2)
+            )
+            os.replace(tmp_file, self.path)
+        except OSError as e:
+            logger.warning("Unable to write ledger to '{}': {}", self.path, e)
+
+
+def fingerprint(component: SoftwareComponent, version: t.Optional[str] = None) -> str:
+    """Fingerprint the definition of a software component, i.e., the contents of
+    its folders including all subfolders, its other files, its requirements, and
+    the requested version.
+
+    Args:
+        component (SoftwareComponent): The software component.
+        version (t.Optional[str], optional): The requested version. Defaults to
+            None.
+
+    Returns:
+        str: The fingerprint.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([component.name, version, component.requires]).encode())
+    # Folders are copied into containers as a whole, so nested files count as well
+    hashed = set()
+    for folder in component.folders:
+        files = [x for x in folder.rglob("*") if "__pycache__" not in x.parts]
+        for file in sorted(files, key=lambda x: x.relative_to(folder).as_posix()):
+            if file.is_file() and file not in hashed:
+                hashed.add(file)
+                _hash_file(digest, file, file.relative_to(folder).as_posix())
+
+    files = list(component.files)
+    if type(component) is not SoftwareComponent:
+        try:
+            files.append(Path(inspect.getfile(type(component))))
+        except TypeError:
+            pass
+    for file in dict.fromkeys(files):
+        if file not in hashed:
+            _hash_file(digest, file, file.name)
+    return digest.hexdigest()
+
+
+def _hash_file(digest: t.Any, file: Path, name: str) -> None:
+    digest.update(name.encode())
+    try:
+        digest.update(file.read_bytes())
+    except OSError:
+        pass
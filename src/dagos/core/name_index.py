@@ -0,0 +1,187 @@
+import json
+import os
+import typing as t
+from pathlib import Path
+
+from loguru import logger
+
+import dagos
+from dagos.core.commands import CommandRegistry
+from dagos.core.configuration import ConfigurationScanner
+from dagos.core.configuration import DagosConfiguration
+from dagos.core.entry_point_scanner import describe_entry_points
+from dagos.core.environments import SoftwareEnvironmentRegistry
+from dagos.core.scan_cache import ScanCache
+
+
+class NameIndex:
+    """A singleton, persistent index of the names of software component commands
+    and software environments.
+
+    Unlike the scan cache the index holds nothing but names and short help texts,
+    so it is read within milliseconds. Shell completion answers from it instead
+    of scanning the configuration and search paths.
+
+    The index is updated by every invocation that scanned the search paths. It
+    is considered outdated once a configuration file, a search path folder, a
+    component folder, or a file directly within one changed, which is the case
+    when files are added to or removed from a folder. It is outdated as well
+    once the software components provided by installed distributions changed.
+    """
+
+    __instance = None
+
+    file_name = "name-index.json"
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = object.__new__(cls)
+            cls.__instance._names = {"commands": {}, "environments": []}
+            cls.__instance._fingerprint = []
+            cls.__instance._entry_points = []
+            cls.__instance._dirty = False
+        return cls.__instance
+
+    @property
+    def path(self) -> Path:
+        return ScanCache().cache_dir / self.file_name
+
+    @property
+    def commands(self) -> t.Dict[str, t.Dict[str, t.Optional[str]]]:
+        """The short help texts of the commands of software components, keyed by
+        command type and component name."""
+        return self._names["commands"]
+
+    @property
+    def environments(self) -> t.List[str]:
+        """The names of all software environments."""
+        return self._names["environments"]
+
+    def load(self) -> bool:
+        """Load the index from disk.
+
+        Returns:
+            bool: True, if the index exists and is up to date.
+        """
+        try:
+            content = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return False
+        if content.get("version") != dagos.__version__:
+            return False
+
+        fingerprint = content.get("fingerprint", [])
+        paths = [Path(x[0]) for x in fingerprint]
+        if not all(x in paths for x in self._get_configuration_files()):
+            logger.trace("The name index was built for other configuration files")
+            return False
+        if fingerprint != self._take_fingerprint(paths):
+            logger.trace("The name index is outdated")
+            return False
+        entry_points = content.get("entry_points")
+        if entry_points != describe_entry_points():
+            logger.trace("The name index was built for other installed components")
+            return False
+
+        self._names = {
+            "commands": content.get("commands", {}),
+            "environments": content.get("environments", []),
+        }
+        self._fingerprint = fingerprint
+        self._entry_points = entry_points
+        return True
+
+    def update(self, configuration: DagosConfiguration) -> None:
+        """Collect the names of all registered commands and software environments.
+
+        Args:
+            configuration (DagosConfiguration): The configuration defining the
+                search paths the names were scanned from.
+        """
+        commands = {}
+        for type_name, group in CommandRegistry.commands.items():
+            commands[type_name] = {
+                name: group.get_command(None, name).get_short_help_str()
+                for name in group.list_commands(None)
+            }
+        names = {
+            "commands": commands,
+            "environments": list(SoftwareEnvironmentRegistry.handles.keys()),
+        }
+        fingerprint = self._take_fingerprint(
+            [
+                *self._get_configuration_files(),
+                *configuration.component_search_paths,
+                *self._list_component_paths(configuration.component_search_paths),
+                *configuration.environment_search_paths,
+            ]
+        )
+        self._names = names
+        self._fingerprint = fingerprint
+        self._entry_points = describe_entry_points()
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the index to disk, if it was updated and differs from the stored
+        one."""
+        if not self._dirty:
+            return
+        content = json.dumps(
+            {
+                "version": dagos.__version__,
+                "fingerprint": self._fingerprint,
+                "entry_points": self._entry_points,
+                **self._names,
+            }
+        )
+        try:
+            if self.path.exists() and self.path.read_text() == content:
+                self._dirty = False
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.path.with_name(f"{self.file_name}.{os.getpid()}.tmp")
+            tmp_file.write_text(content)
+            os.replace(tmp_file, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.debug("Unable to write name index to '{}': {}", self.path, e)
+
+    def clear(self) -> None:
+        """Remove all names from the index, both in memory and on disk."""
+        self._names = {"commands": {}, "environments": []}
+        self._fingerprint = []
+        self._entry_points = []
+        self._dirty = False
+        if self.path.exists():
+            self.path.unlink()
+
+    def _get_configuration_files(self) -> t.List[Path]:
+        return [
+            x / ConfigurationScanner.file_name
+            for x in ConfigurationScanner.get_search_paths()
+        ]
+
+    def _list_component_paths(self, search_paths: t.List[Path]) -> t.List[Path]:
+        # Files changed in place leave the mtime of their folder unchanged
+        paths = []
+        for search_path in search_paths:
+            try:
+                folders = sorted(x for x in search_path.iterdir() if x.is_dir())
+            except OSError:
+                continue
+            for folder in folders:
+                paths.append(folder)
+                try:
+                    paths.extend(sorted(x for x in folder.iterdir() if x.is_file()))
+                except OSError:
+                    continue
+        return paths
+
+    def _take_fingerprint(self, paths: t.List[Path]) -> t.List[t.List]:
+        fingerprint = []
+        for path in paths:
+            try:
+                fingerprint.append([str(path), path.stat().st_mtime_ns])
+            except OSError:
+                fingerprint.append([str(path), None])
+        return fingerprint
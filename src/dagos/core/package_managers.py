@@ -1,32 +1,33 @@
 from __future__ import annotations
 
 import os
+import re
+import shlex
 import textwrap
 import typing as t
 
+from dagos.logging import LogLevel
 from dagos.platform.command_runner import CommandRunner
 
 
 class PackageManagerRegistry(type):
     """A metaclass responsible for registering supported package managers."""
 
-    managers: t.List[PackageManager] = []
+    # Keyed by package manager name, in order of registration
+    managers: t.Dict[str, PackageManager] = {}
 
     def __call__(cls, *args: t.Any, **kwds: t.Any) -> t.Any:
         manager = super().__call__(*args, **kwds)
 
-        if cls not in cls.managers:
-            cls.managers.append(manager)
+        # TODO: Use a classproperty from boltons?
+        if manager.name() not in cls.managers:
+            cls.managers[manager.name()] = manager
 
         return manager
 
     @classmethod
     def find(cls, name: str) -> t.Optional[PackageManager]:
-        for manager in cls.managers:
-            # TODO: Use a classproperty from boltons?
-            if manager.name() == name:
-                return manager
-        return None
+        return cls.managers.get(name)
 
 
 class PackageManager(metaclass=PackageManagerRegistry):
@@ -41,6 +42,12 @@ class PackageManager(metaclass=PackageManagerRegistry):
         """The name of the package manager, defaults to the lower case class name."""
         return str(cls.__name__).lower()
 
+    @classmethod
+    def provided_by(cls) -> t.Optional[str]:
+        """The name of the software component installing this package manager, if
+        it is not provided by the system. Defaults to None."""
+        return None
+
     def install(self, packages: t.List[str], command_runner: CommandRunner) -> None:
         """Install the provided packages via the provided command_runner.
 
@@ -60,6 +67,37 @@ class PackageManager(metaclass=PackageManagerRegistry):
         """Refresh metadata from remote repository."""
         raise NotImplementedError
 
+    def find_missing(
+        self, packages: t.List[str], command_runner: CommandRunner
+    ) -> t.List[str]:
+        """Find the packages that are not installed. Managers unable to tell
+        consider all packages installed.
+
+        Args:
+            packages (t.List[str]): The packages to check.
+            command_runner (CommandRunner): A command runner instance to check with.
+
+        Returns:
+            t.List[str]: The packages that are not installed.
+        """
+        return []
+
+    def _find_missing_by_exit_code(
+        self, command: str, packages: t.List[str], command_runner: CommandRunner
+    ) -> t.List[str]:
+        missing = []
+        for package in packages:
+            result = command_runner.run(
+                f"{command} {package}",
+                capture_stdout=True,
+                capture_stderr=True,
+                ignore_failure=True,
+                log_level=LogLevel.DEBUG,
+            )
+            if result.returncode != 0:
+                missing.append(package)
+        return missing
+
 
 class Apt(PackageManager):
     def install(self, packages: t.List[str], command_runner: CommandRunner) -> None:
@@ -74,6 +112,11 @@ class Apt(PackageManager):
     def refresh(self, command_runner: CommandRunner) -> None:
         command_runner.run("apt update")
 
+    def find_missing(
+        self, packages: t.List[str], command_runner: CommandRunner
+    ) -> t.List[str]:
+        return self._find_missing_by_exit_code("dpkg -s", packages, command_runner)
+
 
 class Dnf(PackageManager):
     def install(self, packages: t.List[str], command_runner: CommandRunner) -> None:
@@ -82,16 +125,62 @@ class Dnf(PackageManager):
     def clean(self, command_runner: CommandRunner) -> None:
         command_runner.run("dnf clean all")
 
+    def find_missing(
+        self, packages: t.List[str], command_runner: CommandRunner
+    ) -> t.List[str]:
+        return self._find_missing_by_exit_code("rpm -q", packages, command_runner)
+
 
 class Yum(PackageManager):
     def install(self, packages: t.List[str], command_runner: CommandRunner) -> None:
         command_runner.run(f"yum install -y {' '.join(packages)}")
 
+    def find_missing(
+        self, packages: t.List[str], command_runner: CommandRunner
+    ) -> t.List[str]:
+        return self._find_missing_by_exit_code("rpm -q", packages, command_runner)
+
 
 class Pip(PackageManager):
     def install(self, packages: t.List[str], command_runner: CommandRunner) -> None:
         # TODO: How to handle different python versions?
-        command_runner.run(f"pip install {' '.join(packages)}")
+        # Version specifiers contain characters the shell would interpret
+        command_runner.run(f"pip install {' '.join(shlex.quote(x) for x in packages)}")
+
+    def find_missing(
+        self, packages: t.List[str], command_runner: CommandRunner
+    ) -> t.List[str]:
+        from packaging.requirements import InvalidRequirement
+        from packaging.requirements import Requirement
+
+        # pip show only accepts names, so the installed version is compared to
+        # the specifiers of a requirement separately
+        missing = []
+        for package in packages:
+            try:
+                requirement = Requirement(package)
+            except InvalidRequirement:
+                missing.append(package)
+                continue
+            if requirement.marker is not None and not requirement.marker.evaluate():
+                continue
+            result = command_runner.run(
+                f"pip show {shlex.quote(requirement.name)}",
+                capture_stdout=True,
+                capture_stderr=True,
+                ignore_failure=True,
+                log_level=LogLevel.DEBUG,
+            )
+            version = re.search(r"^Version:\s*(\S+)", result.stdout or "", re.M)
+            if (
+                result.returncode != 0
+                or version is None
+                or not requirement.specifier.contains(
+                    version.group(1), prereleases=True
+                )
+            ):
+                missing.append(package)
+        return missing
 
 
 class Choco(PackageManager):
@@ -104,6 +193,10 @@ class Sdkman(PackageManager):
     def name(cls) -> str:
         return "sdk"
 
+    @classmethod
+    def provided_by(cls) -> t.Optional[str]:
+        return "sdkman"
+
     def install(self, packages: t.List[str], command_runner: CommandRunner) -> None:
         # In order to use sdk from the command line one needs to source its init script.
         # This is not possible through the subprocess module. Therefore we use a temporary
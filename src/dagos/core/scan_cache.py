@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import threading
+import typing as t
+from pathlib import Path
+
+from loguru import logger
+
+import dagos
+
+
+def default_cache_dir() -> Path:
+    """The folder DAG-OS keeps its caches in, honoring `XDG_CACHE_HOME`."""
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    return (Path(cache_home) if cache_home else Path.home() / ".cache") / "dagos"
+
+
+class ScanCache:
+    """A singleton, persistent index of files read while scanning search paths.
+
+    Each file entry is keyed by the path of the scanned file and carries its
+    modification time, size, and content hash alongside the data loaded from
+    it. As long as a file is unchanged its data is served from the index, which
+    saves reading, parsing, and validating it on every invocation.
+
+    Additionally, the index describes software components, i.e., their names and
+    commands, so the CLI can be built without executing component modules.
+    """
+
+    __instance = None
+
+    file_name = "scan-index.json"
+    # Guards reading the index, which may be accessed by concurrent scans
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = object.__new__(cls)
+            cls.__instance.cache_dir = default_cache_dir()
+            cls.__instance._index = None
+            cls.__instance._dirty = False
+        return cls.__instance
+
+    @property
+    def path(self) -> Path:
+        return self.cache_dir / self.file_name
+
+    @property
+    def files(self) -> t.Dict[str, t.Dict]:
+        return self.index["files"]
+
+    @property
+    def components(self) -> t.Dict[str, t.Dict]:
+        return self.index["components"]
+
+    @property
+    def index(self) -> t.Dict[str, t.Dict]:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._read()
+        return self._index
+
+    def get(self, path: Path) -> t.Optional[t.Any]:
+        """Get the data of provided file from the index without loading it.
+
+        Args:
+            path (Path): The file to get the data for.
+
+        Returns:
+            t.Optional[t.Any]: The data of the file or None, if the file is unknown
+            or has changed since it was indexed.
+        """
+        entry = self.files.get(str(path.absolute()))
+        if entry is None:
+            return None
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        if entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry["data"]
+        return None
+
+    def get_or_load(
+        self, path: Path, loader: t.Callable[[t.Optional[bytes]], t.Any]
+    ) -> t.Any:
+        """Get the data of provided file from the index or load it, if the file
+        is unknown or has changed since it was indexed.
+
+        Args:
+            path (Path): The file to get the data for.
+            loader (t.Callable[[t.Optional[bytes]], t.Any]): Loads the data of the
+                file from the content passed to it, so the file is read only once.
+                The content is None, if the file could not be read. Any exception
+                raised by the loader is passed on and nothing is indexed.
+
+        Returns:
+            t.Any: The data of the file.
+        """
+        try:
+            stat = path.stat()
+        except OSError:
+            return loader(None)
+
+        key = str(path.absolute())
+        entry = self.files.get(key)
+        if entry is not None:
+            if entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                return entry["data"]
+
+        try:
+            content = path.read_bytes()
+        except OSError:
+            return loader(None)
+        content_hash = hashlib.sha256(content).hexdigest()
+        if entry is not None and entry["hash"] == content_hash:
+            logger.trace("Only the timestamp of '{}' changed", path)
+            entry["mtime"] = stat.st_mtime_ns
+            entry["size"] = stat.st_size
+            self._dirty = True
+            return entry["data"]
+
+        data = loader(content)
+        try:
+            json.dumps(data)
+        except (TypeError, ValueError):
+            logger.trace("Unable to index the contents of '{}'", path)
+            return data
+        self.files[key] = {
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "hash": content_hash,
+            "data": data,
+        }
+        self._dirty = True
+        return data
+
+    def get_component(
+        self, name: str, fingerprint: t.List[t.List]
+    ) -> t.Optional[t.Dict]:
+        """Get the description of a software component, if its files did not change
+        since it was described.
+
+        Args:
+            name (str): The name of the component folder.
+            fingerprint (t.List[t.List]): The current fingerprint of the component files.
+
+        Returns:
+            t.Optional[t.Dict]: The description or None, if it is unknown or outdated.
+        """
+        entry = self.components.get(name)
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return None
+        return entry["description"]
+
+    def put_component(
+        self, name: str, fingerprint: t.List[t.List], description: t.Dict
+    ) -> None:
+        """Describe a software component for later invocations.
+
+        Args:
+            name (str): The name of the component folder.
+            fingerprint (t.List[t.List]): The fingerprint of the component files.
+            description (t.Dict): The description of the component.
+        """
+        self.components[name] = {"fingerprint": fingerprint, "description": description}
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the index to disk, if anything changed."""
+        if not self._dirty:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so concurrent invocations never
+            # read a partially written index.
+            tmp_file = self.path.with_name(f"{self.file_name}.{os.getpid()}.tmp")
+            tmp_file.write_text(
+                json.dumps({"version": dagos.__version__, **self.index})
+            )
+            os.replace(tmp_file, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.debug("Unable to write scan cache to '{}': {}", self.path, e)
+
+    def clear(self) -> None:
+        """Remove all entries from the index, both in memory and on disk."""
+        self._index = {"files": {}, "components": {}}
+        self._dirty = False
+        if self.path.exists():
+            self.path.unlink()
+
+    def _read(self) -> t.Dict[str, t.Dict]:
+        index = {"files": {}, "components": {}}
+        if not self.path.exists():
+            return index
+        try:
+            content = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            logger.debug("Discarding unreadable scan cache '{}': {}", self.path, e)
+            return index
+        if content.get("version") != dagos.__version__:
+            logger.debug("Discarding scan cache of another DAG-OS version")
+            return index
+        for key in index.keys():
+            index[key] = content.get(key, {})
+        return index
@@ -0,0 +1,227 @@
+import contextvars
+import typing as t
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from dataclasses import dataclass
+from dataclasses import field
+
+from loguru import logger
+
+from dagos.exceptions import DagosException
+from dagos.tracing import span
+
+
+@dataclass
+class Job:
+    name: str
+    action: t.Callable[[], None]
+    # The names of the jobs that have to succeed before this one runs
+    requires: t.Set[str] = field(default_factory=set)
+    # Describes everything the outcome of the job depends on, if known
+    inputs: t.Optional[str] = None
+
+
+class Scheduler:
+    """Runs jobs as soon as all jobs they require succeeded, using a pool of
+    threads.
+
+    Messages logged by a job are prefixed with its name when jobs run
+    concurrently. If a job fails, no further jobs are started and the running
+    ones are awaited. When asked to keep going, only the jobs requiring a failed
+    one, directly or indirectly, are skipped.
+    """
+
+    def __init__(self, workers: int = 1, keep_going: bool = False) -> None:
+        """
+        Args:
+            workers (int, optional): The maximum number of jobs to run at once. With
+                a single worker jobs run in the calling thread, in the order they
+                were added unless required otherwise. Defaults to 1.
+            keep_going (bool, optional): If True, independent jobs are still run
+                after a job failed. Defaults to False.
+        """
+        self.workers = workers
+        self.keep_going = keep_going
+        # Keyed by job name, in order of addition
+        self.jobs: t.Dict[str, Job] = {}
+
+    def add(
+        self,
+        name: str,
+        action: t.Callable[[], None],
+        requires: t.Iterable[str] = (),
+        inputs: t.Optional[str] = None,
+    ) -> None:
+        """Add a job.
+
+        Args:
+            name (str): The unique name of the job.
+            action (t.Callable[[], None]): The work to do.
+            requires (t.Iterable[str], optional): The names of the jobs that have
+                to succeed first. Defaults to none.
+            inputs (t.Optional[str], optional): Describes everything the outcome
+                of the job depends on, which allows schedulers to reuse it.
+                Defaults to None.
+
+        Raises:
+            DagosException: If a job with the same name exists.
+        """
+        if name in self.jobs:
+            raise DagosException(f"There already is a job named '{name}'")
+        self.jobs[name] = Job(name, action, set(requires), inputs)
+
+    def plan(self) -> t.List[t.List[str]]:
+        """Order the jobs topologically.
+
+        Returns:
+            t.List[t.List[str]]: The jobs grouped into levels, in order of
+            addition within a level. Each job only requires jobs of previous
+            levels, so all jobs of a level may run concurrently.
+
+        Raises:
+            DagosException: If a job requires an unknown one or jobs require each
+                other.
+        """
+        remaining: t.Dict[str, int] = {}
+        required_by: t.Dict[str, t.List[str]] = {x: [] for x in self.jobs.keys()}
+        for job in self.jobs.values():
+            unknown = job.requires - self.jobs.keys()
+            if unknown:
+                raise DagosException(
+                    f"The job '{job.name}' requires unknown jobs: {', '.join(sorted(unknown))}"
+                )
+            remaining[job.name] = len(job.requires)
+            for requirement in job.requires:
+                required_by[requirement].append(job.name)
+
+        levels = []
+        level = [x for x, y in remaining.items() if y == 0]
+        while level:
+            levels.append(level)
+            next_level = set()
+            for name in level:
+                del remaining[name]
+                for dependent in required_by[name]:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        next_level.add(dependent)
+            level = [x for x in self.jobs.keys() if x in next_level]
+
+        if remaining:
+            cycle = self._find_cycle(remaining.keys())
+            raise DagosException(f"The jobs require each other: {' -> '.join(cycle)}")
+        return levels
+
+    def run(self) -> None:
+        """Run all jobs.
+
+        Raises:
+            DagosException: If a job requires an unknown one, jobs require each
+                other, or any job failed.
+        """
+        levels = self.plan()
+        logger.debug("Planned {} job(s) in {} level(s)", len(self.jobs), len(levels))
+        for index, level in enumerate(levels, start=1):
+            logger.trace("Level {}: {}", index, ", ".join(level))
+
+        pending = dict(self.jobs)
+        succeeded: t.Set[str] = set()
+        failed: t.List[str] = []
+        skipped: t.List[str] = []
+        running: t.Dict[Future, str] = {}
+
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            while pending or running:
+                if not failed or self.keep_going:
+                    for name in self._skip_unsatisfiable(pending, failed, skipped):
+                        logger.warning(
+                            "[bold]{}[/bold]: Skipped, a required job failed", name
+                        )
+                    for job in [x for x in pending.values() if x.requires <= succeeded]:
+                        if len(running) >= self.workers:
+                            break
+                        del pending[job.name]
+                        if self.workers <= 1:
+                            self._record(
+                                job.name, self._execute(job), succeeded, failed
+                            )
+                            break
+                        # Jobs inherit the context, e.g., of the logger
+                        future = executor.submit(
+                            contextvars.copy_context().run, self._execute, job
+                        )
+                        running[future] = job.name
+                elif not running:
+                    skipped.extend(pending.keys())
+                    pending.clear()
+
+                if running:
+                    done, _ = wait(running.keys(), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._record(
+                            running.pop(future), future.result(), succeeded, failed
+                        )
+        finally:
+            executor.shutdown(wait=True)
+
+        if failed:
+            message = (
+                f"{len(failed)} of {len(self.jobs)} jobs failed: {', '.join(failed)}"
+            )
+            if skipped:
+                message += f". Skipped {len(skipped)} jobs: {', '.join(skipped)}"
+            raise DagosException(message)
+
+    def _execute(self, job: Job) -> t.Optional[Exception]:
+        try:
+            with span("Run job", "deploy", job=job.name):
+                if self.workers <= 1:
+                    job.action()
+                else:
+                    with logger.contextualize(job=job.name):
+                        job.action()
+        except Exception as e:
+            logger.error("[bold]{}[/bold]: Failed\n{}", job.name, e)
+            return e
+        return None
+
+    def _record(
+        self,
+        name: str,
+        error: t.Optional[Exception],
+        succeeded: t.Set[str],
+        failed: t.List[str],
+    ) -> None:
+        if error is None:
+            succeeded.add(name)
+        else:
+            failed.append(name)
+
+    def _find_cycle(self, names: t.Iterable[str]) -> t.List[str]:
+        # Each of the remaining jobs requires another remaining one, following
+        # these requirements eventually leads to a job visited before
+        names = set(names)
+        path = [next(x for x in self.jobs.keys() if x in names)]
+        while path.count(path[-1]) < 2:
+            job = self.jobs[path[-1]]
+            path.append(next(x for x in self.jobs.keys() if x in job.requires & names))
+        return path[path.index(path[-1]) :]
+
+    def _skip_unsatisfiable(
+        self, pending: t.Dict[str, Job], failed: t.List[str], skipped: t.List[str]
+    ) -> t.List[str]:
+        unsatisfiable = set(failed) | set(skipped)
+        newly_skipped = []
+        changed = True
+        while changed:
+            changed = False
+            for job in [x for x in pending.values() if x.requires & unsatisfiable]:
+                del pending[job.name]
+                unsatisfiable.add(job.name)
+                newly_skipped.append(job.name)
+                changed = True
+        skipped.extend(newly_skipped)
+        return newly_skipped
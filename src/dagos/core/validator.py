@@ -2,10 +2,9 @@ import typing as t
 from io import StringIO
 from pathlib import Path
 
-import yamale
-
 from dagos.exceptions import SchemaValidationException
 from dagos.exceptions import ValidationException
+from dagos.tracing import span
 
 
 class Validator:
@@ -15,31 +14,128 @@ class Validator:
         "command": schema_dir / "command.schema.yml",
         "configuration": schema_dir / "configuration.schema.yml",
         "environment": schema_dir / "environment.schema.yml",
+        "manifest": schema_dir / "manifest.schema.yml",
     }
+    # Compiled schemas are shared by all validators of a process
+    compiled_schemas: t.Dict[str, t.Any] = {}
+
+    def validate_command(self, path: Path, content: t.Optional[bytes] = None) -> t.Dict:
+        return self._validate_with_schema("command", path, content)
+
+    def validate_configuration(
+        self, path: Path, content: t.Optional[bytes] = None
+    ) -> t.Dict:
+        return self._validate_with_schema("configuration", path, content)
+
+    def validate_environment(
+        self, path: Path, content: t.Optional[bytes] = None
+    ) -> t.Dict:
+        return self._validate_with_schema("environment", path, content)
+
+    def validate_manifest(
+        self, path: Path, content: t.Optional[bytes] = None
+    ) -> t.Dict:
+        return self._validate_with_schema("manifest", path, content)
+
+    def validate_many(
+        self, schema_key: str, paths: t.Iterable[Path]
+    ) -> t.Dict[Path, t.Union[t.Dict, ValidationException]]:
+        """Validate provided files against the same schema, which is compiled only
+        once. An invalid file does not stop the validation of the remaining ones.
+
+        Args:
+            schema_key (str): The schema to validate against, e.g., "environment".
+            paths (t.Iterable[Path]): The files to validate.
+
+        Returns:
+            t.Dict[Path, t.Union[t.Dict, ValidationException]]: The validated data of
+            each file or the exception describing why it is invalid.
+        """
+        results = {}
+        for path in paths:
+            try:
+                results[path] = self._validate_with_schema(schema_key, path)
+            except ValidationException as e:
+                results[path] = e
+        return results
+
+    def get_schema(self, schema_key: str) -> t.Any:
+        """Get the compiled schema for provided key, compiling it if necessary.
+
+        Args:
+            schema_key (str): The schema to get, e.g., "environment".
 
-    def validate_command(self, path: Path) -> t.Dict:
-        return self._validate_with_schema("command", path)
+        Returns:
+            yamale.schema.Schema: The compiled schema.
+        """
+        if schema_key not in self.compiled_schemas:
+            from yamale.schema import Schema
 
-    def validate_configuration(self, path: Path) -> t.Dict:
-        return self._validate_with_schema("configuration", path)
+            from dagos.utils import yaml_utils
 
-    def validate_environment(self, path: Path) -> t.Dict:
-        return self._validate_with_schema("environment", path)
+            path = self.schemas[schema_key]
+            with span("Compile schema", "validation", schema=schema_key):
+                # The first document is the base schema, any further ones contain
+                # includes
+                raw_schemas = yaml_utils.load_all_file(path)
+                schema = Schema(raw_schemas[0], str(path))
+                for raw_schema in raw_schemas[1:]:
+                    schema.add_include(raw_schema)
+            self.compiled_schemas[schema_key] = schema
+        return self.compiled_schemas[schema_key]
+
+    def parse(self, path: Path, content: t.Optional[bytes] = None) -> t.List[t.Any]:
+        """Parse all YAML documents of provided file.
+
+        Args:
+            path (Path): The file to parse.
+            content (t.Optional[bytes], optional): The already read content of the
+                file. If None, the file is read. Defaults to None.
+
+        Raises:
+            ValidationException: If the file does not exist or cannot be parsed.
+
+        Returns:
+            t.List[t.Any]: The parsed documents.
+        """
+        from dagos.utils import yaml_utils
+
+        if content is None:
+            if not path.exists():
+                raise ValidationException(f"The file '{path}' does not exist!")
+            if not path.is_file():
+                raise ValidationException(f"The path '{path}' is not a file!")
+            content = path.read_bytes()
 
-    def _validate_with_schema(self, schema_key: str, path: Path) -> t.Dict:
-        if not path.exists():
-            raise ValidationException(f"The file '{path}' does not exist!")
-        if not path.is_file():
-            raise ValidationException(f"The path '{path}' is not a file!")
         try:
-            data = yamale.make_data(path)
+            return yaml_utils.load_all(content)
         except Exception as e:
             raise ValidationException(f"Unable to parse '{path}'", e)
 
-        schema = yamale.make_schema(self.schemas[schema_key])
+    def validate_documents(
+        self, schema_key: str, path: Path, documents: t.List[t.Any]
+    ) -> t.Dict:
+        """Validate already parsed documents against a schema.
+
+        Args:
+            schema_key (str): The schema to validate against, e.g., "command".
+            path (Path): The file the documents were parsed from.
+            documents (t.List[t.Any]): The parsed documents.
+
+        Raises:
+            SchemaValidationException: If the documents do not match the schema.
+
+        Returns:
+            t.Dict: The first validated document.
+        """
+        import yamale
+
+        data = [(x, str(path)) for x in documents] if documents else [({}, str(path))]
+        schema = self.get_schema(schema_key)
 
         try:
-            yamale.validate(schema, data)
+            with span("Validate", "validation", schema=schema_key, path=path):
+                yamale.validate(schema, data)
         except yamale.YamaleError as e:
             errors = StringIO()
             for result in e.results:
@@ -49,3 +145,8 @@ class Validator:
             )
 
         return data[0][0]
+
+    def _validate_with_schema(
+        self, schema_key: str, path: Path, content: t.Optional[bytes] = None
+    ) -> t.Dict:
+        return self.validate_documents(schema_key, path, self.parse(path, content))
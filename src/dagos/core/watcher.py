@@ -0,0 +1,300 @@
+"""Watch search paths to refresh the registries incrementally.
+
+Long-running hosts, e.g., the daemon, ask a watcher for the entries of their
+search paths that changed since they last asked, i.e., component folders and
+environment files. Only those are scanned anew by `refresh_registries`.
+
+On Linux changes are reported by inotify, elsewhere the search paths are polled.
+"""
+import ctypes.util
+import os
+import struct
+import typing as t
+from abc import ABC
+from abc import abstractmethod
+from pathlib import Path
+
+from loguru import logger
+
+from dagos.core.component_scanner import SoftwareComponentScanner
+from dagos.core.configuration import DagosConfiguration
+from dagos.core.environments import SoftwareEnvironmentRegistry
+from dagos.core.environments import SoftwareEnvironmentScanner
+from dagos.tracing import traced
+
+# See inotify(7)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+_WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+_EVENT = struct.Struct("iIII")
+
+
+class SearchPathWatcher(ABC):
+    """Reports changed entries directly below a set of search paths.
+
+    A change anywhere within a folder below a search path is reported as a change
+    of that folder. Search paths that do not exist yet are picked up once they
+    are created.
+    """
+
+    def __init__(self, search_paths: t.Iterable[Path]) -> None:
+        self.search_paths = list(dict.fromkeys(search_paths))
+
+    @abstractmethod
+    def changes(self) -> t.Set[Path]:
+        """Collect the entries that changed since the last call without blocking.
+
+        Returns:
+            t.Set[Path]: The added, modified, or removed entries directly below
+            the search paths.
+        """
+        pass
+
+    def close(self) -> None:
+        """Release all resources held by the watcher."""
+        pass
+
+    def __enter__(self) -> "SearchPathWatcher":
+        return self
+
+    def __exit__(self, *args: t.Any) -> None:
+        self.close()
+
+
+class PollingWatcher(SearchPathWatcher):
+    """A watcher comparing the modification times and sizes of all entries below
+    the search paths whenever it is asked for changes."""
+
+    def __init__(self, search_paths: t.Iterable[Path]) -> None:
+        super().__init__(search_paths)
+        self._snapshot = self._take_snapshot()
+
+    def changes(self) -> t.Set[Path]:
+        snapshot = self._take_snapshot()
+        changed = {
+            x
+            for x in snapshot.keys() | self._snapshot.keys()
+            if snapshot.get(x) != self._snapshot.get(x)
+        }
+        self._snapshot = snapshot
+        return changed
+
+    def _take_snapshot(self) -> t.Dict[Path, t.Any]:
+        snapshot = {}
+        for search_path in self.search_paths:
+            try:
+                with os.scandir(search_path) as entries:
+                    for entry in entries:
+                        snapshot[Path(entry.path)] = self._describe(entry)
+            except OSError:
+                continue
+        return snapshot
+
+    def _describe(self, entry: os.DirEntry) -> t.Any:
+        try:
+            stat = entry.stat()
+            if not entry.is_dir():
+                return (stat.st_mtime_ns, stat.st_size)
+            # Modifying a file leaves the modification time of its folder as is
+            with os.scandir(entry.path) as children:
+                return (
+                    stat.st_mtime_ns,
+                    sorted(
+                        (x.name, x.stat().st_mtime_ns, x.stat().st_size)
+                        for x in children
+                    ),
+                )
+        except OSError:
+            return None
+
+
+class InotifyWatcher(SearchPathWatcher):
+    """A watcher relying on the inotify API of the Linux kernel.
+
+    Each search path and each folder directly below it is watched. Events are
+    read without blocking whenever the watcher is asked for changes.
+
+    Raises:
+        OSError: If inotify is unavailable.
+    """
+
+    def __init__(self, search_paths: t.Iterable[Path]) -> None:
+        super().__init__(search_paths)
+        self._libc = _load_libc()
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"Unable to initialize inotify: {os.strerror(errno)}")
+        self._watches: t.Dict[int, Path] = {}
+        for search_path in self.search_paths:
+            self._watch_search_path(search_path)
+
+    def changes(self) -> t.Set[Path]:
+        changed = set()
+        for search_path in self.search_paths:
+            if search_path not in self._watches.values():
+                changed.update(self._watch_search_path(search_path))
+
+        for wd, mask, name in self._read_events():
+            if mask & IN_Q_OVERFLOW:
+                logger.debug("Lost inotify events, assuming everything changed")
+                changed.update(self._list_all_entries())
+                continue
+            folder = self._watches.get(wd)
+            if folder is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._watches[wd]
+            elif folder not in self.search_paths:
+                changed.add(folder)
+            elif name:
+                entry = folder / name
+                changed.add(entry)
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    self._watch(entry)
+                elif mask & IN_ISDIR and mask & IN_MOVED_FROM:
+                    self._unwatch(entry)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+            self._watches.clear()
+
+    def _watch_search_path(self, search_path: Path) -> t.List[Path]:
+        if not self._watch(search_path):
+            return []
+        entries = self._list_entries(search_path)
+        for entry in entries:
+            if entry.is_dir():
+                self._watch(entry)
+        return entries
+
+    def _watch(self, folder: Path) -> bool:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(folder), _WATCH_MASK)
+        if wd < 0:
+            logger.trace(
+                "Unable to watch '{}': {}", folder, os.strerror(ctypes.get_errno())
+            )
+            return False
+        self._watches[wd] = folder
+        return True
+
+    def _unwatch(self, folder: Path) -> None:
+        for wd in [x for x, y in self._watches.items() if y == folder]:
+            self._libc.inotify_rm_watch(self._fd, wd)
+            del self._watches[wd]
+
+    def _read_events(self) -> t.Iterator[t.Tuple[int, int, str]]:
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset + _EVENT.size <= len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                yield wd, mask, os.fsdecode(name)
+
+    def _list_all_entries(self) -> t.List[Path]:
+        return [x for y in self.search_paths for x in self._list_entries(y)]
+
+    def _list_entries(self, search_path: Path) -> t.List[Path]:
+        try:
+            with os.scandir(search_path) as entries:
+                return [Path(x.path) for x in entries]
+        except OSError:
+            return []
+
+
+def _load_libc() -> ctypes.CDLL:
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        raise OSError("The C library does not provide inotify")
+    return libc
+
+
+def create_watcher(search_paths: t.Iterable[Path]) -> SearchPathWatcher:
+    """Create a watcher for provided search paths, relying on inotify if
+    available and polling otherwise.
+
+    Args:
+        search_paths (t.Iterable[Path]): The search paths to watch.
+
+    Returns:
+        SearchPathWatcher: The created watcher.
+    """
+    try:
+        return InotifyWatcher(search_paths)
+    except (OSError, AttributeError) as e:
+        logger.debug("Falling back to polling search paths, inotify failed: {}", e)
+        return PollingWatcher(search_paths)
+
+
+@traced("Refresh registries", "scan")
+def refresh_registries(
+    changes: t.Iterable[Path], configuration: DagosConfiguration
+) -> None:
+    """Scan the changed component folders and environment files anew, so that the
+    registries and command groups reflect their current state.
+
+    Environments referring to refreshed software components are loaded anew as
+    well, to refer to the current ones.
+
+    Args:
+        changes (t.Iterable[Path]): The changed entries of the search paths.
+        configuration (DagosConfiguration): The configuration defining the search
+            paths.
+    """
+    changes = set(changes)
+    component_search_paths = configuration.component_search_paths
+    environment_search_paths = configuration.environment_search_paths
+
+    names = sorted({x.name for x in changes if x.parent in component_search_paths})
+    refreshed = set()
+    if names:
+        logger.debug("Refreshing {} software component(s)", len(names))
+        refreshed = SoftwareComponentScanner().refresh(component_search_paths, names)
+
+    files = {
+        x
+        for x in changes
+        if x.parent in environment_search_paths and x.suffix in [".yml", ".yaml"]
+    }
+    files.update(
+        x.path
+        for x in SoftwareEnvironmentRegistry.environments.values()
+        if any(y.name in refreshed for y in x.components)
+    )
+    if files:
+        logger.debug("Refreshing {} software environment file(s)", len(files))
+        SoftwareEnvironmentScanner().refresh(sorted(files))
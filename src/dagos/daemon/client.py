@@ -0,0 +1,75 @@
+"""The entry point of the dagos executable.
+
+If the environment variable `DAGOS_DAEMON_SOCKET` points to the socket of a
+running daemon, invocations are forwarded to it. The client passes its stdin,
+stdout, and stderr, so the daemon writes output and logs straight to the
+client's terminal. Without a reachable daemon the CLI runs in this process.
+"""
+import os
+import socket
+import sys
+import typing as t
+from pathlib import Path
+
+from dagos.daemon.protocol import receive_message
+from dagos.daemon.protocol import send_message
+from dagos.daemon.protocol import SOCKET_ENV_VAR
+
+
+def main() -> None:
+    arguments = sys.argv[1:]
+    socket_path = os.environ.get(SOCKET_ENV_VAR)
+    if socket_path and not _is_daemon_command(arguments):
+        exit_code = run(Path(socket_path), arguments)
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    from dagos.cli import dagos
+
+    dagos()
+
+
+def run(
+    socket_path: Path, arguments: t.List[str], fds: t.Sequence[int] = (0, 1, 2)
+) -> t.Optional[int]:
+    """Forward an invocation to the daemon listening at provided socket.
+
+    Args:
+        socket_path (Path): The socket of the daemon.
+        arguments (t.List[str]): The command line arguments.
+        fds (t.Sequence[int], optional): The stdin, stdout, and stderr to use.
+            Defaults to the ones of this process.
+
+    Returns:
+        t.Optional[int]: The exit code of the invocation or None, if the daemon
+        is unreachable.
+    """
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(str(socket_path))
+    except OSError:
+        connection.close()
+        return None
+
+    with connection:
+        request = {
+            "arguments": arguments,
+            "cwd": os.getcwd(),
+            "environment": dict(os.environ),
+        }
+        try:
+            send_message(connection, request, fds)
+            response, _ = receive_message(connection)
+        except OSError as e:
+            response = None
+            print(f"Lost connection to the dagos daemon: {e}", file=sys.stderr)
+        if response is None:
+            return 1
+        return int(response.get("exit_code", 1))
+
+
+def _is_daemon_command(arguments: t.List[str]) -> bool:
+    for argument in arguments:
+        if not argument.startswith("-"):
+            return argument == "daemon"
+    return False
@@ -0,0 +1,92 @@
+"""The protocol spoken between the dagos client and daemon.
+
+Each message is a JSON object prefixed by its length as a 4-byte unsigned big
+endian integer. File descriptors, e.g., the client's stdin, stdout, and stderr,
+are passed alongside the first chunk of a message as SCM_RIGHTS ancillary data.
+
+This module is imported by the thin client, so it must stay free of heavy
+imports.
+"""
+import array
+import json
+import os
+import socket
+import struct
+import typing as t
+from pathlib import Path
+
+SOCKET_ENV_VAR = "DAGOS_DAEMON_SOCKET"
+_HEADER = struct.Struct("!I")
+
+
+def default_socket_path() -> Path:
+    """The socket path used by the daemon if none is provided, located in
+    `XDG_RUNTIME_DIR` if available and in the cache folder otherwise."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "dagos" / "daemon.sock"
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    cache_dir = Path(cache_home) if cache_home else Path.home() / ".cache"
+    return cache_dir / "dagos" / "daemon.sock"
+
+
+def send_message(
+    connection: socket.socket, message: t.Dict[str, t.Any], fds: t.Sequence[int] = ()
+) -> None:
+    """Send a message and optionally pass file descriptors along.
+
+    Args:
+        connection (socket.socket): A connected Unix domain socket.
+        message (t.Dict[str, t.Any]): The message to send.
+        fds (t.Sequence[int], optional): File descriptors to pass. Defaults to ().
+    """
+    payload = json.dumps(message).encode()
+    data = _HEADER.pack(len(payload)) + payload
+    ancillary = []
+    if fds:
+        ancillary.append(
+            (socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array("i", fds).tobytes())
+        )
+    sent = connection.sendmsg([data], ancillary)
+    if sent < len(data):
+        connection.sendall(data[sent:])
+
+
+def receive_message(
+    connection: socket.socket, max_fds: int = 0
+) -> t.Tuple[t.Optional[t.Dict[str, t.Any]], t.List[int]]:
+    """Receive a message and any file descriptors passed along.
+
+    Args:
+        connection (socket.socket): A connected Unix domain socket.
+        max_fds (int, optional): The maximum number of file descriptors to accept.
+            Defaults to 0.
+
+    Returns:
+        t.Tuple[t.Optional[t.Dict[str, t.Any]], t.List[int]]: The message, or None
+        if the peer closed the connection, and the received file descriptors.
+    """
+    fds = array.array("i")
+    ancillary_size = socket.CMSG_SPACE(max_fds * fds.itemsize) if max_fds else 0
+    data, ancillary, _, _ = connection.recvmsg(4096, ancillary_size)
+    for level, type, fd_data in ancillary:
+        if level == socket.SOL_SOCKET and type == socket.SCM_RIGHTS:
+            usable = len(fd_data) - (len(fd_data) % fds.itemsize)
+            fds.frombytes(fd_data[:usable])
+    if not data:
+        return None, list(fds)
+
+    while len(data) < _HEADER.size:
+        data += _receive(connection, _HEADER.size - len(data))
+    (length,) = _HEADER.unpack(data[: _HEADER.size])
+    payload = data[_HEADER.size :]
+    while len(payload) < length:
+        payload += _receive(connection, length - len(payload))
+    return json.loads(payload.decode()), list(fds)
+
+
+def _receive(connection: socket.socket, size: int) -> bytes:
+    chunk = connection.recv(size)
+    if not chunk:
+        raise ConnectionError("Connection closed before the message was complete")
+    return chunk
@@ -0,0 +1,248 @@
+import os
+import socket
+import sys
+import typing as t
+from pathlib import Path
+
+from loguru import logger
+
+from dagos.cli import _get_verbosity
+from dagos.cli import dagos_cli
+from dagos.cli import load_cli
+from dagos.core.commands import CommandRegistry
+from dagos.core.component_scanner import SoftwareComponentScanner
+from dagos.core.components import SoftwareComponentRegistry
+from dagos.core.configuration import ConfigurationScanner
+from dagos.core.configuration import DagosConfiguration
+from dagos.core.entry_point_scanner import EntryPointScanner
+from dagos.core.environments import SoftwareEnvironmentRegistry
+from dagos.core.name_index import NameIndex
+from dagos.core.scan_cache import ScanCache
+from dagos.core.watcher import create_watcher
+from dagos.core.watcher import refresh_registries
+from dagos.core.watcher import SearchPathWatcher
+from dagos.daemon.protocol import receive_message
+from dagos.daemon.protocol import send_message
+from dagos.exceptions import DagosException
+from dagos.logging import configure_logging
+from dagos.logging import get_console
+from dagos.platform import platform_utils
+
+
+class DagosDaemon:
+    """A long-lived process serving CLI invocations forwarded by clients.
+
+    Scanned software components and environments, compiled schemas, and probed
+    platform facts stay resident between invocations. Before serving an
+    invocation the daemon reloads everything if the configuration changed, e.g.,
+    as the client runs in a folder with a different configuration file, and
+    otherwise refreshes only the changed component folders and environment files.
+
+    Invocations are served one after another. For the duration of an invocation
+    the daemon adopts the client's stdin, stdout, stderr, working directory, and
+    environment variables.
+    """
+
+    def __init__(self, socket_path: Path) -> None:
+        self.socket_path = socket_path
+        self.verbosity = DagosConfiguration().verbosity
+        self._socket: t.Optional[socket.socket] = None
+        self._snapshot: t.List[t.Any] = []
+        self._watcher: t.Optional[SearchPathWatcher] = None
+        self._stopped = False
+
+    def serve_forever(self) -> None:
+        """Serve invocations until the daemon is shut down or interrupted."""
+        self._listen()
+        self._snapshot = self._take_snapshot()
+        self._watch()
+        logger.info("Serving dagos invocations at '{}'", self.socket_path)
+        try:
+            while not self._stopped:
+                try:
+                    connection, _ = self._socket.accept()
+                except OSError:
+                    break
+                with connection:
+                    self._handle(connection)
+        except KeyboardInterrupt:
+            logger.info("Stopping dagos daemon")
+        finally:
+            self._close()
+
+    def shutdown(self) -> None:
+        """Stop serving invocations, e.g., from another thread."""
+        self._stopped = True
+        if self._socket is not None:
+            try:
+                self._socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _listen(self) -> None:
+        self.socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            if self._is_daemon_running():
+                raise DagosException(
+                    f"Another dagos daemon is already serving at '{self.socket_path}'"
+                )
+            logger.debug("Removing stale socket '{}'", self.socket_path)
+            self.socket_path.unlink()
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.bind(str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        self._socket.listen()
+
+    def _is_daemon_running(self) -> bool:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            try:
+                connection.connect(str(self.socket_path))
+                return True
+            except OSError:
+                return False
+
+    def _close(self) -> None:
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+    def _handle(self, connection: socket.socket) -> None:
+        try:
+            request, fds = receive_message(connection, max_fds=3)
+        except (OSError, ValueError) as e:
+            logger.warning("Discarding invalid request: {}", e)
+            return
+        try:
+            if request is None or len(fds) != 3:
+                logger.warning("Discarding request without stdin, stdout and stderr")
+                return
+            exit_code = self._run(request, fds)
+            send_message(connection, {"exit_code": exit_code})
+        except OSError as e:
+            logger.warning("Failed to serve request: {}", e)
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+    def _run(self, request: t.Dict[str, t.Any], fds: t.List[int]) -> int:
+        arguments = request["arguments"]
+        saved_fds = [os.dup(x) for x in range(3)]
+        saved_cwd = os.getcwd()
+        saved_environment = dict(os.environ)
+        saved_argv = sys.argv
+        self._flush()
+        try:
+            os.environ.clear()
+            os.environ.update(request["environment"])
+            os.chdir(request["cwd"])
+            # Clients differ in their PATH, and software may have been installed
+            # since the last request
+            platform_utils.invalidate_platform_facts()
+            # The configuration files to use depend on the working directory
+            self._reload_if_changed()
+            for target, fd in enumerate(fds):
+                os.dup2(fd, target)
+            sys.argv = ["dagos", *arguments]
+            # The console determines the terminal's capabilities upon creation
+            get_console.cache_clear()
+            verbosity = _get_verbosity(arguments)
+            configure_logging(
+                DagosConfiguration().verbosity if verbosity is None else verbosity
+            )
+            return self._invoke(arguments)
+        except (DagosException, OSError) as e:
+            logger.error(e)
+            return 1
+        finally:
+            self._flush()
+            for target, fd in enumerate(saved_fds):
+                os.dup2(fd, target)
+                os.close(fd)
+            os.chdir(saved_cwd)
+            os.environ.clear()
+            os.environ.update(saved_environment)
+            sys.argv = saved_argv
+            get_console.cache_clear()
+            configure_logging(self.verbosity)
+            ScanCache().save()
+            NameIndex().save()
+
+    def _invoke(self, arguments: t.List[str]) -> int:
+        try:
+            dagos_cli.main(args=arguments, prog_name="dagos")
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                return e.code or 0
+            return 1
+        except DagosException as e:
+            logger.error(e)
+            return 1
+        except Exception as e:
+            logger.exception(e)
+            return 1
+        return 0
+
+    def _flush(self) -> None:
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+    def _watch(self) -> None:
+        if self._watcher is not None:
+            self._watcher.close()
+        configuration = DagosConfiguration()
+        self._watcher = create_watcher(
+            configuration.component_search_paths
+            + configuration.environment_search_paths
+        )
+
+    def _reload_if_changed(self) -> None:
+        snapshot = self._take_snapshot()
+        if snapshot != self._snapshot:
+            logger.info("Configuration changed, reloading")
+            self._reload()
+            self._snapshot = snapshot
+            self._watch()
+            return
+
+        changes = self._watcher.changes()
+        if changes:
+            logger.debug("Search paths changed, refreshing {} entries", len(changes))
+            refresh_registries(changes, DagosConfiguration())
+            for group in CommandRegistry.commands.values():
+                if group.name not in dagos_cli.commands:
+                    dagos_cli.add_command(group)
+            NameIndex().update(DagosConfiguration())
+
+    def _reload(self) -> None:
+        for group in CommandRegistry.commands.values():
+            dagos_cli.commands.pop(group.name, None)
+        CommandRegistry.commands.clear()
+        SoftwareComponentScanner.scan_result.clear()
+        EntryPointScanner.scan_result.clear()
+        SoftwareComponentRegistry.components.clear()
+        SoftwareComponentRegistry.loaders.clear()
+        SoftwareEnvironmentRegistry.environments.clear()
+        SoftwareEnvironmentRegistry.handles.clear()
+        SoftwareEnvironmentRegistry.loaders.clear()
+        DagosConfiguration.reset()
+        load_cli(self.verbosity)
+
+    def _take_snapshot(self) -> t.List[t.Any]:
+        """Describe the configuration files of the current working directory by
+        their path, modification time, and size."""
+        return [
+            self._stat(x / ConfigurationScanner.file_name)
+            for x in ConfigurationScanner.get_search_paths()
+        ]
+
+    def _stat(self, path: Path) -> t.Optional[t.Tuple[Path, int, int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (path, stat.st_mtime_ns, stat.st_size)
@@ -1,12 +1,16 @@
+from __future__ import annotations
+
 import logging
+import threading
 import typing as t
 from contextlib import contextmanager
 from enum import Enum
+from functools import lru_cache
 
 from loguru import logger
-from rich.console import Console
-from rich.logging import RichHandler
-from rich.theme import Theme
+
+if t.TYPE_CHECKING:
+    from rich.console import Console
 
 
 class LogLevel(Enum):
@@ -21,18 +25,47 @@ class LogLevel(Enum):
 logging.addLevelName(LogLevel.TRACE.value, LogLevel.TRACE.name)
 logging.addLevelName(LogLevel.SUCCESS.value, LogLevel.SUCCESS.name)
 
-console = Console(
-    theme=Theme(
-        {
-            "logging.level.trace": "gray42",
-            "logging.level.debug": "white",
-            "logging.level.info": "bright_blue",
-            "logging.level.success": "green",
-            "logging.level.warning": "orange1",
-            "logging.level.error": "red",
-        }
+_spinner_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def get_console() -> Console:
+    """Get the console used for all output. Rich is only imported once the console
+    is needed, as importing it takes a considerable share of the startup time.
+    """
+    from rich.console import Console
+    from rich.theme import Theme
+
+    return Console(
+        theme=Theme(
+            {
+                "logging.level.trace": "gray42",
+                "logging.level.debug": "white",
+                "logging.level.info": "bright_blue",
+                "logging.level.success": "green",
+                "logging.level.warning": "orange1",
+                "logging.level.error": "red",
+            }
+        )
     )
-)
+
+
+class _DeferredRichHandler(logging.Handler):
+    """A logging handler that constructs the actual rich handler upon handling the
+    first record, so runs that never log anything never import rich.
+    """
+
+    def __init__(self, **kwargs: t.Any) -> None:
+        super().__init__()
+        self._kwargs = kwargs
+        self._handler = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._handler is None:
+            from rich.logging import RichHandler
+
+            self._handler = RichHandler(console=get_console(), **self._kwargs)
+        self._handler.emit(record)
 
 
 def configure_logging(verbosity: int) -> None:
@@ -49,8 +82,7 @@ def configure_logging(verbosity: int) -> None:
         log_level = LogLevel.TRACE
         log_show_path = True
 
-    handler = RichHandler(
-        console=console,
+    handler = _DeferredRichHandler(
         rich_tracebacks=True,
         show_path=log_show_path,
         show_time=log_show_time,
@@ -58,10 +90,20 @@ def configure_logging(verbosity: int) -> None:
         markup=True,
     )
 
+    def format(record: t.Dict) -> str:
+        # Messages of concurrent deployments and jobs are prefixed with the image
+        # and job they belong to
+        prefix = "/".join(
+            f"{{extra[{x}]}}" for x in ["image", "job"] if x in record["extra"]
+        )
+        if prefix:
+            return f"[bold]{prefix}[/bold] | {log_format}"
+        return log_format
+
     logger.remove()
     # Use function to format log to avoid duplicate exception logging
     # See: https://github.com/Delgan/loguru/issues/592
-    logger.add(handler, format=lambda _: log_format, level=log_level.name)
+    logger.add(handler, format=format, level=log_level.name)
 
 
 @contextmanager
@@ -77,10 +119,19 @@ def spinner(
         success_message (str, optional): An optional success message. Defaults to "".
         log_level (str | LogLevel, optional): The log level to use for the success message. Defaults to INFO.
     """
-    with console.status(message, spinner="material"):
+    # Only a single live display may be active at once, concurrently running jobs
+    # do without a spinner
+    if _spinner_lock.acquire(blocking=False):
+        try:
+            with get_console().status(message, spinner="material"):
+                yield
+        finally:
+            _spinner_lock.release()
+    else:
+        logger.info(message)
         yield
-        if success_message:
-            logger.log(
-                log_level if isinstance(log_level, str) else log_level.name,
-                success_message,
-            )
+    if success_message:
+        logger.log(
+            log_level if isinstance(log_level, str) else log_level.name,
+            success_message,
+        )
@@ -1,16 +1,28 @@
+import codecs
+import os
+import selectors
+import shlex
 import subprocess
+import sys
+import threading
 import typing as t
+import uuid
 from abc import ABC
 from abc import abstractmethod
 
 from loguru import logger
 
 import dagos.containers.buildah as buildah
+from dagos.exceptions import DagosException
 from dagos.logging import LogLevel
 from dagos.platform import platform_utils
 
 
 class CommandRunner(ABC):
+    def __init__(self) -> None:
+        # Whether commands are available, keyed by user and command
+        self._available_commands: t.Dict[t.Tuple[t.Optional[str], str], bool] = {}
+
     @abstractmethod
     def run(
         self,
@@ -34,22 +46,73 @@ class CommandRunner(ABC):
         Returns:
             bool: True, if the command is available, false otherwise.
         """
-        args = {
-            "user": user,
-            "capture_stdout": True,
-            "capture_stderr": True,
-            "ignore_failure": True,
-            "log_level": LogLevel.DEBUG,
-        }
-        # Check that the 'command' executable is on path
-        if self.run("command", **args).returncode == 0:
-            result = self.run(f"command -v {command}", **args)
-        else:
-            result = self.run(f"which {command}", **args)
-        return result.returncode == 0
+        return self.check_commands([command], user)[command]
+
+    def check_commands(
+        self, commands: t.Iterable[str], user: t.Optional[str] = None
+    ) -> t.Dict[str, bool]:
+        """Check which of provided commands are available, probing all commands
+        not checked before in a single shell invocation.
+
+        Results are remembered until `invalidate_commands` is called, e.g., after
+        installing software.
+
+        Args:
+            commands (t.Iterable[str]): The commands to check availability for.
+            user (t.Optional[str], optional): The user[:group] to check for. Defaults to None.
+
+        Returns:
+            t.Dict[str, bool]: Whether each command is available, in order of the
+            provided commands.
+        """
+        commands = list(dict.fromkeys(commands))
+        unknown = [x for x in commands if (user, x) not in self._available_commands]
+        if unknown:
+            for command, available in zip(unknown, self._probe_commands(unknown, user)):
+                self._available_commands[(user, command)] = available
+        return {x: self._available_commands[(user, x)] for x in commands}
+
+    def invalidate_commands(self) -> None:
+        """Forget which commands are available, e.g., after installing software."""
+        self._available_commands.clear()
+
+    def _probe_commands(
+        self, commands: t.List[str], user: t.Optional[str] = None
+    ) -> t.List[bool]:
+        # Each command is looked up using the 'command' builtin, or 'which' for
+        # shells lacking it, and reported on a line of its own
+        script = (
+            'for c in "$@"; do '
+            'if command -v "$c" >/dev/null 2>&1 || which "$c" >/dev/null 2>&1; '
+            "then echo 1; else echo 0; fi; "
+            "done"
+        )
+        result = self.run(
+            ["sh", "-c", script, "sh", *commands],
+            user=user,
+            capture_stdout=True,
+            capture_stderr=True,
+            ignore_failure=True,
+            log_level=LogLevel.DEBUG,
+        )
+        lines = result.stdout.split() if result.returncode == 0 else []
+        if len(lines) != len(commands):
+            logger.debug("Unable to check availability of commands: {}", commands)
+            return [False] * len(commands)
+        return [x == "1" for x in lines]
 
 
 class LocalCommandRunner(CommandRunner):
+    def check_commands(
+        self, commands: t.Iterable[str], user: t.Optional[str] = None
+    ) -> t.Dict[str, bool]:
+        # Local commands are probed without starting a shell, these platform facts
+        # are invalidated after installing software
+        return {x: platform_utils.is_command_available(x) for x in commands}
+
+    def invalidate_commands(self) -> None:
+        platform_utils.invalidate_platform_facts()
+
     def run(
         self,
         command: t.Union[str, t.List[str]],
@@ -75,7 +138,9 @@ class LocalCommandRunner(CommandRunner):
 
 
 class ContainerCommandRunner(CommandRunner):
-    def __init__(self, container: str) -> None:
+    def __init__(self, container: t.Optional[str]) -> None:
+        super().__init__()
+        # The working container may be assigned later, but before running commands
         self.container = container
 
     def run(
@@ -84,6 +149,7 @@ class ContainerCommandRunner(CommandRunner):
         user: t.Optional[str] = None,
         capture_stdout: t.Optional[bool] = False,
         capture_stderr: t.Optional[bool] = False,
+        encoding: t.Optional[str] = "utf-8",
         ignore_failure: t.Optional[bool] = False,
         log_level: t.Optional[LogLevel] = LogLevel.INFO,
     ) -> subprocess.CompletedProcess:
@@ -93,6 +159,222 @@ class ContainerCommandRunner(CommandRunner):
             user=user,
             capture_stdout=capture_stdout,
             capture_stderr=capture_stderr,
+            encoding=encoding,
             ignore_failure=ignore_failure,
             log_level=log_level,
         )
+
+
+class ContainerSessionRunner(ContainerCommandRunner):
+    """Runs commands in a single long-lived shell of the working container,
+    instead of starting a `buildah run` process, which sets up the container
+    anew, for each of them.
+
+    Each command is written to the stdin of the shell, quoted as the argument of
+    a nested shell, followed by printing a unique marker and its exit code to
+    stdout and stderr. Output is read up to these markers, so the streams of
+    each command are captured or forwarded separately. If a command prints
+    nothing for longer than the timeout, the session is killed and the next
+    command starts a new one.
+
+    The session runs one command at a time as the default user. Commands of
+    other users, or issued while the session is busy, e.g., by concurrent jobs,
+    are run by a separate `buildah run` process. Call `close` once done, or
+    after changing the configuration of the container, which only takes effect
+    for shells started afterwards.
+    """
+
+    shell = "sh"
+
+    def __init__(
+        self, container: t.Optional[str], timeout: t.Optional[float] = 1800
+    ) -> None:
+        """
+        Args:
+            container (t.Optional[str]): The working container, which may be
+                assigned later, but before running commands.
+            timeout (t.Optional[float], optional): The seconds to wait for any
+                output of a command, None to wait forever. Defaults to 1800.
+        """
+        super().__init__(container)
+        self.timeout = timeout
+        self._process: t.Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "ContainerSessionRunner":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def run(
+        self,
+        command: t.Union[str, t.List[str]],
+        user: t.Optional[str] = None,
+        capture_stdout: t.Optional[bool] = False,
+        capture_stderr: t.Optional[bool] = False,
+        encoding: t.Optional[str] = "utf-8",
+        ignore_failure: t.Optional[bool] = False,
+        log_level: t.Optional[LogLevel] = LogLevel.INFO,
+    ) -> subprocess.CompletedProcess:
+        if user is not None or not self._lock.acquire(blocking=False):
+            return super().run(
+                command,
+                user,
+                capture_stdout,
+                capture_stderr,
+                encoding,
+                ignore_failure,
+                log_level,
+            )
+        try:
+            if not isinstance(command, str):
+                command = " ".join(shlex.quote(x) for x in command)
+            if log_level is not None:
+                logger.log(log_level.value, "Running command: {}", command)
+            result = self._execute(command, capture_stdout, capture_stderr, encoding)
+        finally:
+            self._lock.release()
+
+        if not ignore_failure and result.returncode != 0:
+            raise DagosException(f"Command failed with code {result.returncode}!")
+        return result
+
+    def close(self) -> None:
+        """End the shell session, if any. The next command starts a new one."""
+        self._end_session(terminate=False)
+
+    def _end_session(self, terminate: bool) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        if terminate:
+            # buildah forwards the signal to the shell of the container
+            process.terminate()
+        # Otherwise the shell exits once its input ends
+        process.stdin.close()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:  # pragma: no cover
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
+
+    def _session_command(self) -> t.List[str]:
+        return ["buildah", "run", self.container, "--", self.shell]
+
+    def _start(self) -> subprocess.Popen:
+        if self._process is not None and self._process.poll() is not None:
+            self.close()
+        if self._process is None:
+            logger.debug("Starting a shell session in container '{}'", self.container)
+            self._process = subprocess.Popen(
+                self._session_command(),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        return self._process
+
+    def _execute(
+        self, command: str, capture_stdout: bool, capture_stderr: bool, encoding: str
+    ) -> subprocess.CompletedProcess:
+        process = self._start()
+        marker = f"dagos-{uuid.uuid4().hex}"
+        # Commands are quoted, so whatever they contain never affects the session,
+        # and must not read the input of the session
+        script = (
+            f"{self.shell} -c {shlex.quote(command)} </dev/null\n"
+            f"printf '%s %d\\n' {marker} $?\n"
+            f"printf '%s\\n' {marker} >&2\n"
+        )
+        try:
+            process.stdin.write(script.encode(encoding))
+            process.stdin.flush()
+        except BrokenPipeError:
+            self.close()
+            raise DagosException(
+                f"The shell session of container '{self.container}' ended unexpectedly"
+            )
+
+        streams = {
+            process.stdout: _SessionStream(
+                marker, capture_stdout, sys.stdout, encoding
+            ),
+            process.stderr: _SessionStream(
+                marker, capture_stderr, sys.stderr, encoding
+            ),
+        }
+        with selectors.DefaultSelector() as selector:
+            for stream in streams.keys():
+                selector.register(stream, selectors.EVENT_READ)
+            while selector.get_map():
+                events = selector.select(self.timeout)
+                if not events:
+                    self._end_session(terminate=True)
+                    raise DagosException(
+                        f"The command printed nothing for {self.timeout} seconds, ended the shell session of container '{self.container}'"
+                    )
+                for key, _ in events:
+                    data = os.read(key.fileobj.fileno(), 65536)
+                    if not data:
+                        self.close()
+                        raise DagosException(
+                            f"The shell session of container '{self.container}' ended unexpectedly"
+                        )
+                    stream = streams[key.fileobj]
+                    stream.feed(data)
+                    if stream.trailer is not None:
+                        selector.unregister(key.fileobj)
+
+        stdout, stderr = streams.values()
+        return subprocess.CompletedProcess(
+            command, int(stdout.trailer), stdout.result(), stderr.result()
+        )
+
+
+class _SessionStream:
+    """An output stream of a command run in a shell session, which ends with a
+    marker followed by a trailer line."""
+
+    def __init__(
+        self, marker: str, capture: bool, forward_to: t.TextIO, encoding: str
+    ) -> None:
+        self.marker = marker.encode()
+        self.capture = capture
+        self.forward_to = forward_to
+        self.decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self.captured: t.List[str] = []
+        self.buffer = b""
+        # The rest of the line following the marker, once read
+        self.trailer: t.Optional[str] = None
+
+    def feed(self, data: bytes) -> None:
+        self.buffer += data
+        index = self.buffer.find(self.marker)
+        if index < 0:
+            # Hold back what may be the beginning of the marker
+            end = max(len(self.buffer) - len(self.marker) + 1, 0)
+        else:
+            end = index
+            line_end = self.buffer.find(b"\n", index)
+            if line_end >= 0:
+                trailer = self.buffer[index + len(self.marker) : line_end]
+                self.trailer = trailer.decode().strip()
+        self._emit(self.buffer[:end])
+        self.buffer = self.buffer[end:]
+
+    def result(self) -> t.Optional[str]:
+        self._emit(b"", final=True)
+        return "".join(self.captured) if self.capture else None
+
+    def _emit(self, data: bytes, final: bool = False) -> None:
+        text = self.decoder.decode(data, final)
+        if not text:
+            return
+        if self.capture:
+            self.captured.append(text)
+        else:
+            self.forward_to.write(text)
+            self.forward_to.flush()
@@ -48,15 +48,12 @@ class PlatformSupportChecker:
         fixable: bool = True,
         fix_instructions: t.Optional[str] = None,
     ) -> PlatformSupportChecker:
-        module_name = module
-        try:
-            import module
-        except ImportError:
+        if not platform_utils.is_module_available(module):
             self.issues.append(
                 PlatformIssue(
                     description
                     if description
-                    else f"Required Python module '{module_name}' is unavailable!",
+                    else f"Required Python module '{module}' is unavailable!",
                     fixable,
                     fix_instructions,
                 )
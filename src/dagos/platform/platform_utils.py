@@ -1,8 +1,11 @@
+import importlib.util
 import os
 import platform
 import shutil
 import subprocess
+import threading
 import typing as t
+from contextlib import contextmanager
 from pathlib import Path
 
 from loguru import logger
@@ -16,8 +19,78 @@ from dagos.exceptions import DagosException
 from dagos.logging import LogLevel
 
 
+# Facts about the current platform, e.g., whether a command is on the PATH, are
+# probed once per process. Anything that changes the platform, e.g., installing
+# software, has to invalidate them.
+_platform_facts: t.Dict[t.Tuple[str, str], t.Any] = {}
+# The facts probed by the current thread while recording, see
+# `record_platform_facts`
+_recording = threading.local()
+
+
+def _get_platform_fact(kind: str, key: str, probe: t.Callable[[], t.Any]) -> t.Any:
+    fact = (kind, key)
+    if fact not in _platform_facts:
+        _platform_facts[fact] = probe()
+    recorded_facts = getattr(_recording, "facts", None)
+    if recorded_facts is not None:
+        recorded_facts[fact] = _platform_facts[fact]
+    return _platform_facts[fact]
+
+
+@contextmanager
+def record_platform_facts() -> t.Iterator[t.Dict[t.Tuple[str, str], t.Any]]:
+    """Record the platform facts probed within the context, e.g., to tell when
+    anything derived from them is outdated, see `platform_facts_hold`.
+
+    Yields:
+        t.Dict[t.Tuple[str, str], t.Any]: The probed facts keyed by their kind
+        and key, which is filled once the context is left.
+    """
+    outer_facts = getattr(_recording, "facts", None)
+    facts: t.Dict[t.Tuple[str, str], t.Any] = {}
+    _recording.facts = facts
+    try:
+        yield facts
+    finally:
+        _recording.facts = outer_facts
+        if outer_facts is not None:
+            outer_facts.update(facts)
+
+
+def platform_facts_hold(facts: t.Iterable[t.Sequence[t.Any]]) -> bool:
+    """Check whether provided platform facts still hold.
+
+    Args:
+        facts (t.Iterable[t.Sequence[t.Any]]): The kind, key, and value of each
+            fact, as recorded by `record_platform_facts`.
+
+    Returns:
+        bool: False, if any fact changed or is of an unknown kind.
+    """
+    probes: t.Dict[str, t.Callable[[str], t.Any]] = {
+        "system": lambda _: get_operating_system(),
+        "command": is_command_available,
+        "module": is_module_available,
+    }
+    return all(
+        kind in probes and probes[kind](key) == value for kind, key, value in facts
+    )
+
+
+def invalidate_platform_facts() -> None:
+    """Forget all probed platform facts, e.g., after installing software."""
+    logger.trace("Invalidating platform facts")
+    _platform_facts.clear()
+
+
+def get_operating_system() -> str:
+    """The name of the current operating system as returned by `platform.system()`."""
+    return _get_platform_fact("system", "", platform.system)
+
+
 def is_operating_system(system: OperatingSystem) -> bool:
-    return True if platform.system() == system.value else False
+    return True if get_operating_system() == system.value else False
 
 
 def assert_windows() -> None:
@@ -31,12 +104,24 @@ def assert_linux() -> None:
 
 
 def assert_operating_system(supported_systems: t.List[OperatingSystem]) -> None:
-    if platform.system() not in [x.value for x in supported_systems]:
+    if get_operating_system() not in [x.value for x in supported_systems]:
         raise UnsupportedOperatingSystemException(supported_systems)
 
 
 def is_command_available(command: str) -> bool:
-    return False if shutil.which(command) is None else True
+    return _get_platform_fact(
+        "command", command, lambda: False if shutil.which(command) is None else True
+    )
+
+
+def is_module_available(module: str) -> bool:
+    def probe() -> bool:
+        try:
+            return importlib.util.find_spec(module) is not None
+        except (ImportError, ValueError):
+            return False
+
+    return _get_platform_fact("module", module, probe)
 
 
 def assert_command_available(command: str) -> None:
@@ -90,7 +175,9 @@ def add_binary_to_path(
     dir_on_path = (
         Path("~/.local/bin") if scope == PlatformScope.USER else Path("/usr/local/bin")
     )
-    return file_utils.create_symlink(dir_on_path / binary_name, binary, force)
+    link = file_utils.create_symlink(dir_on_path / binary_name, binary, force)
+    invalidate_platform_facts()
+    return link
 
 
 def run_command(
@@ -0,0 +1,122 @@
+import functools
+import json
+import os
+import threading
+import time
+import typing as t
+from contextlib import contextmanager
+from pathlib import Path
+
+from loguru import logger
+
+F = t.TypeVar("F", bound=t.Callable[..., t.Any])
+
+
+class Tracer:
+    """A singleton that records nested spans of execution.
+
+    Spans are only recorded once the tracer is enabled, otherwise entering a span
+    costs no more than checking a flag. The recorded spans are written in the
+    Chrome trace event format, which can be viewed as a flame graph, e.g., in
+    chrome://tracing or https://ui.perfetto.dev.
+    """
+
+    __instance = None
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = object.__new__(cls)
+            cls.__instance.enabled = False
+            cls.__instance.events = []
+            cls.__instance._lock = threading.Lock()
+        return cls.__instance
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def clear(self) -> None:
+        self.events = []
+
+    def add_event(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        end: float,
+        args: t.Optional[t.Dict[str, t.Any]] = None,
+    ) -> None:
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = {key: str(value) for key, value in args.items()}
+        with self._lock:
+            self.events.append(event)
+
+    def write(self, path: Path) -> None:
+        """Write all recorded spans to provided file.
+
+        Args:
+            path (Path): The file to write the trace to.
+        """
+        with self._lock:
+            events = list(self.events)
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+        try:
+            path.write_text(json.dumps(trace))
+            logger.debug("Wrote {} trace events to '{}'", len(events), path)
+        except OSError as e:
+            logger.warning("Unable to write trace to '{}': {}", path, e)
+
+
+@contextmanager
+def span(name: str, category: str = "dagos", **args: t.Any) -> t.Iterator[None]:
+    """Record the execution of the wrapped block as a span, if tracing is enabled.
+
+    Args:
+        name (str): The name of the span.
+        category (str, optional): The category of the span. Defaults to "dagos".
+        **args: Additional details shown alongside the span.
+    """
+    tracer = Tracer()
+    if not tracer.enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        tracer.add_event(name, category, start, time.perf_counter(), args)
+
+
+def traced(name: t.Optional[str] = None, category: str = "dagos") -> t.Callable[[F], F]:
+    """Decorate a function to record each of its calls as a span.
+
+    Args:
+        name (str, optional): The name of the span. Defaults to the qualified name
+            of the function.
+        category (str, optional): The category of the span. Defaults to "dagos".
+    """
+
+    def decorator(function: F) -> F:
+        span_name = name if name else function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not Tracer().enabled:
+                return function(*args, **kwargs)
+            with span(span_name, category):
+                return function(*args, **kwargs)
+
+        return t.cast(F, wrapper)
+
+    return decorator
@@ -0,0 +1,29 @@
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+T = t.TypeVar("T")
+R = t.TypeVar("R")
+
+
+def map_concurrently(
+    function: t.Callable[[T], R], items: t.Iterable[T], workers: int = 1
+) -> t.List[R]:
+    """Apply provided function to all items using a pool of threads.
+
+    The results are in the same order as the items, regardless of the order in
+    which they are computed.
+
+    Args:
+        function (t.Callable[[T], R]): The function to apply.
+        items (t.Iterable[T]): The items to apply the function to.
+        workers (int, optional): The maximum number of threads. With a single
+            worker the function is applied in the calling thread. Defaults to 1.
+
+    Returns:
+        t.List[R]: The results of each item.
+    """
+    items = list(items)
+    if workers <= 1 or len(items) <= 1:
+        return [function(x) for x in items]
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as executor:
+        return list(executor.map(function, items))
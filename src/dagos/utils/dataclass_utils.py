@@ -0,0 +1,28 @@
+import dataclasses
+import typing as t
+
+T = t.TypeVar("T")
+
+
+def slotted(cls: t.Type[T]) -> t.Type[T]:
+    """Recreate provided dataclass with `__slots__` for its fields.
+
+    Instances of slotted classes lack a `__dict__`, which considerably reduces
+    their size. Python 3.10 offers `dataclass(slots=True)` to the same effect,
+    which is unavailable for the older versions supported.
+
+    Args:
+        cls (t.Type[T]): The dataclass to recreate. Apply this decorator after,
+            i.e., above, the `dataclass` decorator.
+
+    Returns:
+        t.Type[T]: The slotted dataclass.
+    """
+    names = tuple(x.name for x in dataclasses.fields(cls))
+    namespace = dict(cls.__dict__)
+    namespace["__slots__"] = names
+    # Slots conflict with class attributes of the same name, the defaults of the
+    # fields are kept by the generated __init__
+    for name in (*names, "__dict__", "__weakref__"):
+        namespace.pop(name, None)
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
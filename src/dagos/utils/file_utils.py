@@ -1,17 +1,22 @@
 import atexit
+import hashlib
 import logging
+import os
 import shutil
 import tarfile
 import tempfile
 import typing as t
 import zipfile
+from contextlib import contextmanager
 from pathlib import Path
 
-import requests
 from loguru import logger
 
 from dagos.exceptions import DagosException
 from dagos.logging import spinner
+from dagos.tracing import span
+
+DOWNLOAD_CACHE_VARIABLE = "DAGOS_DOWNLOAD_CACHE"
 
 
 def download_file(url: str) -> Path:
@@ -20,30 +25,102 @@ def download_file(url: str) -> Path:
     If no path is provided the last element in the URL is used to name
     the file and store it in the current working dir.
 
+    If the `DAGOS_DOWNLOAD_CACHE` environment variable names a folder, files
+    are downloaded into it once and copied from there, e.g., by all containers
+    the folder is mounted into.
+
     Args:
         url (str): The URL to download the file from.
 
     Returns:
         Path: The Path of the downloaded file.
     """
-    logging.getLogger("requests").setLevel(logging.WARNING)
-    logging.getLogger("urllib3").setLevel(logging.WARNING)
-
-    logger.debug(f"Sending request to '{url}'")
     # TODO: Sometimes the file name is only evident after following redirects ...
     file_name = url.split("/")[-1]
     path = Path(file_name)
-    with requests.get(url, stream=True) as r:
-        with spinner(
-            f"Downloading '{path.name}' ...",
-            f"Successfully downloaded '{path.name}'",
-            "DEBUG",
-        ):
-            with path.open("wb") as f:
-                shutil.copyfileobj(r.raw, f)
+
+    cache_dir = os.environ.get(DOWNLOAD_CACHE_VARIABLE)
+    if not cache_dir:
+        _download(url, path)
+        return path
+
+    folder = Path(cache_dir) / hashlib.sha256(url.encode()).hexdigest()[:16]
+    folder.mkdir(parents=True, exist_ok=True)
+    cached_file = folder / file_name
+    with _lock_file(folder / ".lock"):
+        if cached_file.exists():
+            logger.debug("Using cached download of '{}'", url)
+        else:
+            partial_file = folder / f"{file_name}.part"
+            _download(url, partial_file)
+            os.replace(partial_file, cached_file)
+    if path.exists():
+        path.unlink()
+    try:
+        os.link(cached_file, path)
+    except OSError:
+        shutil.copyfile(cached_file, path)
     return path
 
 
+@contextmanager
+def _lock_file(path: Path) -> t.Iterator[None]:
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover
+        # Windows lacks fcntl, concurrent downloads are not guarded there
+        yield
+        return
+    with path.open("a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _download(url: str, path: Path) -> None:
+    import requests
+
+    logging.getLogger("requests").setLevel(logging.WARNING)
+    logging.getLogger("urllib3").setLevel(logging.WARNING)
+
+    logger.debug(f"Sending request to '{url}'")
+    try:
+        with span("Download", "deploy", url=url), requests.get(url, stream=True) as r:
+            # Error pages must never end up in place of the file, e.g., cached
+            r.raise_for_status()
+            with spinner(
+                f"Downloading '{path.name}' ...",
+                f"Successfully downloaded '{path.name}'",
+                "DEBUG",
+            ):
+                with path.open("wb") as f:
+                    shutil.copyfileobj(r.raw, f)
+    except BaseException as e:
+        if path.exists():
+            path.unlink()
+        if isinstance(e, requests.RequestException):
+            raise DagosException(f"Failed to download '{url}': {e}")
+        raise
+
+
+def hash_file(path: Path) -> str:
+    """Compute the SHA-256 hash of provided file.
+
+    Args:
+        path (Path): The file to hash.
+
+    Returns:
+        str: The hex digest of the hash.
+    """
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 def extract_archive(
     archive: Path, output_dir: Path, strip_root_folder: bool = False
 ) -> None:
@@ -54,7 +131,9 @@ def extract_archive(
         output_dir (Path): The output folder.
         strip_root_folder (bool, optional): If True, strip the root folder within the archive. Defaults to False.
     """
-    with spinner(f"Extracting '{archive.name}' to '{output_dir.name}' ..."):
+    with span("Extract", "deploy", archive=archive), spinner(
+        f"Extracting '{archive.name}' to '{output_dir.name}' ..."
+    ):
         if tarfile.is_tarfile(archive):
             _extract_tar_archive(archive, output_dir, strip_root_folder)
         elif zipfile.is_zipfile(archive):
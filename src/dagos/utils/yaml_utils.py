@@ -0,0 +1,67 @@
+import typing as t
+from pathlib import Path
+
+import yaml
+
+try:
+    # The loader based on libyaml is considerably faster than the pure Python one
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader  # type: ignore
+
+YamlInput = t.Union[str, bytes, t.IO]
+
+
+def load(content: YamlInput) -> t.Any:
+    """Load the first YAML document from provided content.
+
+    Args:
+        content (str | bytes | IO): The YAML content or a stream providing it.
+
+    Returns:
+        t.Any: The loaded document.
+    """
+    return yaml.load(content, Loader=SafeLoader)
+
+
+def load_all(content: YamlInput) -> t.List[t.Any]:
+    """Load all YAML documents from provided content.
+
+    Args:
+        content (str | bytes | IO): The YAML content or a stream providing it.
+
+    Returns:
+        t.List[t.Any]: The loaded documents.
+    """
+    return list(yaml.load_all(content, Loader=SafeLoader))
+
+
+def load_file(path: Path) -> t.Any:
+    """Load the first YAML document from provided file.
+
+    Args:
+        path (Path): The YAML file.
+
+    Returns:
+        t.Any: The loaded document.
+    """
+    with path.open("rb") as f:
+        return load(f)
+
+
+def load_all_file(path: Path) -> t.List[t.Any]:
+    """Load all YAML documents from provided file.
+
+    Args:
+        path (Path): The YAML file.
+
+    Returns:
+        t.List[t.Any]: The loaded documents.
+    """
+    with path.open("rb") as f:
+        return load_all(f)
+
+
+def is_libyaml_available() -> bool:
+    """Check if YAML is parsed with the libyaml based loader."""
+    return SafeLoader is not yaml.SafeLoader
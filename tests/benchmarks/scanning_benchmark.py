@@ -0,0 +1,296 @@
+"""Benchmarks of scanning search paths, validating files, and starting the CLI.
+
+Synthetic catalogs of software components and environments are generated for
+each size. Half of the components are Python modules, the other half GitHub
+install commands defined in YAML. Results are written as JSON and compared
+against a stored baseline to detect regressions.
+
+Usage:
+    python tests/benchmarks/scanning_benchmark.py [--sizes 10 100] [--save-baseline]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import typing as t
+from pathlib import Path
+
+import dagos
+from dagos.core.commands import CommandRegistry
+from dagos.core.component_scanner import SoftwareComponentScanner
+from dagos.core.components import SoftwareComponentRegistry
+from dagos.core.environments import SoftwareEnvironmentRegistry
+from dagos.core.environments import SoftwareEnvironmentScanner
+from dagos.core.scan_cache import ScanCache
+from dagos.core.validator import Validator
+from dagos.logging import configure_logging
+
+BENCHMARK_DIR = Path(__file__).parent
+DEFAULT_BASELINE = BENCHMARK_DIR / "baseline.json"
+DEFAULT_SIZES = [10, 100, 1_000, 10_000]
+
+PYTHON_COMPONENT = '''from dagos.commands.github import GitHubInstallCommand
+from dagos.core.components import SoftwareComponent
+
+
+class SyntheticSoftwareComponent(SoftwareComponent):
+    """Manage {name}, a synthetic component."""
+
+    def __init__(self) -> None:
+        super().__init__("{name}")
+        self.add_command(InstallSyntheticCommand(self))
+
+
+class InstallSyntheticCommand(GitHubInstallCommand):
+    """Install {name}."""
+
+    def __init__(self, parent: SoftwareComponent) -> None:
+        super().__init__(parent)
+        self.repository = "dag-os/{name}"
+        self.pattern = "{name}*linux*.tar.gz"
+        self.install_dir = "~/software/{name}"
+        self.binary = "{name}"
+'''
+
+YAML_COMMAND = """---
+command:
+  component: "{name}"
+  type: "install"
+  provider: "github"
+  configuration:
+    repository: "https://github.com/dag-os/{name}"
+    pattern: "{name}*Linux_64*.tar.gz"
+    install_dir: "~/software/{name}"
+    binary: "{name}"
+"""
+
+ENVIRONMENT = """environment:
+  name: {name}
+  description: A synthetic environment.
+  platform:
+    packages:
+      - git
+    images:
+      - id: rockylinux
+  components:
+{components}
+"""
+
+
+def generate_catalog(root: Path, size: int) -> Path:
+    """Generate a search path with provided number of software components and a
+    tenth as many environments, each referencing ten components.
+
+    Args:
+        root (Path): The folder to generate the search path in.
+        size (int): The number of software components.
+
+    Returns:
+        Path: The generated search path.
+    """
+    search_path = root / f"catalog-{size}"
+    component_dir = search_path / "components"
+    environment_dir = search_path / "environments"
+    component_dir.mkdir(parents=True)
+    environment_dir.mkdir(parents=True)
+
+    names = [f"component-{i:05d}" for i in range(size)]
+    for index, name in enumerate(names):
+        folder = component_dir / name
+        folder.mkdir()
+        if index % 2 == 0:
+            (folder / "component.py").write_text(PYTHON_COMPONENT.format(name=name))
+        else:
+            (folder / "install.yml").write_text(YAML_COMMAND.format(name=name))
+
+    for index in range(max(1, size // 10)):
+        referenced = names[index * 10 : index * 10 + 10]
+        components = "\n".join(f"    - name: {x}" for x in referenced)
+        (environment_dir / f"environment-{index:05d}.yml").write_text(
+            ENVIRONMENT.format(name=f"environment-{index:05d}", components=components)
+        )
+    return search_path
+
+
+def reset() -> None:
+    """Forget everything registered by previous scans."""
+    SoftwareComponentScanner.scan_result.clear()
+    SoftwareComponentRegistry.components.clear()
+    SoftwareComponentRegistry.loaders.clear()
+    SoftwareEnvironmentRegistry.environments.clear()
+    SoftwareEnvironmentRegistry.handles.clear()
+    SoftwareEnvironmentRegistry.loaders.clear()
+    CommandRegistry.commands.clear()
+
+
+def measure(function: t.Callable[[], t.Any], repeat: int, setup=None) -> float:
+    """Measure the best of several runs of provided function in seconds."""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def benchmark_catalog(search_path: Path, repeat: int) -> t.Dict[str, float]:
+    component_paths = [search_path / "components"]
+    environment_paths = [search_path / "environments"]
+    command_files = sorted(component_paths[0].glob("*/install.yml"))
+    cache = ScanCache()
+
+    def cold_setup() -> None:
+        reset()
+        cache.clear()
+
+    def warm_setup() -> None:
+        reset()
+        SoftwareComponentScanner().scan(component_paths)
+        reset()
+
+    def environment_setup() -> None:
+        reset()
+        SoftwareComponentScanner().scan(component_paths)
+
+    def build_setup() -> None:
+        environment_setup()
+        SoftwareEnvironmentScanner().scan(environment_paths)
+
+    results = {}
+    results["scan_components_cold"] = measure(
+        lambda: SoftwareComponentScanner().scan(component_paths), repeat, cold_setup
+    )
+    results["scan_components_warm"] = measure(
+        lambda: SoftwareComponentScanner().scan(component_paths), repeat, warm_setup
+    )
+    results["scan_environments"] = measure(
+        lambda: SoftwareEnvironmentScanner().scan(environment_paths),
+        repeat,
+        environment_setup,
+    )
+    results["build_environments"] = measure(
+        SoftwareEnvironmentRegistry.load_all, repeat, build_setup
+    )
+    results["validate_commands"] = measure(
+        lambda: Validator().validate_many("command", command_files), repeat
+    )
+    results["cli_help"] = measure(lambda: run_cli_help(search_path), repeat)
+    return results
+
+
+def run_cli_help(search_path: Path) -> None:
+    """Run `dagos --help` in a fresh process using only provided search path."""
+    working_dir = search_path.parent / f"{search_path.name}-cwd"
+    config_file = working_dir / ".dagos-config.yml"
+    if not config_file.exists():
+        working_dir.mkdir(exist_ok=True)
+        config_file.write_text(f'search_paths:\n  - "{search_path}"\n')
+    environment = {
+        **os.environ,
+        "XDG_CACHE_HOME": str(search_path.parent / "cache"),
+    }
+    subprocess.run(
+        [sys.executable, "-m", "dagos", "--no-timer", "--help"],
+        cwd=working_dir,
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        check=True,
+    )
+
+
+def compare(
+    results: t.Dict[str, t.Dict[str, float]],
+    baseline: t.Dict[str, t.Dict[str, float]],
+    tolerance: float,
+    min_difference: float,
+) -> t.List[str]:
+    """Compare results against a baseline. Differences below the minimum are
+    considered noise, which dominates timings of small catalogs.
+
+    Returns:
+        t.List[str]: A description of each regression exceeding the tolerance.
+    """
+    regressions = []
+    for size, timings in results.items():
+        for name, timing in timings.items():
+            expected = baseline.get(size, {}).get(name)
+            if expected is None:
+                continue
+            ratio = timing / expected if expected > 0 else 1
+            print(f"{size:>6} {name:<24} {timing:9.4f}s {ratio:6.2f}x baseline")
+            if ratio > tolerance and timing - expected > min_difference:
+                regressions.append(
+                    f"{name} with {size} components took {timing:.4f}s, "
+                    f"{ratio:.2f} times the baseline of {expected:.4f}s"
+                )
+    return regressions
+
+
+def main(arguments: t.Optional[t.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="Write results to this file.")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.25,
+        help="Allowed ratio to the baseline before a result counts as regression.",
+    )
+    parser.add_argument(
+        "--min-difference",
+        type=float,
+        default=0.05,
+        help="Minimal difference to the baseline in seconds to count as regression.",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store the results as new baseline instead of comparing against it.",
+    )
+    args = parser.parse_args(arguments)
+
+    configure_logging(0)
+    results: t.Dict[str, t.Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        cache = ScanCache()
+        cache.cache_dir = root / "cache"
+        for size in args.sizes:
+            print(f"Benchmarking catalog with {size} components ...")
+            search_path = generate_catalog(root, size)
+            results[str(size)] = benchmark_catalog(search_path, args.repeat)
+
+    report = {
+        "dagos": dagos.__version__,
+        "python": platform.python_version(),
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"Saved baseline to '{args.baseline}'")
+        return 0
+    if not args.baseline.exists():
+        print(json.dumps(report, indent=2))
+        # Without a baseline regressions would go unnoticed
+        print(f"No baseline at '{args.baseline}', run with --save-baseline first")
+        return 1
+
+    baseline = json.loads(args.baseline.read_text())["results"]
+    regressions = compare(results, baseline, args.tolerance, args.min_difference)
+    for regression in regressions:
+        print(f"Regression: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,9 @@ from pathlib import Path
 import pytest
 from _pytest.python import Function
 
+from dagos.core.scan_cache import ScanCache
+from dagos.platform import platform_utils
+
 pytest_plugins = [
     "tests.bdd.steps.given_steps",
     "tests.bdd.steps.when_steps",
@@ -24,3 +27,20 @@ def pytest_collection_modifyitems(items):
     tests.
     """
     items.sort(key=by_fspath, reverse=True)
+
+
+@pytest.fixture(autouse=True)
+def scan_cache(tmp_path: Path) -> ScanCache:
+    """Keep the scan cache of each test isolated from the user's cache."""
+    cache = ScanCache()
+    cache.cache_dir = tmp_path / "cache"
+    cache.clear()
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def platform_facts():
+    """Probe the platform anew in each test as tests may mock it."""
+    platform_utils.invalidate_platform_facts()
+    yield
+    platform_utils.invalidate_platform_facts()
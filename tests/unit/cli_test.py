@@ -0,0 +1,152 @@
+import os
+import re
+import subprocess
+import sys
+import typing as t
+from pathlib import Path
+
+import pytest
+
+import dagos
+from dagos.cli import _get_trace_file
+
+# Modules that are expensive to import and not required to print the version.
+DEFERRED_MODULES = [
+    "rich",
+    "rich_click",
+    "yamale",
+    "jsonschema",
+    "yaml",
+    "requests",
+    "packaging",
+    "dagos.commands.list_command",
+    "dagos.commands.cache_command",
+    "dagos.commands.daemon_command",
+    "dagos.commands.env",
+    "dagos.commands.wsl",
+    "dagos.containers.wheelhouse",
+]
+# Upper limit of the cumulative import time of the CLI in microseconds, well
+# below the 470 ms it took to import all commands eagerly.
+IMPORT_BUDGET = 300_000
+
+
+@pytest.fixture(scope="module")
+def import_times() -> t.Dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "dagos", "--version"],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0
+    assert result.stdout.strip() == f"dagos version {dagos.__version__}"
+
+    import_times = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s+(\S+)", line)
+        if match:
+            import_times[match.group(2)] = int(match.group(1))
+    return import_times
+
+
+@pytest.mark.parametrize("module", DEFERRED_MODULES)
+def test_version_does_not_import(import_times: t.Dict[str, int], module: str):
+    assert module not in import_times
+
+
+def test_version_import_budget(import_times: t.Dict[str, int]):
+    assert import_times["dagos.cli"] < IMPORT_BUDGET
+
+
+@pytest.mark.parametrize(
+    "arguments,expected",
+    [
+        (["--trace", "trace.json", "list"], Path("trace.json")),
+        (["-v", "--trace=trace.json", "list"], Path("trace.json")),
+        (["list", "--trace", "trace.json"], None),
+        (["--trace"], None),
+        ([], None),
+    ],
+)
+def test_get_trace_file(arguments: t.List[str], expected: t.Optional[Path]):
+    assert _get_trace_file(arguments) == expected
+
+
+COMPONENT = """from pathlib import Path
+
+from dagos.core.components import SoftwareComponent
+
+Path("{marker}").touch()
+
+
+class MarkerSoftwareComponent(SoftwareComponent):
+    def __init__(self) -> None:
+        super().__init__("marker")
+"""
+
+COMMAND = """---
+command:
+  component: "marker"
+  type: "install"
+  provider: "github"
+  configuration:
+    repository: "https://github.com/dag-os/marker"
+    pattern: "marker*Linux_64*.tar.gz"
+    install_dir: "~/software/marker"
+"""
+
+ENVIRONMENT = """environment:
+  name: marked
+  platform:
+    images:
+      - id: rockylinux
+  components:
+    - name: marker
+"""
+
+
+def _complete(tmp_path: Path, *words: str) -> t.List[str]:
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; sys.argv[0] = 'dagos'; "
+            "from dagos.daemon.client import main; main()",
+        ],
+        cwd=tmp_path,
+        env={
+            **os.environ,
+            "XDG_CACHE_HOME": str(tmp_path / "cache"),
+            "_DAGOS_COMPLETE": "bash_complete",
+            "COMP_WORDS": " ".join(["dagos", *words]),
+            "COMP_CWORD": str(len(words)),
+        },
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout.splitlines()
+
+
+def test_completion_uses_name_index(tmp_path: Path):
+    search_path = tmp_path / "dagos"
+    component = search_path / "components" / "marker"
+    component.mkdir(parents=True)
+    (component / "component.py").write_text(
+        COMPONENT.format(marker=tmp_path / "marker")
+    )
+    (component / "install.yml").write_text(COMMAND)
+    (search_path / "environments").mkdir()
+    (search_path / "environments" / "marked.yml").write_text(ENVIRONMENT)
+    (tmp_path / ".dagos-config.yml").write_text(f'search_paths:\n  - "{search_path}"\n')
+
+    # Without a name index everything is scanned
+    assert "plain,marker" in _complete(tmp_path, "install", "")
+    assert (tmp_path / "marker").exists()
+
+    (tmp_path / "marker").unlink()
+    (tmp_path / "cache" / "dagos" / "scan-index.json").unlink()
+    assert "plain,marker" in _complete(tmp_path, "install", "")
+    assert "plain,marked" in _complete(tmp_path, "env", "deploy", "")
+    assert not (tmp_path / "marker").exists()
+    assert not (tmp_path / "cache" / "dagos" / "scan-index.json").exists()
@@ -0,0 +1,22 @@
+import socket
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from dagos.commands.cache_command import cache
+from dagos.core.name_index import NameIndex
+from dagos.core.scan_cache import ScanCache
+
+
+def test_clear_removes_all_cached_files(mocker, tmp_path: Path):
+    mocker.patch.object(ScanCache(), "cache_dir", tmp_path)
+    for file in [ScanCache().path, NameIndex().path]:
+        file.write_text("{}")
+    (tmp_path / "wheels" / "dagos-0.1.2").mkdir(parents=True)
+    with socket.socket(socket.AF_UNIX) as daemon_socket:
+        daemon_socket.bind(str(tmp_path / "daemon.sock"))
+
+        result = CliRunner().invoke(cache, ["clear"])
+
+    assert result.exit_code == 0
+    assert [x.name for x in tmp_path.iterdir()] == ["daemon.sock"]
@@ -0,0 +1,169 @@
+import typing as t
+from pathlib import Path
+
+import pytest
+
+import dagos.commands.env.deploy as deploy
+import dagos.containers.buildah as buildah
+from dagos.commands.env.deploy import _get_images
+from dagos.commands.env.deploy import _image_name
+from dagos.commands.env.deploy import _install_packages
+from dagos.commands.env.deploy import _install_packages_and_components
+from dagos.core.components import SoftwareComponent
+from dagos.core.components import SoftwareComponentRegistry
+from dagos.core.environments import Image
+from dagos.core.environments import Packages
+from dagos.core.environments import Platform
+from dagos.core.environments import SoftwareEnvironment
+from dagos.core.ledger import DeploymentLedger
+from dagos.core.scheduler import Scheduler
+from dagos.exceptions import DagosException
+from dagos.platform import ContainerSessionRunner
+
+
+@pytest.fixture
+def scheduler(mocker) -> Scheduler:
+    mocker.patch.object(SoftwareComponentRegistry, "components", {})
+    scheduler = Scheduler()
+    mocker.patch.object(scheduler, "run")
+    return scheduler
+
+
+def _plan(
+    scheduler: Scheduler, packages: t.List[Packages], requires: t.Dict[str, t.List]
+) -> t.List[t.List[str]]:
+    components = [SoftwareComponent(x, requires=y) for x, y in requires.items()]
+    _install_packages_and_components(
+        None, packages, components, lambda _: None, scheduler
+    )
+    return scheduler.plan()
+
+
+def test_plans_components_after_packages_and_requirements(scheduler: Scheduler):
+    packages = [Packages(["git"], "dnf"), Packages(["java"], "sdk")]
+
+    levels = _plan(
+        scheduler,
+        packages,
+        {"app": ["vale"], "vale": [], "sdkman": ["curl"], "curl": []},
+    )
+
+    assert levels == [
+        ["packages (dnf)"],
+        ["curl"],
+        ["sdkman"],
+        ["packages (sdk)"],
+        ["vale"],
+        ["app"],
+    ]
+
+
+def test_plans_independent_components_in_one_level(scheduler: Scheduler):
+    levels = _plan(
+        scheduler, [Packages(["git"], "dnf")], {"dive": [], "vale": [], "app": ["dnf"]}
+    )
+
+    assert levels == [["packages (dnf)"], ["dive", "vale", "app"]]
+
+
+def test_rejects_unknown_requirements(scheduler: Scheduler):
+    with pytest.raises(DagosException, match="requires 'pip'"):
+        _plan(scheduler, [Packages(["git"], "dnf")], {"app": ["pip"]})
+
+
+def test_rejects_cyclic_requirements(scheduler: Scheduler):
+    with pytest.raises(DagosException, match="vale -> app -> vale"):
+        _plan(scheduler, [], {"vale": ["app"], "app": ["vale"]})
+
+
+def test_installs_packages_missing_from_ledger(mocker, tmp_path):
+    command_runner = mocker.Mock()
+    ledger = DeploymentLedger("basic", state_dir=tmp_path)
+    ledger.record_packages("dnf", ["git"])
+
+    _install_packages(command_runner, "dnf", Packages(["git", "zip"], "dnf"), ledger)
+    _install_packages(command_runner, "dnf", Packages(["git", "zip"], "dnf"), ledger)
+
+    command_runner.run.assert_any_call("dnf install -y zip")
+    assert command_runner.run.call_count == 2
+    assert set(ledger.packages["dnf"].keys()) == {"git", "zip"}
+
+
+def test_selects_images_to_deploy_to():
+    ubi = Image("registry.access.redhat.com/ubi8/ubi:8.5", [Packages(["git"])])
+    fedora = Image("fedora", [])
+    environment = SoftwareEnvironment(
+        Path("basic.yml"), "basic", None, Platform([], [], [ubi, fedora]), []
+    )
+
+    assert _get_images((), False, environment) == [ubi]
+    assert _get_images((), True, environment) == [ubi, fedora]
+    assert _get_images((ubi.id, "alpine"), False, environment) == [
+        ubi,
+        Image("alpine", []),
+    ]
+    assert _image_name("basic", ubi) == "basic-ubi-8-5"
+
+
+@pytest.fixture
+def container_deploy(mocker, tmp_path) -> SoftwareEnvironment:
+    mocker.patch.object(deploy, "default_cache_dir", return_value=tmp_path)
+    for function in ["create_container", "config", "copy", "commit", "rm", "tag"]:
+        mocker.patch.object(buildah, function)
+    mocker.patch.object(ContainerSessionRunner, "run")
+    mocker.patch.object(
+        ContainerSessionRunner,
+        "_probe_commands",
+        side_effect=lambda commands, user: [True] * len(commands),
+    )
+    return SoftwareEnvironment(
+        Path("basic.yml"), "basic", None, Platform([], [], []), []
+    )
+
+
+def test_installs_distributions_of_components_without_folders(
+    container_deploy: SoftwareEnvironment, mocker, tmp_path
+):
+    mocker.patch.object(deploy, "_install_distribution")
+    vale = SoftwareComponent("vale", folders=[tmp_path / "vale"])
+    plugin = SoftwareComponent("plugin")
+
+    deploy._deploy_to_container(
+        container_deploy, [vale, plugin], Image("fedora", []), Scheduler()
+    )
+
+    buildah.copy.assert_called_once()
+    assert buildah.copy.call_args[0][1] == tmp_path / "vale"
+    deploy._install_distribution.assert_called_once_with(
+        buildah.create_container.return_value, plugin
+    )
+
+
+def test_tags_last_layer_as_environment_image(
+    container_deploy: SoftwareEnvironment, mocker
+):
+    mocker.patch.object(buildah, "image_id", return_value=None)
+    mocker.patch.object(buildah, "image_exists", return_value=False)
+    buildah.commit.return_value = "layer"
+
+    deploy._deploy_to_container(
+        container_deploy, [], Image("fedora", []), Scheduler(), layers=True
+    )
+
+    buildah.tag.assert_called_once_with("layer", "basic")
+
+
+def test_probes_commands_once_per_container_change(
+    container_deploy: SoftwareEnvironment, tmp_path
+):
+    container_deploy.platform.packages.append(Packages(["git"], "system", None))
+    components = [
+        SoftwareComponent(x, folders=[tmp_path / x]) for x in ["vale", "dive", "git"]
+    ]
+
+    deploy._deploy_to_container(
+        container_deploy, components, Image("fedora", []), Scheduler()
+    )
+
+    # The package manager is selected, and dagos probed once packages changed
+    assert ContainerSessionRunner._probe_commands.call_count == 2
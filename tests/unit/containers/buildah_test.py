@@ -275,3 +275,17 @@ def test_check_command_which(mocker):
             ),
         ],
     )
+
+
+@pytest.mark.parametrize(
+    "returncode,stdout,expectation",
+    [(0, "sha256:abc\n", "sha256:abc"), (125, "", None)],
+)
+def test_image_id(mocker, returncode, stdout, expectation):
+    mocker.patch(
+        "dagos.platform.platform_utils.run_command",
+        return_value=subprocess.CompletedProcess("cmd", returncode, stdout=stdout),
+    )
+
+    assert buildah.image_id("alpine") == expectation
+    assert buildah.image_exists("alpine") == (expectation is not None)
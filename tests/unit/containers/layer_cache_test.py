@@ -0,0 +1,93 @@
+import typing as t
+
+import pytest
+
+import dagos.containers.buildah as buildah
+import dagos.containers.wheelhouse as wheelhouse
+from dagos.containers.layer_cache import LayeredScheduler
+from dagos.exceptions import DagosException
+from dagos.platform import ContainerCommandRunner
+
+
+@pytest.fixture
+def images(mocker) -> t.Set[str]:
+    images = set()
+    mocker.patch.object(buildah, "image_id", side_effect=lambda x: x in images or None)
+    mocker.patch.object(buildah, "create_container", return_value="working-container")
+
+    def commit(container: str, image_name: str) -> str:
+        images.add(image_name)
+        return image_name
+
+    mocker.patch.object(buildah, "commit", side_effect=commit)
+    return images
+
+
+def _deploy(log: t.List[str], inputs: t.Dict[str, str]) -> LayeredScheduler:
+    command_runner = ContainerCommandRunner(None)
+    scheduler = LayeredScheduler("rockylinux", command_runner)
+    previous = []
+    for name, value in inputs.items():
+        scheduler.add(name, lambda x=name: log.append(x), previous, value)
+        previous = [name]
+    scheduler.run()
+    assert command_runner.container == "working-container"
+    return scheduler
+
+
+def test_reuses_longest_cached_prefix(images: t.Set[str]):
+    log = []
+    first = _deploy(log, {"config": "a", "packages": "b", "vale": "c"})
+    assert log == ["config", "packages", "vale"]
+    assert len(images) == 3
+    buildah.create_container.assert_called_with("rockylinux", volumes=None)
+    packages_image = buildah.commit.call_args_list[1][0][1]
+
+    log.clear()
+    second = _deploy(log, {"config": "a", "packages": "b", "vale": "changed"})
+
+    assert log == ["vale"]
+    buildah.create_container.assert_called_with(packages_image, volumes=None)
+    assert second.image != first.image
+    assert len(images) == 4
+
+
+def test_changed_step_invalidates_later_steps(images: t.Set[str]):
+    _deploy([], {"config": "a", "packages": "b", "vale": "c"})
+
+    log = []
+    _deploy(log, {"config": "a", "packages": "changed", "vale": "c"})
+
+    assert log == ["packages", "vale"]
+
+
+def test_fully_cached_deployment_runs_nothing(images: t.Set[str]):
+    first = _deploy([], {"config": "a", "vale": "c"})
+
+    log = []
+    second = _deploy(log, {"config": "a", "vale": "c"})
+
+    assert log == []
+    assert second.image == first.image
+    buildah.create_container.assert_called_with(first.image, volumes=None)
+
+
+def test_changed_dagos_invalidates_all_steps(images: t.Set[str], mocker):
+    _deploy([], {"config": "a", "vale": "c"})
+    mocker.patch.object(wheelhouse, "wheelhouse_key", return_value="0.1.2-changed")
+
+    log = []
+    _deploy(log, {"config": "a", "vale": "c"})
+
+    assert log == ["config", "vale"]
+
+
+def test_failing_step_stops_deployment(images: t.Set[str]):
+    scheduler = LayeredScheduler("rockylinux", ContainerCommandRunner(None))
+    scheduler.add("config", lambda: None, inputs="a")
+    scheduler.add("vale", lambda: 1 / 0, ["config"], "c")
+
+    with pytest.raises(DagosException, match="'vale' failed"):
+        scheduler.run()
+
+    assert len(images) == 1
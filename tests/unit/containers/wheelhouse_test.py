@@ -0,0 +1,95 @@
+import subprocess
+import typing as t
+from pathlib import Path
+
+import pytest
+
+import dagos.containers.buildah as buildah
+import dagos.containers.wheelhouse as wheelhouse
+from dagos.exceptions import DagosException
+
+
+def _pip_wheel(command: t.List[str], **kwargs) -> None:
+    wheel_dir = Path(command[command.index("--wheel-dir") + 1])
+    (wheel_dir / "dagos-0.1.2-py3-none-any.whl").touch()
+
+
+def test_builds_wheelhouse_once(tmp_path, mocker):
+    run_command = mocker.patch.object(
+        wheelhouse.platform_utils, "run_command", side_effect=_pip_wheel
+    )
+
+    first = wheelhouse.build_wheelhouse(tmp_path)
+    second = wheelhouse.build_wheelhouse(tmp_path)
+
+    assert run_command.call_count == 1
+    assert first == second
+    assert [x.name for x in first.iterdir()] == ["dagos-0.1.2-py3-none-any.whl"]
+
+
+def test_does_not_keep_failed_builds(tmp_path, mocker):
+    mocker.patch.object(
+        wheelhouse.platform_utils,
+        "run_command",
+        side_effect=DagosException("Command failed with code 1!"),
+    )
+
+    with pytest.raises(DagosException, match="Failed to build wheels"):
+        wheelhouse.build_wheelhouse(tmp_path)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+class _Distribution:
+    metadata = {"Name": "dagos-pack"}
+    version = "1.0.0"
+
+    def __init__(self, direct_url: t.Optional[str]) -> None:
+        self.direct_url = direct_url
+
+    def read_text(self, file_name: str) -> t.Optional[str]:
+        return self.direct_url if file_name == "direct_url.json" else None
+
+
+@pytest.mark.parametrize(
+    "direct_url,requirement",
+    [
+        (None, "dagos-pack==1.0.0"),
+        ('{"url": "file:///src/pack", "dir_info": {}}', "/src/pack"),
+        (
+            '{"url": "https://example.com/pack.git", "vcs_info": {"vcs": "git", "commit_id": "abc"}}',
+            "dagos-pack @ git+https://example.com/pack.git@abc",
+        ),
+    ],
+)
+def test_builds_wheelhouse_of_distribution(
+    tmp_path, mocker, direct_url: t.Optional[str], requirement: str
+):
+    run_command = mocker.patch.object(
+        wheelhouse.platform_utils, "run_command", side_effect=_pip_wheel
+    )
+
+    result = wheelhouse.build_distribution_wheelhouse(
+        _Distribution(direct_url), tmp_path
+    )
+
+    assert run_command.call_args[0][0][-1] == requirement
+    assert result.name.startswith("dagos-pack-1.0.0-")
+
+
+@pytest.mark.parametrize("offline_code", [0, 1])
+def test_installs_dagos_offline_if_possible(mocker, offline_code: int):
+    def run(container: str, command: str, **kwargs) -> subprocess.CompletedProcess:
+        code = offline_code if "--no-index" in command else 0
+        return subprocess.CompletedProcess(command, code)
+
+    mocker.patch.object(buildah, "copy")
+    mocker.patch.object(buildah, "run", side_effect=run)
+
+    wheelhouse.install_dagos("container", Path("wheels"))
+
+    commands = [x[0][1] for x in buildah.run.call_args_list]
+    installs = [x for x in commands if "pip install" in x]
+    assert len(installs) == (1 if offline_code == 0 else 2)
+    assert installs[0].endswith("--no-index")
+    assert commands[-1] == f"rm -rf {wheelhouse.CONTAINER_WHEELHOUSE}/wheels"
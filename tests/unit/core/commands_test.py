@@ -0,0 +1,75 @@
+from unittest.mock import Mock
+
+import click
+from click.testing import CliRunner
+
+from dagos.core.commands import LazyGroup
+
+
+def build_group(loader: Mock) -> LazyGroup:
+    group = LazyGroup(name="install")
+    group.add_lazy_command("dive", loader, help="Install dive.")
+    return group
+
+
+def test_list_lazy_command_without_loading():
+    loader = Mock()
+    group = build_group(loader)
+
+    result = CliRunner().invoke(group, ["--help"])
+
+    assert result.exit_code == 0
+    assert "dive" in result.output
+    assert "Install dive." in result.output
+    loader.assert_not_called()
+
+
+def test_invoke_lazy_command():
+    callback = Mock()
+    loader = Mock(return_value=click.Command(name="dive", callback=callback))
+    group = build_group(loader)
+
+    result = CliRunner().invoke(group, ["dive"])
+
+    assert result.exit_code == 0
+    loader.assert_called_once()
+    callback.assert_called_once()
+    assert "dive" not in group.lazy_commands
+
+
+def test_invoke_lazy_command_registering_itself():
+    callback = Mock()
+    group = LazyGroup(name="install")
+    group.add_lazy_command(
+        "dive",
+        lambda: group.add_command(click.Command(name="dive", callback=callback)),
+    )
+
+    result = CliRunner().invoke(group, ["dive"])
+
+    assert result.exit_code == 0
+    callback.assert_called_once()
+
+
+def test_eager_command_replaces_lazy_command():
+    loader = Mock()
+    group = build_group(loader)
+
+    group.add_command(click.Command(name="dive"))
+
+    assert "dive" not in group.lazy_commands
+    assert group.list_commands(click.Context(group)) == ["dive"]
+
+
+def test_complete_lazy_command_without_loading():
+    loader = Mock()
+    group = build_group(loader)
+    group.add_command(click.Command(name="git", short_help="Install git."))
+
+    items = group.shell_complete(click.Context(group), "")
+
+    assert [(x.value, x.help) for x in items if x.type == "plain"] == [
+        ("dive", "Install dive."),
+        ("git", "Install git."),
+    ]
+    loader.assert_not_called()
@@ -0,0 +1,172 @@
+import types
+import typing as t
+from pathlib import Path
+
+import pytest
+
+from dagos.core.commands import CommandRegistry
+from dagos.core.component_scanner import SoftwareComponentScanner
+from dagos.core.components import ComponentFiles
+from dagos.core.components import SoftwareComponentRegistry
+from dagos.platform import platform_utils
+
+COMMAND = """---
+command:
+  component: "vale"
+  type: "install"
+  provider: "github"
+  configuration:
+    repository: "https://github.com/errata-ai/vale"
+    pattern: "vale*Linux_64*.tar.gz"
+    install_dir: "~/software/vale"
+    binary: "vale"
+"""
+
+
+@pytest.mark.parametrize(
+    "content,kind",
+    [
+        (COMMAND, "command"),
+        ("# A comment\n" + COMMAND.replace("---\n", ""), "command"),
+        ("key: value\n", "unknown"),
+        ("", "unknown"),
+    ],
+)
+def test_load_yaml_file_reads_once(mocker, tmp_path: Path, content: str, kind: str):
+    file = tmp_path / "install.yml"
+    file.write_text(content)
+    read_bytes = mocker.spy(Path, "read_bytes")
+    read_text = mocker.spy(Path, "read_text")
+
+    data = SoftwareComponentScanner()._load_yaml_file(file)
+
+    assert data["kind"] == kind
+    read_bytes.assert_called_once()
+    read_text.assert_not_called()
+
+
+def _create_search_path(path: Path, components: t.List[str]) -> Path:
+    for component in components:
+        folder = path / component
+        folder.mkdir(parents=True)
+        (folder / "install.yml").write_text(COMMAND.replace("vale", component))
+    return path
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_scan_merges_in_order_of_search_paths(mocker, tmp_path: Path, workers: int):
+    mocker.patch.object(SoftwareComponentScanner, "scan_result", {})
+    first = _create_search_path(tmp_path / "first" / "components", ["b", "a"])
+    second = _create_search_path(tmp_path / "second" / "components", ["c", "a"])
+
+    scanner = SoftwareComponentScanner()
+    scanner.scan([first, second], workers)
+
+    assert list(scanner.scan_result.keys()) == ["a", "b", "c"]
+    assert scanner.scan_result["a"].folders == [first / "a", second / "a"]
+    assert scanner.scan_result["a"].files == [
+        first / "a" / "install.yml",
+        second / "a" / "install.yml",
+    ]
+
+
+def test_component_files_are_relative_to_first_folder(tmp_path: Path):
+    first = tmp_path / "first" / "vale"
+    second = tmp_path / "second" / "vale"
+
+    paths = ComponentFiles()
+    paths.add(first, [first / "install.yml", first / "config" / "vale.ini"])
+    paths.add(second, [second / "install.yml"])
+
+    assert paths.root == first
+    assert paths._files[:2] == ("install.yml", str(Path("config") / "vale.ini"))
+    assert paths.folders == [first, second]
+    assert paths.files == [
+        first / "install.yml",
+        first / "config" / "vale.ini",
+        second / "install.yml",
+    ]
+
+
+def test_commands_declare_requirements_of_component(mocker, tmp_path: Path):
+    mocker.patch.object(SoftwareComponentScanner, "scan_result", {})
+    mocker.patch.object(SoftwareComponentRegistry, "components", {})
+    mocker.patch.object(SoftwareComponentRegistry, "loaders", {})
+    mocker.patch.object(CommandRegistry, "commands", {})
+    folder = tmp_path / "components" / "vale"
+    folder.mkdir(parents=True)
+    (folder / "install.yml").write_text(COMMAND + "  requires:\n    - pip\n")
+
+    SoftwareComponentScanner().scan([tmp_path / "components"])
+
+    assert SoftwareComponentRegistry.find_component("vale").requires == ["pip"]
+
+
+PLATFORM_DEPENDENT_COMPONENT = """from dagos.core.components import SoftwareComponent
+from dagos.platform import PlatformSupportChecker
+
+
+class ToolSoftwareComponent(SoftwareComponent):
+    def __init__(self) -> None:
+        super().__init__("tool")
+
+    def supports_platform(self):
+        return (
+            PlatformSupportChecker()
+            .check_command_is_available("dagos-tool", fixable=False)
+            .issues
+        )
+"""
+
+
+def test_cached_components_are_loaded_once_platform_changes(mocker, tmp_path: Path):
+    folder = tmp_path / "components" / "tool"
+    folder.mkdir(parents=True)
+    (folder / "tool.py").write_text(PLATFORM_DEPENDENT_COMPONENT)
+    which = mocker.patch("shutil.which", return_value=None)
+
+    def scan() -> SoftwareComponentScanner:
+        platform_utils.invalidate_platform_facts()
+        mocker.patch.object(SoftwareComponentScanner, "scan_result", {})
+        mocker.patch.object(SoftwareComponentRegistry, "components", {})
+        mocker.patch.object(SoftwareComponentRegistry, "loaders", {})
+        mocker.patch.object(CommandRegistry, "commands", {})
+        scanner = SoftwareComponentScanner()
+        scanner.scan([tmp_path / "components"])
+        return scanner
+
+    scan()
+    assert "MANAGE" not in CommandRegistry.commands
+
+    # The cached description is used as long as the platform is unchanged
+    assert not scan().scan_result["tool"].loaded
+    assert "MANAGE" not in CommandRegistry.commands
+
+    which.return_value = "/usr/bin/dagos-tool"
+    assert scan().scan_result["tool"].loaded
+    assert "tool" in CommandRegistry.commands["MANAGE"].commands
+
+
+def test_components_failing_to_import_are_not_cached(mocker, tmp_path: Path):
+    folder = tmp_path / "components" / "tool"
+    folder.mkdir(parents=True)
+    (folder / "tool.py").write_text(
+        "import dagos_missing_module\n" + PLATFORM_DEPENDENT_COMPONENT
+    )
+
+    def scan() -> SoftwareComponentScanner:
+        mocker.patch.object(SoftwareComponentScanner, "scan_result", {})
+        mocker.patch.object(SoftwareComponentRegistry, "components", {})
+        mocker.patch.object(SoftwareComponentRegistry, "loaders", {})
+        mocker.patch.object(CommandRegistry, "commands", {})
+        scanner = SoftwareComponentScanner()
+        scanner.scan([tmp_path / "components"])
+        return scanner
+
+    assert scan().scan_result["tool"].component is None
+
+    # Installing the module leaves the files of the component unchanged
+    mocker.patch.dict(
+        "sys.modules", {"dagos_missing_module": types.ModuleType("dagos_missing")}
+    )
+    assert scan().scan_result["tool"].component is not None
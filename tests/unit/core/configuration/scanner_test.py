@@ -46,3 +46,13 @@ def test_load_multiple_configurations(test_data_dir: Path):
     assert not isinstance(
         instance.configuration._environment_search_paths, DefaultPlaceholder
     )
+
+
+def test_load_scan_workers(tmp_path: Path):
+    config_file = tmp_path / ".dagos-config.yml"
+    config_file.write_text("scan_workers: 8\n")
+
+    instance = ConfigurationScanner()
+    instance.load_configuration(config_file)
+
+    assert instance.configuration.scan_workers == 8
@@ -0,0 +1,156 @@
+import sys
+import typing as t
+from pathlib import Path
+
+import pytest
+
+from dagos.core.commands import CommandRegistry
+from dagos.core.components import SoftwareComponentRegistry
+from dagos.core.entry_point_scanner import EntryPointScanner
+
+COMPONENT = '''from dagos.commands.github import GitHubInstallCommand
+from dagos.core.components import SoftwareComponent
+
+
+class ValeSoftwareComponent(SoftwareComponent):
+    """Manage vale, a linter for prose."""
+
+    def __init__(self) -> None:
+        super().__init__("vale")
+        self.add_command(InstallValeCommand(self))
+
+
+class InstallValeCommand(GitHubInstallCommand):
+    """Install vale."""
+
+    def __init__(self, parent: SoftwareComponent) -> None:
+        super().__init__(parent)
+        self.repository = "errata-ai/vale"
+        self.pattern = "vale*Linux_64*.tar.gz"
+        self.install_dir = "~/software/vale"
+        self.binary = "vale"
+'''
+
+MANIFEST = """components:
+  - name: vale
+    description: Manage vale, a linter for prose.
+    commands:
+      install: Install vale.
+    platform:
+      operating_systems:
+        - {operating_system}
+"""
+
+
+@pytest.fixture
+def registries(mocker):
+    mocker.patch.object(EntryPointScanner, "scan_result", {})
+    mocker.patch.object(SoftwareComponentRegistry, "components", {})
+    mocker.patch.object(SoftwareComponentRegistry, "loaders", {})
+    mocker.patch.object(CommandRegistry, "commands", {})
+    mocker.patch(
+        "dagos.platform.platform_utils.get_operating_system", return_value="Linux"
+    )
+
+
+@pytest.fixture
+def install_distribution(monkeypatch, tmp_path: Path):
+    def install(manifest: t.Optional[str]) -> None:
+        package = tmp_path / "dagos_pack"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        (package / "vale.py").write_text(COMPONENT)
+        if manifest is not None:
+            (package / "dagos-components.yml").write_text(manifest)
+        dist_info = tmp_path / "dagos_pack-1.0.0.dist-info"
+        dist_info.mkdir()
+        (dist_info / "METADATA").write_text(
+            "Metadata-Version: 2.1\nName: dagos-pack\nVersion: 1.0.0\n"
+        )
+        (dist_info / "entry_points.txt").write_text(
+            "[dagos.components]\nvale = dagos_pack.vale:ValeSoftwareComponent\n"
+        )
+        monkeypatch.syspath_prepend(str(tmp_path))
+
+    yield install
+    for module in [x for x in sys.modules if x.startswith("dagos_pack")]:
+        del sys.modules[module]
+
+
+def test_scan_defers_loading_described_components(registries, install_distribution):
+    install_distribution(MANIFEST.format(operating_system="Linux"))
+
+    EntryPointScanner().scan()
+
+    assert "dagos_pack.vale" not in sys.modules
+    assert CommandRegistry.commands["INSTALL"].lazy_commands["vale"][1] == {
+        "help": "Install vale.",
+        "short_help": None,
+    }
+    assert "vale" in CommandRegistry.commands["MANAGE"].lazy_commands
+
+    component = SoftwareComponentRegistry.find_component("vale")
+
+    assert component.name == "vale"
+    assert "dagos_pack.vale" in sys.modules
+    assert "vale" in CommandRegistry.commands["INSTALL"].commands
+
+
+def test_scan_loads_undescribed_components(registries, install_distribution):
+    install_distribution(None)
+
+    EntryPointScanner().scan()
+
+    assert "dagos_pack.vale" in sys.modules
+    assert "vale" in SoftwareComponentRegistry.components
+    assert "vale" in CommandRegistry.commands["MANAGE"].commands
+
+
+def test_scan_hides_manage_group_on_unsupported_platform(
+    registries, install_distribution
+):
+    install_distribution(MANIFEST.format(operating_system="Windows"))
+
+    EntryPointScanner().scan()
+
+    assert "vale" in CommandRegistry.commands["INSTALL"].lazy_commands
+    assert "MANAGE" not in CommandRegistry.commands
+
+
+@pytest.mark.parametrize(
+    "requirement",
+    ["commands:\n        - dagos-missing", "modules:\n        - dagos_missing"],
+)
+def test_scan_hides_manage_group_without_required_software(
+    registries, install_distribution, requirement: str
+):
+    install_distribution(
+        MANIFEST.format(operating_system="Linux") + f"      {requirement}\n"
+    )
+
+    EntryPointScanner().scan()
+
+    assert "vale" in CommandRegistry.commands["INSTALL"].lazy_commands
+    assert "MANAGE" not in CommandRegistry.commands
+
+
+def test_scan_ignores_components_of_search_paths(registries, install_distribution):
+    install_distribution(MANIFEST.format(operating_system="Linux"))
+    loader = lambda: None
+    SoftwareComponentRegistry.add_loader("vale", loader)
+
+    EntryPointScanner().scan()
+
+    assert EntryPointScanner.scan_result == {}
+    assert SoftwareComponentRegistry.loaders["vale"] is loader
+
+
+def test_find_distribution_of_entry_point(registries, install_distribution):
+    install_distribution(MANIFEST.format(operating_system="Linux"))
+
+    EntryPointScanner().scan()
+
+    assert EntryPointScanner().find_distribution("vale").metadata["Name"] == (
+        "dagos-pack"
+    )
+    assert EntryPointScanner().find_distribution("does-not-exist") is None
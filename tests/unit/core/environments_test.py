@@ -1,7 +1,11 @@
 from pathlib import Path
 
+from dagos.core.environments import environment_scanner
 from dagos.core.environments import SoftwareEnvironmentBuilder
 from dagos.core.environments import SoftwareEnvironmentRegistry
+from dagos.core.environments import SoftwareEnvironmentScanner
+from dagos.core.validator import Validator
+from dagos.exceptions import ValidationException
 
 
 def test_constructor_with_basic_env(test_data_dir: Path):
@@ -24,3 +28,74 @@ def test_constructor_with_basic_env(test_data_dir: Path):
     assert result.components[0].purpose == "Lint some documents."
 
     assert SoftwareEnvironmentRegistry.find_environment("basic") == result
+
+
+def test_environments_are_compact(test_data_dir: Path):
+    file = test_data_dir.joinpath("environments/basic.yml")
+
+    first = SoftwareEnvironmentBuilder.from_file(file)
+    second = SoftwareEnvironmentBuilder.from_file(file)
+
+    assert not hasattr(first, "__dict__")
+    assert not hasattr(first.platform, "__dict__")
+    assert not hasattr(first.platform.images[0].packages[0], "__dict__")
+    assert not hasattr(first.components[0], "__dict__")
+    first_packages = first.platform.images[0].packages[0].package_list
+    second_packages = second.platform.images[0].packages[0].package_list
+    assert first_packages[0] is second_packages[0]
+
+
+def test_registry_keeps_first_environment_with_name(
+    test_data_dir: Path, tmp_path: Path
+):
+    file = test_data_dir.joinpath("environments/basic.yml")
+    first = SoftwareEnvironmentBuilder.from_file(file)
+    reloaded = SoftwareEnvironmentBuilder.from_file(file)
+
+    duplicate = tmp_path / "basic.yml"
+    duplicate.write_bytes(file.read_bytes())
+    SoftwareEnvironmentBuilder.from_file(duplicate)
+
+    assert first != reloaded
+    assert SoftwareEnvironmentRegistry.find_environment("basic") == reloaded
+    assert SoftwareEnvironmentRegistry.environments["basic"].path == file
+
+
+def test_scan_defers_building_environments(mocker, test_data_dir: Path):
+    mocker.patch.object(SoftwareEnvironmentRegistry, "environments", {})
+    mocker.patch.object(SoftwareEnvironmentRegistry, "handles", {})
+    mocker.patch.object(SoftwareEnvironmentRegistry, "loaders", {})
+    from_data = mocker.spy(SoftwareEnvironmentBuilder, "from_data")
+    validate = mocker.spy(Validator, "validate_environment")
+    search_path = test_data_dir / "environments"
+
+    SoftwareEnvironmentScanner().scan([search_path])
+
+    handle = SoftwareEnvironmentRegistry.handles["basic"]
+    assert handle.path == search_path / "basic.yml"
+    assert SoftwareEnvironmentRegistry.environments == {}
+    from_data.assert_not_called()
+    validate.assert_not_called()
+
+    environment = SoftwareEnvironmentRegistry.find_environment("basic")
+
+    assert environment.path == handle.path
+    assert "basic" not in SoftwareEnvironmentRegistry.loaders
+    from_data.assert_called_once()
+
+
+def test_keeps_validation_error_of_invalid_environment(
+    mocker, tmp_path: Path, test_data_dir: Path
+):
+    mocker.patch.object(SoftwareEnvironmentRegistry, "environments", {})
+    mocker.patch.object(SoftwareEnvironmentRegistry, "handles", {})
+    mocker.patch.object(SoftwareEnvironmentRegistry, "loaders", {})
+    error = mocker.patch.object(environment_scanner.logger, "error")
+    (tmp_path / "invalid.yml").write_text("environment:\n  name: invalid\n")
+
+    SoftwareEnvironmentScanner().scan([tmp_path])
+
+    assert SoftwareEnvironmentRegistry.find_environment("invalid") is None
+    handle = SoftwareEnvironmentRegistry.handles["invalid"]
+    assert isinstance(handle.error, ValidationException)
+    error.assert_called_once_with(handle.error)
@@ -0,0 +1,101 @@
+from pathlib import Path
+
+import pytest
+
+from dagos.core.commands import InstallCommand
+from dagos.core.components import SoftwareComponent
+from dagos.core.components import SoftwareComponentRegistry
+from dagos.core.ledger import default_state_dir
+from dagos.core.ledger import DeploymentLedger
+from dagos.core.ledger import fingerprint
+from dagos.core.package_managers import PackageManager
+
+
+class InstallTestCommand(InstallCommand):
+    def execute(self) -> None:
+        pass
+
+
+@pytest.fixture
+def component(mocker, tmp_path: Path) -> SoftwareComponent:
+    mocker.patch.object(SoftwareComponentRegistry, "components", {})
+    folder = tmp_path / "components" / "vale"
+    folder.mkdir(parents=True)
+    (folder / "install.yml").write_text("command: {}\n")
+    component = SoftwareComponent("vale", [folder], [folder / "install.yml"])
+    command = InstallTestCommand(component)
+    command.resolved_version = "v2.20.0"
+    command.installed_paths = [tmp_path / "software" / "vale"]
+    command.installed_paths[0].mkdir(parents=True)
+    component.add_command(command)
+    return component
+
+
+def test_default_state_dir_honors_xdg(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("XDG_STATE_HOME", str(tmp_path))
+
+    assert default_state_dir() == tmp_path / "dagos"
+
+
+def test_records_components_across_deployments(tmp_path: Path, component):
+    DeploymentLedger("writing", state_dir=tmp_path).record_component(component, "1.0")
+
+    ledger = DeploymentLedger("writing", state_dir=tmp_path)
+
+    assert ledger.is_deployed(component, "1.0")
+    assert not ledger.is_deployed(component, "2.0")
+    assert ledger.components["vale"]["resolved_version"] == "v2.20.0"
+    assert not DeploymentLedger("writing", True, state_dir=tmp_path).is_deployed(
+        component, "1.0"
+    )
+
+
+def test_changed_definition_invalidates_record(tmp_path: Path, component):
+    ledger = DeploymentLedger("writing", state_dir=tmp_path)
+    ledger.record_component(component)
+
+    component.files[0].write_text("command: {}\n# changed\n")
+
+    assert not ledger.is_deployed(component)
+
+
+def test_verification_checks_installed_paths(tmp_path: Path, component):
+    DeploymentLedger("writing", state_dir=tmp_path).record_component(component)
+    ledger = DeploymentLedger("writing", verify=True, state_dir=tmp_path)
+
+    assert ledger.is_deployed(component)
+
+    (tmp_path / "software" / "vale").rmdir()
+
+    assert not ledger.is_deployed(component)
+
+
+def test_finds_packages_missing_from_record(mocker, tmp_path: Path):
+    DeploymentLedger("writing", state_dir=tmp_path).record_packages(
+        "dnf", ["git", "unzip"]
+    )
+    package_manager = mocker.Mock(spec=PackageManager)
+    package_manager.find_missing.return_value = ["unzip"]
+
+    ledger = DeploymentLedger("writing", state_dir=tmp_path)
+    verifying_ledger = DeploymentLedger("writing", verify=True, state_dir=tmp_path)
+
+    assert ledger.find_missing_packages("dnf", ["git", "unzip", "zip"]) == ["zip"]
+    assert verifying_ledger.find_missing_packages(
+        "dnf", ["git", "unzip", "zip"], package_manager
+    ) == ["unzip", "zip"]
+    package_manager.find_missing.assert_called_once_with(["git", "unzip"], None)
+
+
+def test_fingerprint_covers_subfolders_of_component(tmp_path: Path):
+    folder = tmp_path / "vale"
+    (folder / "templates").mkdir(parents=True)
+    (folder / "install.yml").write_text("command: {}\n")
+    (folder / "templates" / "vale.ini").write_text("StylesPath = styles\n")
+    component = SoftwareComponent("vale", folders=[folder])
+    component.files = [folder / "install.yml"]
+
+    before = fingerprint(component)
+    (folder / "templates" / "vale.ini").write_text("StylesPath = other\n")
+
+    assert fingerprint(component) != before
@@ -0,0 +1,102 @@
+import os
+from pathlib import Path
+
+import pytest
+
+import dagos.core.name_index as name_index
+from dagos.core.commands import CommandRegistry
+from dagos.core.commands import CommandType
+from dagos.core.configuration import ConfigurationScanner
+from dagos.core.configuration import DagosConfiguration
+from dagos.core.environments import SoftwareEnvironmentRegistry
+from dagos.core.name_index import NameIndex
+
+
+@pytest.fixture
+def search_path(mocker, tmp_path: Path) -> Path:
+    search_path = tmp_path / "search-path"
+    (search_path / "components" / "dive").mkdir(parents=True)
+    (search_path / "components" / "dive" / "component.yml").write_text("")
+    mocker.patch.object(
+        ConfigurationScanner, "get_search_paths", return_value=[tmp_path]
+    )
+    mocker.patch.object(CommandRegistry, "commands", {})
+    mocker.patch.object(SoftwareEnvironmentRegistry, "environments", {})
+    mocker.patch.object(SoftwareEnvironmentRegistry, "handles", {})
+    mocker.patch.object(SoftwareEnvironmentRegistry, "loaders", {})
+    mocker.patch.object(name_index, "describe_entry_points", return_value=[])
+    CommandRegistry.add_lazy_command(
+        CommandType.INSTALL, "dive", lambda: None, help="Install dive."
+    )
+    return search_path
+
+
+@pytest.fixture
+def configuration(mocker, search_path: Path) -> DagosConfiguration:
+    configuration = mocker.Mock(spec=DagosConfiguration)
+    configuration.component_search_paths = [search_path / "components"]
+    configuration.environment_search_paths = [search_path / "environments"]
+    return configuration
+
+
+def test_load_saved_index(configuration: DagosConfiguration):
+    index = NameIndex()
+    index.update(configuration)
+    index.save()
+    index._names = {}
+
+    assert index.load()
+    assert index.commands == {"INSTALL": {"dive": "Install dive."}}
+    assert index.environments == []
+
+
+def test_save_only_changed_index(mocker, configuration: DagosConfiguration):
+    index = NameIndex()
+    index.update(configuration)
+    index.save()
+    replace = mocker.patch("os.replace")
+
+    index.update(configuration)
+    index.save()
+
+    replace.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda path: (path / "components" / "git").mkdir(),
+        lambda path: (path / "components" / "dive" / "dive.py").write_text(""),
+        lambda path: os.utime(
+            path / "components" / "dive" / "component.yml", ns=(0, 0)
+        ),
+        lambda path: (path / "environments").mkdir(),
+        lambda path: (path.parent / ConfigurationScanner.file_name).write_text(""),
+    ],
+)
+def test_outdated_index_is_not_loaded(
+    search_path: Path, configuration: DagosConfiguration, change
+):
+    index = NameIndex()
+    index.update(configuration)
+    index.save()
+
+    change(search_path)
+
+    assert not index.load()
+
+
+def test_index_is_outdated_once_entry_points_change(
+    mocker, configuration: DagosConfiguration
+):
+    index = NameIndex()
+    index.update(configuration)
+    index.save()
+
+    mocker.patch.object(
+        name_index,
+        "describe_entry_points",
+        return_value=["dive = dagos_pack.dive:Dive (1.0.0)"],
+    )
+
+    assert not index.load()
@@ -0,0 +1,67 @@
+import subprocess
+import typing as t
+
+import pytest
+
+from dagos.core.package_managers import PackageManagerRegistry
+from dagos.core.package_managers import Pip
+from dagos.platform import CommandRunner
+
+
+def _pip_show(installed: t.Dict[str, str]) -> t.Callable:
+    def run(command: str, **kwargs) -> subprocess.CompletedProcess:
+        name = command.split()[-1]
+        if name not in installed:
+            return subprocess.CompletedProcess(command, 1, "", "")
+        return subprocess.CompletedProcess(
+            command, 0, f"Name: {name}\nVersion: {installed[name]}\n", ""
+        )
+
+    return run
+
+
+@pytest.mark.parametrize(
+    "package,missing",
+    [
+        ("rich", False),
+        ("rich==12.2.0", False),
+        ("rich[jupyter]>=12.2,<13", False),
+        ("rich~=12.1", False),
+        ("rich~=12.2.1", True),
+        ("rich==12.*", False),
+        ("rich!=12.2.0", True),
+        ("rich>12.2", True),
+        ("rich==12.3.0", True),
+        ("rich>=12; python_version >= '3.7'", False),
+        ("rich>=13; python_version < '3'", False),
+        ("rich===12.2.0", False),
+        ("rich>=12.2.0rc1", False),
+        ("rich<12.2.0.post1", False),
+        ("rich==12.2.0+cpu", True),
+        ("rich:12", True),
+        ("rich @ https://example.com/rich.whl", False),
+        ("yamale==4.0.3", True),
+    ],
+)
+def test_pip_compares_installed_versions(mocker, package: str, missing: bool):
+    # Constructing a package manager registers it
+    mocker.patch.object(PackageManagerRegistry, "managers", {})
+    command_runner = mocker.Mock(spec=CommandRunner)
+    command_runner.run.side_effect = _pip_show({"rich": "12.2.0"})
+
+    result = Pip().find_missing([package], command_runner)
+
+    assert result == ([package] if missing else [])
+    for call in command_runner.run.call_args_list:
+        assert call[0][0] in ["pip show rich", "pip show yamale"]
+
+
+@pytest.mark.parametrize("installed,missing", [("2.0.0rc1", False), ("1.9", True)])
+def test_pip_compares_pre_releases(mocker, installed: str, missing: bool):
+    mocker.patch.object(PackageManagerRegistry, "managers", {})
+    command_runner = mocker.Mock(spec=CommandRunner)
+    command_runner.run.side_effect = _pip_show({"rich": installed})
+
+    result = Pip().find_missing(["rich>=2.0.0a1"], command_runner)
+
+    assert result == (["rich>=2.0.0a1"] if missing else [])
@@ -0,0 +1,103 @@
+import json
+import os
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from dagos.core.scan_cache import ScanCache
+
+
+@pytest.fixture
+def file(tmp_path: Path) -> Path:
+    file = tmp_path / "file.yml"
+    file.write_text("key: value\n")
+    return file
+
+
+def test_get_or_load_indexes_data(scan_cache: ScanCache, file: Path):
+    loader = Mock(return_value={"key": "value"})
+
+    first = scan_cache.get_or_load(file, loader)
+    second = scan_cache.get_or_load(file, loader)
+
+    assert first == second == {"key": "value"}
+    loader.assert_called_once_with(file.read_bytes())
+
+
+def test_get_or_load_reloads_changed_file(scan_cache: ScanCache, file: Path):
+    loader = Mock(side_effect=[{"key": "value"}, {"key": "other value"}])
+    scan_cache.get_or_load(file, loader)
+
+    file.write_text("key: other value\n")
+
+    assert scan_cache.get_or_load(file, loader) == {"key": "other value"}
+    assert loader.call_count == 2
+
+
+def test_get_or_load_ignores_touched_file(scan_cache: ScanCache, file: Path):
+    loader = Mock(return_value={"key": "value"})
+    scan_cache.get_or_load(file, loader)
+
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert scan_cache.get_or_load(file, loader) == {"key": "value"}
+    loader.assert_called_once()
+
+
+def test_get_or_load_does_not_index_failures(scan_cache: ScanCache, file: Path):
+    loader = Mock(side_effect=[ValueError(), {"key": "value"}])
+
+    with pytest.raises(ValueError):
+        scan_cache.get_or_load(file, loader)
+
+    assert scan_cache.get_or_load(file, loader) == {"key": "value"}
+
+
+def test_get_or_load_missing_file(scan_cache: ScanCache, tmp_path: Path):
+    loader = Mock(return_value=None)
+
+    scan_cache.get_or_load(tmp_path / "does_not_exist", loader)
+
+    loader.assert_called_once_with(None)
+    assert len(scan_cache.files) == 0
+
+
+def test_save_and_read(scan_cache: ScanCache, file: Path):
+    scan_cache.get_or_load(file, lambda content: {"key": "value"})
+    scan_cache.save()
+
+    scan_cache._index = None
+
+    assert scan_cache.path.exists()
+    assert scan_cache.get_or_load(file, Mock()) == {"key": "value"}
+
+
+def test_read_discards_other_versions(scan_cache: ScanCache, file: Path):
+    scan_cache.cache_dir.mkdir(parents=True)
+    scan_cache.path.write_text(
+        json.dumps({"version": "0.0.0", "files": {str(file): {}}})
+    )
+    scan_cache._index = None
+
+    assert len(scan_cache.files) == 0
+
+
+def test_clear(scan_cache: ScanCache, file: Path):
+    scan_cache.get_or_load(file, lambda content: {"key": "value"})
+    scan_cache.save()
+
+    scan_cache.clear()
+
+    assert not scan_cache.path.exists()
+    assert len(scan_cache.files) == 0
+
+
+def test_get_component(scan_cache: ScanCache):
+    fingerprint = [["file.py", 1, 2]]
+    scan_cache.put_component("dive", fingerprint, {"name": "dive"})
+
+    assert scan_cache.get_component("dive", fingerprint) == {"name": "dive"}
+    assert scan_cache.get_component("dive", [["file.py", 3, 2]]) is None
+    assert scan_cache.get_component("unknown", fingerprint) is None
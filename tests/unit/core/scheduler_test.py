@@ -0,0 +1,95 @@
+import threading
+import typing as t
+
+import pytest
+
+from dagos.core.scheduler import Scheduler
+from dagos.exceptions import DagosException
+
+
+def _record(log: t.List[str], name: str) -> t.Callable[[], None]:
+    return lambda: log.append(name)
+
+
+def _fail() -> None:
+    raise DagosException("Command failed with code 1!")
+
+
+def test_runs_jobs_after_their_requirements():
+    log = []
+    scheduler = Scheduler()
+    scheduler.add("c", _record(log, "c"), ["b"])
+    scheduler.add("a", _record(log, "a"))
+    scheduler.add("b", _record(log, "b"), ["a"])
+
+    scheduler.run()
+
+    assert log == ["a", "b", "c"]
+
+
+def test_runs_independent_jobs_concurrently():
+    # Both jobs only pass the barrier if they run at the same time
+    barrier = threading.Barrier(2, timeout=5)
+    log = []
+    scheduler = Scheduler(workers=2)
+    scheduler.add("a", lambda: barrier.wait())
+    scheduler.add("b", lambda: barrier.wait())
+    scheduler.add("c", _record(log, "c"), ["a", "b"])
+
+    scheduler.run()
+
+    assert log == ["c"]
+
+
+def test_stops_after_failure():
+    log = []
+    scheduler = Scheduler()
+    scheduler.add("a", _fail)
+    scheduler.add("b", _record(log, "b"))
+
+    with pytest.raises(DagosException, match="1 of 2 jobs failed: a"):
+        scheduler.run()
+
+    assert log == []
+
+
+def test_keeps_going_with_independent_jobs():
+    log = []
+    scheduler = Scheduler(keep_going=True)
+    scheduler.add("a", _fail)
+    scheduler.add("b", _record(log, "b"), ["a"])
+    scheduler.add("c", _record(log, "c"), ["b"])
+    scheduler.add("d", _record(log, "d"))
+
+    with pytest.raises(DagosException, match="Skipped 2 jobs: b, c"):
+        scheduler.run()
+
+    assert log == ["d"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_rejects_jobs_requiring_each_other(workers: int):
+    scheduler = Scheduler(workers)
+    scheduler.add("a", lambda: None, ["b"])
+    scheduler.add("b", lambda: None, ["a"])
+
+    with pytest.raises(DagosException, match="require each other: a -> b -> a"):
+        scheduler.run()
+
+
+def test_plans_levels_of_independent_jobs():
+    scheduler = Scheduler()
+    scheduler.add("d", lambda: None, ["b", "c"])
+    scheduler.add("c", lambda: None)
+    scheduler.add("b", lambda: None, ["a"])
+    scheduler.add("a", lambda: None)
+
+    assert scheduler.plan() == [["c", "a"], ["b"], ["d"]]
+
+
+def test_rejects_unknown_requirements():
+    scheduler = Scheduler()
+    scheduler.add("a", lambda: None, ["b"])
+
+    with pytest.raises(DagosException, match="unknown jobs: b"):
+        scheduler.run()
@@ -5,6 +5,7 @@ import pytest
 
 from dagos.core.validator import Validator
 from dagos.exceptions import ValidationException
+from dagos.utils import yaml_utils
 
 
 @contextmanager
@@ -40,3 +41,38 @@ def test_validate_environment(test_data_dir: Path, file, expectation):
     with expectation:
         result = Validator().validate_environment(environment)
         assert len(result.keys()) > 0
+
+
+def test_validate_many(test_data_dir: Path):
+    valid = test_data_dir.joinpath("config/basic.yml")
+    invalid = test_data_dir.joinpath("config/invalid-values.yml")
+
+    results = Validator().validate_many("configuration", [valid, invalid])
+
+    assert results[valid]["verbosity"] == 1
+    assert isinstance(results[invalid], ValidationException)
+
+
+def test_schema_is_compiled_once(mocker, test_data_dir: Path):
+    mocker.patch.dict(Validator.compiled_schemas, clear=True)
+    load_all_file = mocker.spy(yaml_utils, "load_all_file")
+    files = [
+        test_data_dir.joinpath("config/basic.yml"),
+        test_data_dir.joinpath("config/another.yml"),
+    ]
+
+    Validator().validate_many("configuration", files)
+    Validator().validate_configuration(files[0])
+
+    schema_path = Validator.schemas["configuration"]
+    assert load_all_file.call_args_list.count(mocker.call(schema_path)) == 1
+
+
+def test_validate_provided_content(mocker, tmp_path: Path):
+    config = tmp_path / "config.yml"
+    read_bytes = mocker.spy(Path, "read_bytes")
+
+    result = Validator().validate_configuration(config, b"verbosity: 2\n")
+
+    assert result == {"verbosity": 2}
+    read_bytes.assert_not_called()
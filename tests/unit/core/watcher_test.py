@@ -0,0 +1,151 @@
+import typing as t
+from pathlib import Path
+
+import pytest
+
+from dagos.core.commands import CommandRegistry
+from dagos.core.component_scanner import SoftwareComponentScanner
+from dagos.core.components import SoftwareComponentRegistry
+from dagos.core.configuration import DagosConfiguration
+from dagos.core.environments import SoftwareEnvironmentRegistry
+from dagos.core.watcher import create_watcher
+from dagos.core.watcher import InotifyWatcher
+from dagos.core.watcher import PollingWatcher
+from dagos.core.watcher import refresh_registries
+from dagos.core.watcher import SearchPathWatcher
+
+COMMAND = """---
+command:
+  component: "{name}"
+  type: "install"
+  provider: "github"
+  configuration:
+    repository: "https://github.com/dag-os/{name}"
+    pattern: "{name}*Linux_64*.tar.gz"
+    install_dir: "~/software/{name}"
+    binary: "{name}"
+"""
+
+ENVIRONMENT = """environment:
+  name: {name}
+  description: An environment.
+  platform:
+    images:
+      - id: rockylinux
+  components:
+    - name: {component}
+"""
+
+
+def _inotify_watcher(search_paths: t.List[Path]) -> SearchPathWatcher:
+    try:
+        return InotifyWatcher(search_paths)
+    except OSError as e:
+        pytest.skip(f"inotify is unavailable: {e}")
+
+
+@pytest.fixture(params=[PollingWatcher, _inotify_watcher])
+def watcher_type(request) -> t.Callable[[t.List[Path]], SearchPathWatcher]:
+    return request.param
+
+
+@pytest.fixture
+def registries(mocker):
+    mocker.patch.object(SoftwareComponentScanner, "scan_result", {})
+    mocker.patch.object(SoftwareComponentRegistry, "components", {})
+    mocker.patch.object(SoftwareComponentRegistry, "loaders", {})
+    mocker.patch.object(SoftwareEnvironmentRegistry, "environments", {})
+    mocker.patch.object(SoftwareEnvironmentRegistry, "handles", {})
+    mocker.patch.object(SoftwareEnvironmentRegistry, "loaders", {})
+    mocker.patch.object(CommandRegistry, "commands", {})
+
+
+def _add_component(search_path: Path, name: str) -> Path:
+    folder = search_path / name
+    folder.mkdir(parents=True, exist_ok=True)
+    (folder / "install.yml").write_text(COMMAND.format(name=name))
+    return folder
+
+
+def test_watcher_reports_changed_entries(tmp_path: Path, watcher_type):
+    search_path = tmp_path / "components"
+    existing = _add_component(search_path, "existing")
+    removed = _add_component(search_path, "removed")
+
+    with watcher_type([search_path]) as watcher:
+        assert watcher.changes() == set()
+
+        (existing / "install.yml").write_text("command: {}\n")
+        added = _add_component(search_path, "added")
+        (removed / "install.yml").unlink()
+        removed.rmdir()
+        assert watcher.changes() == {existing, added, removed}
+
+        (added / "extra.yml").write_text("command: {}\n")
+        assert watcher.changes() == {added}
+        assert watcher.changes() == set()
+
+
+def test_watcher_picks_up_created_search_path(tmp_path: Path, watcher_type):
+    search_path = tmp_path / "environments"
+
+    with watcher_type([search_path]) as watcher:
+        assert watcher.changes() == set()
+        search_path.mkdir()
+        (search_path / "environment.yml").write_text("environment: {}\n")
+        assert watcher.changes() == {search_path / "environment.yml"}
+
+
+def test_create_watcher_falls_back_to_polling(mocker, tmp_path: Path):
+    mocker.patch.object(InotifyWatcher, "__init__", side_effect=OSError("no inotify"))
+
+    assert isinstance(create_watcher([tmp_path]), PollingWatcher)
+
+
+def test_refresh_adds_replaces_and_removes_components(tmp_path: Path, registries):
+    search_path = tmp_path / "components"
+    _add_component(search_path, "kept")
+    removed = _add_component(search_path, "removed")
+    scanner = SoftwareComponentScanner()
+    scanner.scan([search_path])
+
+    (removed / "install.yml").unlink()
+    _add_component(search_path, "added")
+    refreshed = scanner.refresh([search_path], ["removed", "added"])
+
+    assert refreshed == {"removed", "added"}
+    assert list(SoftwareComponentRegistry.components.keys()) == ["kept", "added"]
+    assert set(CommandRegistry.commands["INSTALL"].list_commands(None)) == {
+        "kept",
+        "added",
+    }
+
+
+def test_refresh_registries_reloads_referring_environments(
+    mocker, tmp_path: Path, registries
+):
+    component_path = tmp_path / "components"
+    environment_path = tmp_path / "environments"
+    environment_path.mkdir()
+    folder = _add_component(component_path, "vale")
+    file = environment_path / "environment.yml"
+    file.write_text(ENVIRONMENT.format(name="writing", component="vale"))
+    configuration = mocker.Mock(spec=DagosConfiguration)
+    configuration.component_search_paths = [component_path]
+    configuration.environment_search_paths = [environment_path]
+    refresh_registries([folder, file], configuration)
+    previous = SoftwareComponentRegistry.find_component("vale")
+
+    (folder / "install.yml").write_text(COMMAND.format(name="vale") + "\n")
+    refresh_registries([folder], configuration)
+
+    environment = SoftwareEnvironmentRegistry.find_environment("writing")
+    current = SoftwareComponentRegistry.find_component("vale")
+    assert current is not previous
+    assert environment.components[0].software_component is current
+
+    file.unlink()
+    refresh_registries([file], configuration)
+
+    assert SoftwareEnvironmentRegistry.environments == {}
+    assert SoftwareEnvironmentRegistry.handles == {}
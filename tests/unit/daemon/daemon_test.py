@@ -0,0 +1,157 @@
+import os
+import subprocess
+import sys
+import time
+import typing as t
+from pathlib import Path
+
+import pytest
+
+import dagos
+from dagos.daemon import client
+
+
+@pytest.fixture
+def daemon(tmp_path: Path):
+    socket_path = tmp_path / "daemon.sock"
+    (tmp_path / "dagos" / "components").mkdir(parents=True)
+    (tmp_path / ".dagos-config.yml").write_text(
+        f'search_paths:\n  - "{tmp_path / "dagos"}"\n'
+    )
+    environment = {**os.environ, "XDG_CACHE_HOME": str(tmp_path / "cache")}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "dagos", "daemon", "--socket", str(socket_path)],
+        cwd=tmp_path,
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while not socket_path.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    yield socket_path
+    process.terminate()
+    process.wait(timeout=10)
+
+
+def _run_client(
+    socket_path: Path,
+    *arguments: str,
+    cwd: t.Optional[Path] = None,
+    path: t.Optional[str] = None,
+) -> subprocess.CompletedProcess:
+    environment = {**os.environ, "DAGOS_DAEMON_SOCKET": str(socket_path)}
+    if path is not None:
+        environment["PATH"] = path
+    return subprocess.run(
+        [sys.executable, "-m", "dagos", *arguments],
+        # The configuration depends on the working directory of the client
+        cwd=socket_path.parent if cwd is None else cwd,
+        env=environment,
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_forward_invocation(daemon: Path):
+    result = _run_client(daemon, "--version")
+
+    assert result.returncode == 0
+    assert result.stdout.strip() == f"dagos version {dagos.__version__}"
+
+
+def test_forward_failing_invocation(daemon: Path):
+    result = _run_client(daemon, "--no-timer", "does-not-exist")
+
+    assert result.returncode == 2
+    assert "No such command" in result.stderr
+
+
+def _write_component(components_dir: Path) -> None:
+    component = components_dir / "vale"
+    component.mkdir(parents=True)
+    (component / "install.yml").write_text(
+        """---
+command:
+  component: "vale"
+  type: "install"
+  provider: "github"
+  configuration:
+    repository: "https://github.com/errata-ai/vale"
+    pattern: "vale*Linux_64*.tar.gz"
+    install_dir: "~/software/vale"
+"""
+    )
+
+
+def test_reload_changed_search_paths(daemon: Path):
+    assert "(0)" in _run_client(daemon, "--no-timer", "list", "--components").stdout
+
+    _write_component(daemon.parent / "dagos" / "components")
+
+    result = _run_client(daemon, "--no-timer", "list", "--components")
+    assert "(1)" in result.stdout
+    assert "vale" in result.stdout
+
+
+def test_use_configuration_of_client_directory(daemon: Path):
+    project = daemon.parent / "project"
+    _write_component(project / "dagos" / "components")
+    (project / ".dagos-config.yml").write_text(
+        f'search_paths:\n  - "{project / "dagos"}"\n'
+    )
+
+    result = _run_client(daemon, "--no-timer", "list", "--components", cwd=project)
+    assert "(1)" in result.stdout
+    assert "vale" in result.stdout
+
+    result = _run_client(
+        daemon, "--no-timer", "list", "--components", cwd=daemon.parent
+    )
+    assert "(0)" in result.stdout
+
+
+PROBING_COMPONENT = """import click
+
+from dagos.core.commands import InstallCommand
+from dagos.core.components import SoftwareComponent
+from dagos.platform import platform_utils
+
+
+class ProbeSoftwareComponent(SoftwareComponent):
+    def __init__(self) -> None:
+        super().__init__("probe")
+        self.add_command(InstallProbeCommand(self))
+
+
+class InstallProbeCommand(InstallCommand):
+    \"\"\"Tell whether dagos-tool is available.\"\"\"
+
+    def __init__(self, parent: SoftwareComponent) -> None:
+        super().__init__(parent)
+
+    def execute(self) -> None:
+        click.echo(platform_utils.is_command_available("dagos-tool"))
+"""
+
+
+def test_probe_platform_of_each_client(daemon: Path):
+    component = daemon.parent / "dagos" / "components" / "probe"
+    component.mkdir()
+    (component / "probe.py").write_text(PROBING_COMPONENT)
+    bin_dir = daemon.parent / "bin"
+    bin_dir.mkdir()
+    tool = bin_dir / "dagos-tool"
+    tool.write_text("#!/bin/sh\n")
+    tool.chmod(0o755)
+
+    result = _run_client(daemon, "--no-timer", "install", "probe")
+    assert result.stdout.strip() == "False"
+
+    path = f"{bin_dir}{os.pathsep}{os.environ['PATH']}"
+    result = _run_client(daemon, "--no-timer", "install", "probe", path=path)
+    assert result.stdout.strip() == "True"
+
+
+def test_unreachable_daemon(tmp_path: Path):
+    assert client.run(tmp_path / "does_not_exist.sock", ["--version"]) is None
@@ -0,0 +1,39 @@
+import os
+import socket
+
+from dagos.daemon.protocol import receive_message
+from dagos.daemon.protocol import send_message
+
+
+def test_message_round_trip():
+    client, server = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+    with client, server:
+        send_message(client, {"arguments": ["list", "-c"] * 1000})
+
+        message, fds = receive_message(server)
+
+    assert message == {"arguments": ["list", "-c"] * 1000}
+    assert fds == []
+
+
+def test_pass_file_descriptors():
+    read_fd, write_fd = os.pipe()
+    client, server = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+    with client, server:
+        send_message(client, {}, [write_fd])
+        os.close(write_fd)
+
+        _, fds = receive_message(server, max_fds=3)
+
+    assert len(fds) == 1
+    os.write(fds[0], b"hello")
+    os.close(fds[0])
+    assert os.read(read_fd, 5) == b"hello"
+    os.close(read_fd)
+
+
+def test_receive_from_closed_connection():
+    client, server = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.close()
+    with server:
+        assert receive_message(server) == (None, [])
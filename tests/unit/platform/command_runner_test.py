@@ -0,0 +1,100 @@
+import typing as t
+
+import pytest
+
+import dagos.containers.buildah as buildah
+from dagos.exceptions import DagosException
+from dagos.platform import ContainerSessionRunner
+
+
+@pytest.fixture
+def session(mocker) -> t.Iterator[ContainerSessionRunner]:
+    # A local shell stands in for the shell of a working container
+    mocker.patch.object(ContainerSessionRunner, "_session_command", return_value=["sh"])
+    with ContainerSessionRunner("working-container") as session:
+        yield session
+
+
+def test_runs_commands_in_one_shell(session: ContainerSessionRunner):
+    first = session.run("echo $PPID", capture_stdout=True)
+    second = session.run(["echo", "$$"], capture_stdout=True)
+    third = session.run("echo $PPID", capture_stdout=True)
+
+    assert first.stdout == third.stdout
+    assert second.stdout == "$$\n"
+
+
+def test_captures_streams_and_exit_code(session: ContainerSessionRunner):
+    result = session.run(
+        "printf out; printf err >&2; exit 3",
+        capture_stdout=True,
+        capture_stderr=True,
+        ignore_failure=True,
+    )
+
+    assert result.returncode == 3
+    assert result.stdout == "out"
+    assert result.stderr == "err"
+    assert session.run("true").returncode == 0
+
+
+def test_forwards_output_unless_captured(session: ContainerSessionRunner, capfd):
+    session.run("echo forwarded")
+
+    assert capfd.readouterr().out == "forwarded\n"
+
+
+@pytest.mark.parametrize("command", ["echo 'unbalanced", "cat <<EOF\nunterminated"])
+def test_malformed_commands_do_not_affect_session(
+    session: ContainerSessionRunner, command: str
+):
+    session.run(command, capture_stderr=True, ignore_failure=True)
+
+    assert session.run("echo fine", capture_stdout=True).stdout == "fine\n"
+
+
+def test_restarts_session_after_timeout(session: ContainerSessionRunner):
+    session.timeout = 0.2
+    first = session.run("echo $PPID", capture_stdout=True)
+
+    with pytest.raises(DagosException, match="printed nothing"):
+        session.run("sleep 5")
+
+    assert session.run("echo $PPID", capture_stdout=True).stdout != first.stdout
+
+
+def test_raises_on_failure(session: ContainerSessionRunner):
+    with pytest.raises(DagosException, match="code 1"):
+        session.run("false")
+
+
+def test_runs_commands_of_other_users_separately(
+    session: ContainerSessionRunner, mocker
+):
+    mocker.patch.object(buildah, "run")
+
+    session.run("whoami", user="dagos")
+
+    buildah.run.assert_called_once()
+
+
+def test_checks_commands_in_one_invocation(session: ContainerSessionRunner, mocker):
+    run = mocker.spy(session, "run")
+
+    available = session.check_commands(["sh", "dagos-missing", "sh"])
+    session.check_command("dagos-missing")
+
+    assert available == {"sh": True, "dagos-missing": False}
+    assert run.call_count == 1
+
+
+def test_checks_commands_again_once_invalidated(
+    session: ContainerSessionRunner, mocker
+):
+    run = mocker.spy(session, "run")
+
+    session.check_command("sh")
+    session.invalidate_commands()
+    session.check_command("sh")
+
+    assert run.call_count == 2
@@ -81,6 +81,33 @@ def test_is_command_available(input, expected):
     assert platform_utils.is_command_available(input) == expected
 
 
+def test_is_command_available_is_cached(mocker):
+    which = mocker.patch("shutil.which", return_value="/usr/bin/bash")
+
+    assert platform_utils.is_command_available("bash")
+    assert platform_utils.is_command_available("bash")
+    which.assert_called_once_with("bash")
+
+    platform_utils.invalidate_platform_facts()
+    which.return_value = None
+
+    assert not platform_utils.is_command_available("bash")
+    assert which.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "input,expected",
+    [
+        ("pytest", True),
+        ("dagos.platform", True),
+        ("abcdefqwertz", False),
+        ("abcdefqwertz.module", False),
+    ],
+)
+def test_is_module_available(input, expected):
+    assert platform_utils.is_module_available(input) == expected
+
+
 @pytest.mark.parametrize(
     "input,expectation",
     [
@@ -0,0 +1,71 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from dagos.tracing import span
+from dagos.tracing import traced
+from dagos.tracing import Tracer
+
+
+@pytest.fixture
+def tracer() -> Tracer:
+    tracer = Tracer()
+    tracer.clear()
+    tracer.enable()
+    yield tracer
+    tracer.disable()
+    tracer.clear()
+
+
+def test_span_is_not_recorded_when_disabled():
+    tracer = Tracer()
+    tracer.clear()
+
+    with span("disabled"):
+        pass
+
+    assert tracer.events == []
+
+
+def test_nested_spans(tracer: Tracer):
+    with span("outer", "test", detail=1):
+        with span("inner"):
+            pass
+
+    inner, outer = tracer.events
+    assert inner["name"] == "inner"
+    assert outer["name"] == "outer"
+    assert outer["cat"] == "test"
+    assert outer["args"] == {"detail": "1"}
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+
+
+def test_span_is_recorded_on_exception(tracer: Tracer):
+    with pytest.raises(ValueError):
+        with span("failing"):
+            raise ValueError()
+
+    assert [x["name"] for x in tracer.events] == ["failing"]
+
+
+def test_traced(tracer: Tracer):
+    @traced()
+    def function(value: int) -> int:
+        return value * 2
+
+    assert function(2) == 4
+    assert tracer.events[0]["name"].endswith("function")
+
+
+def test_write(tracer: Tracer, tmp_path: Path):
+    with span("written"):
+        pass
+    trace_file = tmp_path / "trace.json"
+
+    tracer.write(trace_file)
+
+    trace = json.loads(trace_file.read_text())
+    assert trace["traceEvents"][0]["name"] == "written"
+    assert trace["traceEvents"][0]["ph"] == "X"
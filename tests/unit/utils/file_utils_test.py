@@ -1,7 +1,9 @@
+import io
 from contextlib import contextmanager
 from pathlib import Path
 
 import pytest
+import requests
 
 import dagos.utils.file_utils as file_utils
 from dagos.exceptions import DagosException
@@ -58,3 +60,39 @@ def test_create_symlink_existing(
         file_utils.create_symlink(path_fixture, to_path, force, target_is_dir)
         assert path_fixture.exists()
         assert path_fixture.is_symlink()
+
+
+def test_download_file_reuses_cached_download(tmp_path, mocker, monkeypatch):
+    def download(url: str, path: Path) -> None:
+        path.write_text(url)
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv(file_utils.DOWNLOAD_CACHE_VARIABLE, str(tmp_path / "cache"))
+    mock_download = mocker.patch.object(file_utils, "_download", side_effect=download)
+    url = "https://example.com/vale.tar.gz"
+
+    first = file_utils.download_file(url)
+    first.unlink()
+    second = file_utils.download_file(url)
+
+    assert mock_download.call_count == 1
+    assert second == Path("vale.tar.gz")
+    assert second.read_text() == url
+
+
+@pytest.mark.parametrize("status_code", [404, 429])
+def test_download_file_does_not_cache_failed_download(
+    tmp_path, mocker, monkeypatch, status_code: int
+):
+    response = requests.Response()
+    response.status_code = status_code
+    response.raw = io.BytesIO(b"Not the file")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv(file_utils.DOWNLOAD_CACHE_VARIABLE, str(tmp_path / "cache"))
+    mocker.patch("requests.get", return_value=response)
+
+    with pytest.raises(DagosException, match=str(status_code)):
+        file_utils.download_file("https://example.com/vale.tar.gz")
+
+    assert not Path("vale.tar.gz").exists()
+    assert [x.name for x in (tmp_path / "cache").rglob("vale*")] == []
@@ -0,0 +1,35 @@
+from pathlib import Path
+
+import yaml
+
+from dagos.utils import yaml_utils
+
+
+def test_load_file(tmp_path: Path):
+    file = tmp_path / "test.yml"
+    file.write_text("name: dagos\nitems:\n  - a\n  - b\n")
+
+    assert yaml_utils.load_file(file) == {"name": "dagos", "items": ["a", "b"]}
+
+
+def test_load_all_file(tmp_path: Path):
+    file = tmp_path / "test.yml"
+    file.write_text("a: 1\n---\nb: 2\n")
+
+    assert yaml_utils.load_all_file(file) == [{"a": 1}, {"b": 2}]
+
+
+def test_load_empty_content():
+    assert yaml_utils.load("") is None
+    assert yaml_utils.load_all("") == []
+
+
+def test_uses_libyaml_if_available():
+    assert yaml_utils.is_libyaml_available() == yaml.__with_libyaml__
+
+
+def test_pure_python_fallback(mocker):
+    mocker.patch.object(yaml_utils, "SafeLoader", yaml.SafeLoader)
+
+    assert not yaml_utils.is_libyaml_available()
+    assert yaml_utils.load("key: value") == {"key": "value"}